@@ -0,0 +1,133 @@
+"""Request coalescing for single-text predictions."""
+from __future__ import annotations
+
+import time
+from collections import Counter, deque
+from concurrent.futures import Future
+from dataclasses import dataclass, field
+from threading import Condition, Thread
+from typing import Callable, Deque, Dict, Generic, List, TypeVar
+
+T = TypeVar("T")
+R = TypeVar("R")
+
+
+@dataclass
+class _Pending(Generic[T, R]):
+    item: T
+    future: "Future[R]" = field(default_factory=Future)
+    enqueued_at: float = field(default_factory=time.perf_counter)
+
+
+class MicroBatcher(Generic[T, R]):
+    """Collect concurrent submissions and dispatch them as one batch call.
+
+    The first queued item opens a window of ``max_wait_ms``; the batch is sent
+    to ``handler`` as soon as the window closes or ``max_batch_size`` items are
+    collected, and every caller receives its own slice of the result.
+    """
+
+    def __init__(
+        self,
+        handler: Callable[[List[T]], List[R]],
+        max_batch_size: int = 32,
+        max_wait_ms: float = 5.0,
+        name: str = "micro-batcher",
+    ) -> None:
+        if max_batch_size < 1:
+            raise ValueError("max_batch_size must be positive")
+        self.handler = handler
+        self.max_batch_size = max_batch_size
+        self.max_wait = max(0.0, max_wait_ms) / 1000.0
+        self._queue: Deque[_Pending[T, R]] = deque()
+        self._cond = Condition()
+        self._closed = False
+        self._batches = 0
+        self._items = 0
+        self._size_counts: Counter[int] = Counter()
+        self._wait_total = 0.0
+        self._thread = Thread(target=self._run, name=name, daemon=True)
+        self._thread.start()
+
+    def submit(self, item: T) -> "Future[R]":
+        pending: _Pending[T, R] = _Pending(item)
+        with self._cond:
+            if self._closed:
+                raise RuntimeError("MicroBatcher is closed")
+            self._queue.append(pending)
+            self._cond.notify()
+        return pending.future
+
+    def __call__(self, item: T) -> R:
+        return self.submit(item).result()
+
+    def queue_depth(self) -> int:
+        with self._cond:
+            return len(self._queue)
+
+    def snapshot(self) -> Dict[str, object]:
+        with self._cond:
+            batches = self._batches
+            items = self._items
+            return {
+                "queue_depth": len(self._queue),
+                "max_batch_size": self.max_batch_size,
+                "max_wait_ms": self.max_wait * 1000.0,
+                "batches": batches,
+                "items": items,
+                "average_batch_size": items / batches if batches else 0.0,
+                "average_wait_ms": self._wait_total / items * 1000.0 if items else 0.0,
+                "batch_size_histogram": {
+                    str(size): count for size, count in sorted(self._size_counts.items())
+                },
+            }
+
+    def close(self, timeout: float | None = 5.0) -> None:
+        """Stop accepting work; already queued items are still dispatched."""
+
+        with self._cond:
+            self._closed = True
+            self._cond.notify_all()
+        self._thread.join(timeout)
+
+    def _run(self) -> None:
+        while True:
+            batch = self._collect()
+            if batch is None:
+                return
+            self._dispatch(batch)
+
+    def _collect(self) -> List[_Pending[T, R]] | None:
+        with self._cond:
+            while not self._queue:
+                if self._closed:
+                    return None
+                self._cond.wait()
+            deadline = self._queue[0].enqueued_at + self.max_wait
+            while len(self._queue) < self.max_batch_size and not self._closed:
+                remaining = deadline - time.perf_counter()
+                if remaining <= 0:
+                    break
+                self._cond.wait(remaining)
+            size = min(len(self._queue), self.max_batch_size)
+            return [self._queue.popleft() for _ in range(size)]
+
+    def _dispatch(self, batch: List[_Pending[T, R]]) -> None:
+        started = time.perf_counter()
+        with self._cond:
+            self._batches += 1
+            self._items += len(batch)
+            self._size_counts[len(batch)] += 1
+            self._wait_total += sum(started - pending.enqueued_at for pending in batch)
+        try:
+            results = self.handler([pending.item for pending in batch])
+            if len(results) != len(batch):
+                raise RuntimeError(
+                    f"Batch handler returned {len(results)} results for {len(batch)} items"
+                )
+        except BaseException as exc:  # noqa: BLE001 - forwarded to every caller
+            for pending in batch:
+                pending.future.set_exception(exc)
+            return
+        for pending, result in zip(batch, results):
+            pending.future.set_result(result)
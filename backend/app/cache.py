@@ -0,0 +1,128 @@
+"""Bounded in-process cache for classification results."""
+from __future__ import annotations
+
+import hashlib
+import time
+import unicodedata
+from collections import OrderedDict
+from threading import Lock
+from typing import Dict, Optional, Sequence, Tuple
+
+# (label, labels in score order, scores): rows are stored as produced by the
+# model so compact responses can be assembled without per-row dicts.
+CachedResult = Tuple[str, Tuple[str, ...], Tuple[float, ...]]
+
+
+def normalize_text(text: str) -> str:
+    """Canonical form used to detect repeated texts (NFC, collapsed whitespace)."""
+
+    return " ".join(unicodedata.normalize("NFC", text).split())
+
+
+def text_digest(text: str) -> str:
+    return hashlib.blake2b(normalize_text(text).encode("utf-8"), digest_size=16).hexdigest()
+
+
+class PredictionCache:
+    """Thread-safe LRU cache keyed by normalized text and model fingerprint.
+
+    Entries written for one model are never served for another: the fingerprint
+    is part of every key, :meth:`bind` drops the entries of the previous model
+    when a different one is attached, and late writes from a replaced model
+    (still finishing requests during a hot swap) are not stored.
+    """
+
+    def __init__(self, max_size: int = 10000, ttl_seconds: float | None = None) -> None:
+        if max_size < 1:
+            raise ValueError("max_size must be positive")
+        self.max_size = max_size
+        self.ttl_seconds = ttl_seconds if ttl_seconds and ttl_seconds > 0 else None
+        self.fingerprint = ""
+        self._entries: "OrderedDict[str, Tuple[float, CachedResult]]" = OrderedDict()
+        self._lock = Lock()
+        self._hits = 0
+        self._misses = 0
+        self._evictions = 0
+        self._expirations = 0
+        self._invalidations = 0
+
+    def bind(self, fingerprint: str) -> None:
+        with self._lock:
+            if fingerprint == self.fingerprint:
+                return
+            prefix = f"{fingerprint}:"
+            stale = [key for key in self._entries if not key.startswith(prefix)]
+            for key in stale:
+                del self._entries[key]
+            if stale:
+                self._invalidations += 1
+            self.fingerprint = fingerprint
+
+    def key(self, text: str, fingerprint: Optional[str] = None) -> str:
+        return f"{fingerprint if fingerprint is not None else self.fingerprint}:{text_digest(text)}"
+
+    def get(self, key: str, count_miss: bool = True) -> Optional[Dict[str, object]]:
+        entry = self.get_row(key, count_miss)
+        if entry is None:
+            return None
+        label, labels, row = entry
+        return {"label": label, "scores": dict(zip(labels, row))}
+
+    def get_row(self, key: str, count_miss: bool = True) -> Optional[CachedResult]:
+        """The cached ``(label, labels, scores)`` triple, without building a dict.
+
+        ``count_miss=False`` is for a pre-check whose miss is looked up again
+        (and counted) on the way to the model.
+        """
+
+        now = time.monotonic()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self._misses += count_miss
+                return None
+            expires_at, value = entry
+            if expires_at and expires_at <= now:
+                del self._entries[key]
+                self._expirations += 1
+                self._misses += count_miss
+                return None
+            self._entries.move_to_end(key)
+            self._hits += 1
+        return value
+
+    def put(self, key: str, result: Dict[str, object]) -> None:
+        scores: Dict[str, float] = result["scores"]  # type: ignore[assignment]
+        self.put_row(key, str(result["label"]), tuple(scores), [float(score) for score in scores.values()])
+
+    def put_row(self, key: str, label: str, labels: Sequence[str], row: Sequence[float]) -> None:
+        expires_at = time.monotonic() + self.ttl_seconds if self.ttl_seconds else 0.0
+        value: CachedResult = (label, tuple(labels), tuple(row))
+        with self._lock:
+            if not key.startswith(f"{self.fingerprint}:"):
+                return  # written by a model that has been replaced since
+            self._entries[key] = (expires_at, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+                self._evictions += 1
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def snapshot(self) -> Dict[str, object]:
+        with self._lock:
+            lookups = self._hits + self._misses
+            return {
+                "size": len(self._entries),
+                "max_size": self.max_size,
+                "ttl_seconds": self.ttl_seconds,
+                "hits": self._hits,
+                "misses": self._misses,
+                "hit_rate": self._hits / lookups if lookups else 0.0,
+                "evictions": self._evictions,
+                "expirations": self._expirations,
+                "invalidations": self._invalidations,
+                "fingerprint": self.fingerprint,
+            }
@@ -2,7 +2,7 @@
 from __future__ import annotations
 
 from pathlib import Path
-from typing import List
+from typing import List, Optional
 
 from pydantic import BaseSettings, Field
 
@@ -11,14 +11,50 @@ class AppSettings(BaseSettings):
     """Centralized settings for the FastAPI service."""
 
     model_path: Path = Path("models/baseline.joblib")
+    linear_model_dir: Path = Path("models/baseline-linear")
+    use_linear_engine: bool = True
+    model_mmap: bool = False
     transformer_dir: Path = Path("models/transformer")
+    transformer_quantized_dir: Path = Path("models/transformer-int8")
+    use_quantized_transformer: bool = False
+    transformer_batch_size: int = 16
+    transformer_max_length: Optional[int] = None
+    cascade_mode: bool = False
+    cascade_threshold: float = 0.8
+    keywords_dir: Path = Path("models/keywords")
     frontend_dir: Path = Path("frontend")
     feedback_path: Path = Path("data/feedback.jsonl")
     history_path: Path = Path("data/prediction_history.jsonl")
     eval_metrics_path: Path = Path("reports/eval_metrics.json")
     history_summary_path: Path = Path("reports/history_summary.json")
     max_file_records: int = 1000
+    stream_chunk_size: int = 1000
+    jobs_dir: Path = Path("data/jobs")
+    jobs_max_concurrent: int = 1
+    jobs_chunk_size: int = 1000
     stats_max_history: int = 100
+    stats_durability: str = "async"
+    stats_flush_size: int = 512
+    stats_flush_interval: float = 0.5
+    stats_max_pending: int = 100_000
+    predict_batching: bool = True
+    batch_max_size: int = 32
+    batch_max_wait_ms: float = 5.0
+    ws_max_inflight: int = 256
+    ws_max_group: int = 64
+    inference_workers: int = 0
+    inference_worker_threads: int = 1
+    inference_max_inflight: int = 0
+    inference_shard_size: int = 256
+    inference_result_timeout: float = 60.0
+    blocking_executor_workers: int = 2
+    prediction_cache_size: int = 10000
+    prediction_cache_ttl_seconds: float = 0.0
+    model_watch_interval: float = 0.0
+    admin_token: Optional[str] = None
+    profile_requests: bool = False
+    profile_dir: Path = Path("reports/profiles")
+    profile_keep: int = 50
     allow_origins: List[str] = Field(default_factory=lambda: ["*"])
 
     class Config:
@@ -0,0 +1,108 @@
+"""Dedicated thread pool for blocking work called from ``async def`` handlers."""
+from __future__ import annotations
+
+import asyncio
+import contextvars
+import functools
+import time
+from concurrent.futures import ThreadPoolExecutor
+from threading import Lock
+from typing import AsyncIterator, Callable, Dict, Iterator, TypeVar
+
+R = TypeVar("R")
+
+
+class BlockingExecutor:
+    """Run CSV parsing, inference and bookkeeping off the event loop.
+
+    FastAPI runs plain ``def`` endpoints in AnyIO's shared threadpool; the
+    heavy parts of ``async def`` endpoints go here instead, so one large upload
+    can occupy at most ``max_workers`` threads while ``/predict``, ``/stats``
+    and ``/health`` keep their own capacity.  Calls beyond ``max_workers`` wait
+    in the queue; :meth:`snapshot` reports its depth and the time spent there.
+    """
+
+    def __init__(self, max_workers: int = 2, name: str = "blocking") -> None:
+        if max_workers < 1:
+            raise ValueError("max_workers must be positive")
+        self.max_workers = max_workers
+        self.name = name
+        self._pool = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix=name)
+        self._lock = Lock()
+        self._queued = 0
+        self._active = 0
+        self._started = 0
+        self._completed = 0
+        self._failed = 0
+        self._wait_total = 0.0
+        self._wait_max = 0.0
+        self._run_total = 0.0
+
+    async def run(self, func: Callable[..., R], *args, **kwargs) -> R:
+        loop = asyncio.get_running_loop()
+        with self._lock:
+            self._queued += 1
+        # Like anyio's threadpool, run in a copy of the caller's context
+        # (per-request timings, profiling).
+        context = contextvars.copy_context()
+        call = functools.partial(context.run, self._call, time.perf_counter(), func, *args, **kwargs)
+        return await loop.run_in_executor(self._pool, call)
+
+    async def iterate(self, iterator: Iterator[R]) -> AsyncIterator[R]:
+        """Advance a blocking iterator on this pool, one :meth:`run` per item.
+
+        For ``StreamingResponse`` bodies: Starlette would otherwise pull a sync
+        iterator through AnyIO's shared threadpool.  The iterator is closed
+        here when the consumer stops early (e.g. the client disconnects).
+        """
+
+        done = object()
+        try:
+            while True:
+                item = await self.run(next, iterator, done)
+                if item is done:
+                    return
+                yield item  # type: ignore[misc]
+        finally:
+            close = getattr(iterator, "close", None)
+            if close is not None:
+                await self.run(close)
+
+    def _call(self, submitted: float, func: Callable[..., R], *args, **kwargs) -> R:
+        started = time.perf_counter()
+        wait = started - submitted
+        with self._lock:
+            self._queued -= 1
+            self._active += 1
+            self._started += 1
+            self._wait_total += wait
+            self._wait_max = max(self._wait_max, wait)
+        failed = True
+        try:
+            result = func(*args, **kwargs)
+            failed = False
+            return result
+        finally:
+            with self._lock:
+                self._active -= 1
+                self._completed += 1
+                self._failed += failed
+                self._run_total += time.perf_counter() - started
+
+    def snapshot(self) -> Dict[str, object]:
+        with self._lock:
+            started, completed = self._started, self._completed
+            return {
+                "name": self.name,
+                "max_workers": self.max_workers,
+                "queue_depth": self._queued,
+                "active": self._active,
+                "completed": completed,
+                "failed": self._failed,
+                "average_wait_ms": (self._wait_total / started * 1000) if started else 0.0,
+                "max_wait_ms": self._wait_max * 1000,
+                "average_run_ms": (self._run_total / completed * 1000) if completed else 0.0,
+            }
+
+    def close(self) -> None:
+        self._pool.shutdown(wait=True)
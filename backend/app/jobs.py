@@ -0,0 +1,271 @@
+"""Background batch-scoring jobs: spooled uploads, chunked scoring, resumable state."""
+from __future__ import annotations
+
+import json
+import logging
+import os
+import shutil
+import threading
+import time
+import uuid
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import asdict, dataclass, field
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import BinaryIO, Callable, Dict, List, Optional, Set
+
+from .streaming import classify_chunk, csv_lines, ndjson_lines, summary_record, text_keys
+
+logger = logging.getLogger(__name__)
+
+JOB_FORMATS = ("ndjson", "csv")
+ACTIVE_STATUSES = ("queued", "running")
+
+
+class JobError(ValueError):
+    """The upload cannot be turned into a job (bad CSV, unknown job, ...)."""
+
+
+@dataclass
+class JobState:
+    id: str
+    filename: str
+    format: str
+    status: str = "queued"
+    created_at: str = field(default_factory=lambda: datetime.now(timezone.utc).isoformat())
+    started_at: Optional[str] = None
+    finished_at: Optional[str] = None
+    rows_total: Optional[int] = None
+    rows_done: int = 0
+    processed_rows: int = 0
+    chunks_done: int = 0
+    results_bytes: int = 0
+    elapsed_seconds: float = 0.0
+    class_counts: Dict[str, int] = field(default_factory=dict)
+    error: Optional[str] = None
+
+    def to_dict(self) -> Dict[str, object]:
+        payload = asdict(self)
+        rows_per_sec = self.rows_done / self.elapsed_seconds if self.elapsed_seconds else None
+        eta = None
+        if rows_per_sec and self.rows_total is not None and self.status in ACTIVE_STATUSES:
+            eta = max(0, self.rows_total - self.rows_done) / rows_per_sec
+        payload.update(
+            skipped_rows=self.rows_done - self.processed_rows,
+            rows_per_sec=rows_per_sec,
+            eta_seconds=eta,
+        )
+        return payload
+
+
+class JobManager:
+    """Score uploaded CSV files in the background, ``max_concurrent`` at a time.
+
+    Each job lives in ``jobs_dir/<id>/``: the spooled ``input.csv``, the
+    ``results.<format>`` file and ``state.json``.  After every chunk the new
+    results are fsynced and the state (chunks done, result size, counters) is
+    replaced atomically, so after a restart :meth:`resume` truncates any
+    half-written chunk and continues from the last completed one.
+
+    ``model_provider`` is called once per job run and ``classify(model, texts)``
+    scores each chunk with that model, so a job is not split across a model
+    hot-swap mid-chunk.
+    """
+
+    def __init__(
+        self,
+        jobs_dir: Path,
+        model_provider: Callable[[], object],
+        classify: Callable[[object, List[str]], List[Dict[str, object]]],
+        max_concurrent: int = 1,
+        chunk_size: int = 1000,
+        on_prediction: Callable[[str, Dict[str, object]], None] | None = None,
+    ) -> None:
+        self.jobs_dir = jobs_dir
+        self.model_provider = model_provider
+        self.classify = classify
+        self.max_concurrent = max(1, max_concurrent)
+        self.chunk_size = chunk_size
+        self.on_prediction = on_prediction
+        self.jobs_dir.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+        self._jobs: Dict[str, JobState] = {}
+        self._stopping = threading.Event()
+        self._executor = ThreadPoolExecutor(max_workers=self.max_concurrent, thread_name_prefix="scoring-job")
+        self._load_states()
+
+    def _load_states(self) -> None:
+        for state_path in sorted(self.jobs_dir.glob("*/state.json")):
+            try:
+                state = JobState(**json.loads(state_path.read_text(encoding="utf-8")))
+            except (OSError, TypeError, json.JSONDecodeError):
+                logger.warning("Skipping unreadable job state %s", state_path)
+                continue
+            self._jobs[state.id] = state
+
+    def resume(self) -> int:
+        """Re-queue jobs that were queued or running when the service stopped."""
+
+        with self._lock:
+            pending = sorted(
+                (state for state in self._jobs.values() if state.status in ACTIVE_STATUSES),
+                key=lambda state: state.created_at,
+            )
+            for state in pending:
+                state.status = "queued"
+        for state in pending:
+            logger.info("Resuming job %s from chunk %s", state.id, state.chunks_done)
+            self._executor.submit(self._run, state.id)
+        return len(pending)
+
+    def create(self, upload: BinaryIO, filename: str, format: str = "ndjson") -> Dict[str, object]:
+        if format not in JOB_FORMATS:
+            raise JobError(f"Неизвестный формат результата: {format}")
+        state = JobState(id=uuid.uuid4().hex, filename=filename, format=format)
+        job_dir = self._job_dir(state.id)
+        job_dir.mkdir(parents=True)
+        with (job_dir / "input.csv").open("wb") as spool:
+            shutil.copyfileobj(upload, spool)
+        try:
+            self._check_header(job_dir / "input.csv")
+        except JobError:
+            shutil.rmtree(job_dir, ignore_errors=True)
+            raise
+        with self._lock:
+            self._jobs[state.id] = state
+            self._save(state)
+        self._executor.submit(self._run, state.id)
+        return state.to_dict()
+
+    @staticmethod
+    def _check_header(path: Path) -> None:
+        import pandas as pd
+
+        try:
+            columns = pd.read_csv(path, nrows=0).columns
+        except pd.errors.EmptyDataError as exc:
+            raise JobError("Файл пустой") from exc
+        except UnicodeDecodeError as exc:
+            raise JobError("CSV должен быть в кодировке UTF-8") from exc
+        except Exception as exc:
+            raise JobError(f"Не удалось распарсить CSV: {exc}") from exc
+        if "text" not in columns:
+            raise JobError("CSV должен содержать колонку 'text'")
+
+    def get(self, job_id: str) -> Dict[str, object]:
+        with self._lock:
+            state = self._jobs.get(job_id)
+            if state is None:
+                raise JobError(f"Задача {job_id} не найдена")
+            return state.to_dict()
+
+    def list(self) -> List[Dict[str, object]]:
+        with self._lock:
+            states = sorted(self._jobs.values(), key=lambda state: state.created_at, reverse=True)
+            return [state.to_dict() for state in states]
+
+    def result_path(self, job_id: str) -> Path:
+        state = self.get(job_id)
+        return self._job_dir(job_id) / f"results.{state['format']}"
+
+    def close(self) -> None:
+        """Stop after the current chunk; unfinished jobs resume on the next start."""
+
+        self._stopping.set()
+        self._executor.shutdown(wait=True, cancel_futures=True)
+
+    def _job_dir(self, job_id: str) -> Path:
+        return self.jobs_dir / job_id
+
+    def _save(self, state: JobState) -> None:
+        path = self._job_dir(state.id) / "state.json"
+        tmp_path = path.with_suffix(".tmp")
+        tmp_path.write_text(json.dumps(asdict(state), ensure_ascii=False), encoding="utf-8")
+        os.replace(tmp_path, path)
+
+    def _update(self, state: JobState, **changes: object) -> None:
+        with self._lock:
+            for name, value in changes.items():
+                setattr(state, name, value)
+            self._save(state)
+
+    def _run(self, job_id: str) -> None:
+        with self._lock:
+            state = self._jobs[job_id]
+        if self._stopping.is_set():
+            return
+        try:
+            self._score(state)
+        except Exception as exc:
+            logger.exception("Job %s failed", job_id)
+            self._update(
+                state,
+                status="failed",
+                error=str(exc),
+                finished_at=datetime.now(timezone.utc).isoformat(),
+            )
+
+    def _score(self, state: JobState) -> None:
+        import pandas as pd
+
+        job_dir = self._job_dir(state.id)
+        input_path = job_dir / "input.csv"
+        if state.rows_total is None:
+            rows_total = sum(len(chunk) for chunk in pd.read_csv(input_path, usecols=["text"], chunksize=50_000))
+            self._update(state, rows_total=rows_total)
+        self._update(
+            state,
+            status="running",
+            started_at=state.started_at or datetime.now(timezone.utc).isoformat(),
+        )
+        model = self.model_provider()
+        labels = list(getattr(model, "labels", []))
+        class_counts = Counter(state.class_counts)
+        seen: Set[int] = set()
+
+        with (job_dir / f"results.{state.format}").open("ab") as results:
+            # Drop output of a chunk that was being written when the service stopped.
+            results.truncate(state.results_bytes)
+            results.seek(state.results_bytes)
+            reader = pd.read_csv(input_path, chunksize=self.chunk_size)
+            for index, chunk in enumerate(reader):
+                if index < state.chunks_done:
+                    # Not kept in the state: distinct texts of finished chunks are re-read on resume.
+                    seen |= text_keys(chunk["text"].dropna().astype(str))
+                    continue
+                if self._stopping.is_set():
+                    self._update(state, status="queued")
+                    return
+                started = time.perf_counter()
+                records = classify_chunk(chunk, lambda texts: self.classify(model, texts), self.on_prediction)
+                seen |= text_keys(record["text"] for record in records)
+                results.write(self._encode(records, state, labels))
+                results.flush()
+                os.fsync(results.fileno())
+                class_counts.update(record["label"] for record in records)
+                self._update(
+                    state,
+                    chunks_done=state.chunks_done + 1,
+                    rows_done=state.rows_done + len(chunk),
+                    processed_rows=state.processed_rows + len(records),
+                    results_bytes=results.tell(),
+                    class_counts=dict(class_counts),
+                    elapsed_seconds=state.elapsed_seconds + time.perf_counter() - started,
+                )
+            trailer = summary_record(state.rows_done, state.processed_rows, class_counts, len(seen))
+            results.write(self._encode([trailer], state, labels, header=False))
+            results.flush()
+            os.fsync(results.fileno())
+        self._update(
+            state,
+            status="completed",
+            results_bytes=(job_dir / f"results.{state.format}").stat().st_size,
+            finished_at=datetime.now(timezone.utc).isoformat(),
+        )
+
+    @staticmethod
+    def _encode(records: List[Dict[str, object]], state: JobState, labels: List[str], header: bool = True) -> bytes:
+        if state.format == "csv":
+            return b"".join(csv_lines(records, labels, header=header and state.results_bytes == 0))
+        return b"".join(ndjson_lines(records))
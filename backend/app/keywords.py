@@ -0,0 +1,140 @@
+"""Multi-pattern keyword matching for guardrails and the keyword fallback."""
+from __future__ import annotations
+
+from collections import deque
+from pathlib import Path
+from typing import Dict, FrozenSet, Iterable, List, Mapping, Set, Tuple
+
+# Below this many keywords CPython's C-level ``in`` scan beats walking the
+# automaton character by character (see bench/keywords.py).
+SCAN_THRESHOLD = 64
+
+
+class KeywordMatcher:
+    """Aho-Corasick automaton over categorized substrings.
+
+    The automaton is built once; :meth:`find` then reports every category and
+    keyword found in a text in a single left-to-right pass, so the cost depends
+    on the text length rather than on the dictionary size.  Matching is
+    case-insensitive (``str.lower``) and, like ``keyword in text``, works
+    on substrings so stems such as ``"грязн"`` keep matching word forms.
+
+    Dictionaries with at most ``scan_threshold`` keywords are matched with
+    plain substring checks, which are cheaper at that size.
+    """
+
+    def __init__(
+        self, keywords: Mapping[str, Iterable[str]], scan_threshold: int = SCAN_THRESHOLD
+    ) -> None:
+        self._goto: List[Dict[str, int]] = [{}]
+        self._fail: List[int] = [0]
+        self._outputs: List[FrozenSet[Tuple[str, str]]] = [frozenset()]
+        self._terminals: Dict[str, FrozenSet[int]] = {}
+        self._patterns: List[Tuple[str, str]] = []
+        self.categories = tuple(keywords)
+        self.size = 0
+        pending: List[Set[Tuple[str, str]]] = [set()]
+        for category, words in keywords.items():
+            for word in words:
+                normalized = word.strip().lower()
+                if normalized:
+                    self._insert(normalized, (category, normalized), pending)
+        self._build_failure_links(pending)
+        self.use_automaton = self.size > scan_threshold
+
+    def __len__(self) -> int:
+        return self.size
+
+    def find(self, text: str) -> Dict[str, Set[str]]:
+        """Return distinct keywords found in ``text`` grouped by category."""
+
+        hits: Dict[str, Set[str]] = {}
+        if not self.use_automaton:
+            lower = text.lower()
+            for category, keyword in self._patterns:
+                if keyword in lower:
+                    hits.setdefault(category, set()).add(keyword)
+            return hits
+        goto = self._goto
+        fail = self._fail
+        outputs = self._outputs
+        state = 0
+        for char in text.lower():
+            while state and char not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(char, 0)
+            if outputs[state]:
+                for category, keyword in outputs[state]:
+                    hits.setdefault(category, set()).add(keyword)
+        return hits
+
+    def contains(self, text: str, category: str) -> bool:
+        """Stop at the first keyword of ``category`` found in ``text``."""
+
+        if not self.use_automaton:
+            lower = text.lower()
+            return any(
+                keyword in lower for kind, keyword in self._patterns if kind == category
+            )
+        terminals = self._terminals.get(category)
+        if not terminals:
+            return False
+        goto = self._goto
+        fail = self._fail
+        state = 0
+        for char in text.lower():
+            while state and char not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(char, 0)
+            if state in terminals:
+                return True
+        return False
+
+    def _insert(
+        self, word: str, output: Tuple[str, str], pending: List[Set[Tuple[str, str]]]
+    ) -> None:
+        state = 0
+        for char in word:
+            next_state = self._goto[state].get(char)
+            if next_state is None:
+                next_state = len(self._goto)
+                self._goto[state][char] = next_state
+                self._goto.append({})
+                self._fail.append(0)
+                pending.append(set())
+            state = next_state
+        if output not in pending[state]:
+            pending[state].add(output)
+            self._patterns.append(output)
+            self.size += 1
+
+    def _build_failure_links(self, pending: List[Set[Tuple[str, str]]]) -> None:
+        queue = deque(self._goto[0].values())
+        while queue:
+            state = queue.popleft()
+            for char, child in self._goto[state].items():
+                queue.append(child)
+                fallback = self._fail[state]
+                while fallback and char not in self._goto[fallback]:
+                    fallback = self._fail[fallback]
+                target = self._goto[fallback].get(char, 0)
+                self._fail[child] = target if target != child else 0
+                pending[child] |= pending[self._fail[child]]
+        self._outputs = [frozenset(items) for items in pending]
+        terminals: Dict[str, Set[int]] = {}
+        for state, items in enumerate(self._outputs):
+            for category, _ in items:
+                terminals.setdefault(category, set()).add(state)
+        self._terminals = {category: frozenset(states) for category, states in terminals.items()}
+
+
+def load_keywords(path: Path) -> List[str]:
+    """Read one keyword per line; blank lines and ``#`` comments are ignored."""
+
+    words: List[str] = []
+    with Path(path).open("r", encoding="utf-8") as fh:
+        for line in fh:
+            word = line.split("#", 1)[0].strip()
+            if word:
+                words.append(word)
+    return words
@@ -1,18 +1,35 @@
 """FastAPI service for the sentiment classifier."""
 from __future__ import annotations
 
+import asyncio
 import io
+import itertools
 import logging
+import shutil
+import tempfile
+import time
 from collections import Counter
+from pathlib import Path
 
 import pandas as pd
-from fastapi import FastAPI, File, HTTPException, UploadFile
+from fastapi import FastAPI, File, Header, HTTPException, Query, Request, UploadFile, WebSocket
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import FileResponse, PlainTextResponse, Response, StreamingResponse
 from fastapi.staticfiles import StaticFiles
+from starlette.background import BackgroundTask
+from starlette.concurrency import run_in_threadpool
 
+from .batching import MicroBatcher
+from .cache import PredictionCache, normalize_text
 from .config import settings
+from .executor import BlockingExecutor
 from .feedback import FeedbackStore
-from .model import SentimentModel
+from .jobs import JobError, JobManager
+from .metrics import MetricsMiddleware, metrics, record_timing, stage
+from .model import LINEAR_MANIFEST, CascadeAdapter, SentimentModel, artifact_signature
+from .profiling import ProfileMiddleware, profile_path, profiled, profiling_active
+from .realtime import StreamSession, StreamStats
+from .reloader import ModelReloader
 from .reports import ReportLoader
 from .schemas import (
     BatchPredictRequest,
@@ -23,12 +40,21 @@ from .schemas import (
     FeedbackRequest,
     FeedbackResponse,
     HistorySummaryResponse,
+    JobListResponse,
+    JobResponse,
     ModelInfoResponse,
     PredictRequest,
     PredictResponse,
+    ReloadStats,
+    RuntimeResponse,
+    StartupStats,
     StatsResponse,
 )
+from .serialization import JSON, NotAcceptable, RequestValidationFailed, encode_predictions, encode_scores, negotiate, parse_texts
+from .startup import startup_report
 from .stats import StatsTracker
+from .streaming import MEDIA_TYPES, csv_lines, iter_predictions, ndjson_lines
+from .workers import InferencePool, safe_start_method
 
 MAX_FILE_RECORDS = settings.max_file_records
 
@@ -42,14 +68,37 @@ app.add_middleware(
     allow_methods=["*"],
     allow_headers=["*"],
 )
+app.add_middleware(ProfileMiddleware, settings=settings)
+# Added last so it is outermost: Server-Timing's total covers profiling too.
+app.add_middleware(MetricsMiddleware)
 
 if settings.frontend_dir.exists():
     app.mount("/ui", StaticFiles(directory=settings.frontend_dir, html=True), name="ui")
 
 sentiment_model: SentimentModel | None = None
+predict_batcher: MicroBatcher[str, dict] | None = None
+inference_pool: InferencePool | None = None
+blocking_executor: BlockingExecutor | None = None
+model_reloader: ModelReloader[SentimentModel] | None = None
+job_manager: JobManager | None = None
+stream_stats = StreamStats()
 stats_tracker = StatsTracker(
-    max_history=settings.stats_max_history, history_path=settings.history_path
+    max_history=settings.stats_max_history,
+    history_path=settings.history_path,
+    durability=settings.stats_durability,
+    flush_size=settings.stats_flush_size,
+    flush_interval=settings.stats_flush_interval,
+    max_pending=settings.stats_max_pending,
 )
+prediction_cache = (
+    PredictionCache(
+        max_size=settings.prediction_cache_size,
+        ttl_seconds=settings.prediction_cache_ttl_seconds,
+    )
+    if settings.prediction_cache_size > 0
+    else None
+)
+_startup_started = time.perf_counter()
 feedback_store = FeedbackStore(settings.feedback_path, cache_size=200)
 report_loader = ReportLoader(
     eval_metrics_path=settings.eval_metrics_path,
@@ -59,20 +108,248 @@ report_loader = ReportLoader(
 
 @app.on_event("startup")
 def load_model() -> None:
-    global sentiment_model
-    target_path = settings.model_path
+    global sentiment_model, _startup_started
+    _startup_started = time.perf_counter()
+    sentiment_model = _build_model()
+    startup_report.record("model_load", sentiment_model.load_time_ms)
+    if sentiment_model.warmup_ms is not None:
+        startup_report.record("first_inference", sentiment_model.warmup_ms)
+
+
+def _resolve_model_path() -> Path:
+    target_path = _resolve_baseline_path()
     if not target_path.exists() and settings.transformer_dir.exists():
-        target_path = settings.transformer_dir
         logger.info(
             "Primary model missing, falling back to transformer dir %s",
             settings.transformer_dir,
         )
-    sentiment_model = SentimentModel(target_path)
+        return _resolve_transformer_path()
+    return target_path
+
+
+def _resolve_baseline_path() -> Path:
+    target_path = settings.model_path
+    if settings.use_linear_engine and (settings.linear_model_dir / LINEAR_MANIFEST).exists():
+        manifest_mtime = (settings.linear_model_dir / LINEAR_MANIFEST).stat().st_mtime
+        if target_path.exists() and target_path.stat().st_mtime > manifest_mtime:
+            logger.warning(
+                "%s is older than %s, re-run ml/export_linear.py; serving the joblib pipeline",
+                settings.linear_model_dir,
+                target_path,
+            )
+        else:
+            logger.info("Serving the exported linear engine from %s", settings.linear_model_dir)
+            return settings.linear_model_dir
+    return target_path
+
+
+def _resolve_transformer_path() -> Path:
+    if settings.use_quantized_transformer and settings.transformer_quantized_dir.exists():
+        logger.info("Serving int8 quantized transformer from %s", settings.transformer_quantized_dir)
+        return settings.transformer_quantized_dir
+    return settings.transformer_dir
+
+
+def _build_model() -> SentimentModel:
+    """Load the configured artifact and warm it up so the first request is not cold."""
+
+    target_path = _resolve_model_path()
+    model = SentimentModel(cache=prediction_cache, **_model_kwargs(target_path))
     if not target_path.exists():
         logger.warning(
             "Model artifact %s is missing, using KeywordFallbackModel until training runs.",
             target_path,
         )
+    try:
+        model.warmup()
+    except Exception:
+        # The reload is abandoned: point the cache back at the model still serving.
+        if prediction_cache is not None and sentiment_model is not None:
+            prediction_cache.bind(sentiment_model.fingerprint)
+        raise
+    logger.info(
+        "Loaded %s in %.1f ms, warmup took %.1f ms",
+        type(model.adapter).__name__,
+        model.load_time_ms,
+        model.warmup_ms,
+    )
+    return model
+
+
+def _artifact_signature() -> str:
+    paths = [
+        settings.model_path,
+        settings.linear_model_dir,
+        settings.transformer_dir,
+        settings.keywords_dir,
+    ]
+    if settings.use_quantized_transformer:
+        paths.append(settings.transformer_quantized_dir)
+    return artifact_signature(paths)
+
+
+def _swap_model(model: SentimentModel) -> None:
+    """Publish a new model; requests already holding the old one finish on it."""
+
+    global sentiment_model, inference_pool
+    old_pool = inference_pool
+    # The reloader thread forks while request threads may hold locks, so the
+    # new workers come from a fork server instead of this process.
+    new_pool = _start_pool(model, start_method=safe_start_method()) if old_pool is not None else None
+    inference_pool = new_pool
+    sentiment_model = model
+    if old_pool is not None:
+        old_pool.close()
+
+
+def _model_kwargs(model_path: Path) -> dict:
+    """Picklable constructor arguments, also used to rebuild the model in workers."""
+
+    kwargs = {
+        "model_path": model_path,
+        "keywords_dir": settings.keywords_dir,
+        "mmap": settings.model_mmap,
+        "transformer_options": {
+            "batch_size": settings.transformer_batch_size,
+            "max_length": settings.transformer_max_length,
+        },
+    }
+    if model_path == settings.linear_model_dir:
+        kwargs["fallback_path"] = settings.model_path
+    if settings.cascade_mode:
+        cascade_path = _resolve_transformer_path()
+        if cascade_path.exists() and cascade_path != model_path:
+            kwargs["cascade_path"] = cascade_path
+            kwargs["cascade_threshold"] = settings.cascade_threshold
+    return kwargs
+
+
+@app.on_event("startup")
+def start_inference_pool() -> None:
+    global inference_pool
+    if settings.inference_workers > 0:
+        with startup_report.stage("inference_pool"):
+            inference_pool = _start_pool(_require_model())
+        logger.info(
+            "Started %s inference workers (%s)",
+            settings.inference_workers,
+            inference_pool.start_method,
+        )
+
+
+def _start_pool(model: SentimentModel, start_method: str | None = None) -> InferencePool:
+    return InferencePool(
+        model,
+        _model_kwargs(model.model_path),
+        workers=settings.inference_workers,
+        threads_per_worker=settings.inference_worker_threads,
+        max_inflight=settings.inference_max_inflight,
+        shard_size=settings.inference_shard_size,
+        result_timeout=settings.inference_result_timeout,
+        start_method=start_method,
+    )
+
+
+@app.on_event("startup")
+def start_blocking_executor() -> None:
+    global blocking_executor
+    blocking_executor = BlockingExecutor(settings.blocking_executor_workers, name="blocking-io")
+
+
+@app.on_event("startup")
+def start_model_reloader() -> None:
+    global model_reloader
+    model_reloader = ModelReloader(
+        _build_model,
+        _swap_model,
+        signature=_artifact_signature,
+        poll_interval=settings.model_watch_interval,
+    )
+    model_reloader.start_watching()
+
+
+@app.on_event("startup")
+def start_batcher() -> None:
+    global predict_batcher
+    if settings.predict_batching:
+        predict_batcher = MicroBatcher(
+            lambda texts: _require_model().classify_batch(texts),
+            max_batch_size=settings.batch_max_size,
+            max_wait_ms=settings.batch_max_wait_ms,
+            name="predict-batcher",
+        )
+
+
+@app.on_event("startup")
+def start_job_manager() -> None:
+    global job_manager
+    job_manager = JobManager(
+        settings.jobs_dir,
+        _require_model,
+        _classify_many,
+        max_concurrent=settings.jobs_max_concurrent,
+        chunk_size=settings.jobs_chunk_size,
+        on_prediction=lambda text, pred: stats_tracker.record(text, pred["label"], pred["scores"]),
+    )
+    with startup_report.stage("jobs_resume"):
+        resumed = job_manager.resume()
+    if resumed:
+        logger.info("Resumed %s unfinished scoring jobs", resumed)
+
+
+@app.on_event("startup")
+def report_startup() -> None:
+    """Runs after the other startup hooks: log the cold-start budget."""
+
+    startup_report.record("startup_hooks", (time.perf_counter() - _startup_started) * 1000)
+    report = startup_report.snapshot()
+    logger.info("Startup timings (ms): stages=%s imports=%s", report["stages"], report["imports"])
+
+
+@app.on_event("shutdown")
+def stop_job_manager() -> None:
+    global job_manager
+    if job_manager is not None:
+        job_manager.close()
+        job_manager = None
+
+
+@app.on_event("shutdown")
+def flush_stats_history() -> None:
+    # Registered after stop_job_manager: records of a job cut short are written too.
+    stats_tracker.close()
+
+
+@app.on_event("shutdown")
+def stop_batcher() -> None:
+    global predict_batcher
+    if predict_batcher is not None:
+        predict_batcher.close()
+        predict_batcher = None
+
+
+@app.on_event("shutdown")
+def stop_blocking_executor() -> None:
+    global blocking_executor
+    if blocking_executor is not None:
+        blocking_executor.close()
+        blocking_executor = None
+
+
+@app.on_event("shutdown")
+def stop_model_reloader() -> None:
+    global model_reloader
+    if model_reloader is not None:
+        model_reloader.close()
+        model_reloader = None
+
+
+@app.on_event("shutdown")
+def stop_inference_pool() -> None:
+    global inference_pool
+    if inference_pool is not None:
+        inference_pool.close()
+        inference_pool = None
 
 
 @app.get("/health")
@@ -86,42 +363,161 @@ def _require_model() -> SentimentModel:
     return sentiment_model
 
 
+def _classify_many(model: SentimentModel, texts: list[str]) -> list[dict]:
+    """Classify a batch, sharding it across worker processes when it is large."""
+
+    pool = inference_pool
+    # During a reload the pool may already serve the next model; never mix them.
+    if pool is not None and pool.model is model and len(texts) > pool.shard_size:
+        return model.classify_batch(texts, scorer=pool.score_batch)
+    return model.classify_batch(texts)
+
+
+def _score_many(model: SentimentModel, texts: list[str]) -> tuple[list[int], object]:
+    """:func:`_classify_many` as label indices and a score matrix (compact formats)."""
+
+    pool = inference_pool
+    if pool is not None and pool.model is model and len(texts) > pool.shard_size:
+        return model.score_texts(texts, scorer=pool.score_batch)
+    return model.score_texts(texts)
+
+
 @app.post("/predict", response_model=PredictResponse)
 def predict(request: PredictRequest) -> PredictResponse:
-    model = _require_model()
-    result = model.classify(request.text)
-    stats_tracker.record(request.text, result["label"], result["scores"])
+    return profiled(_predict_text, request.text)
+
+
+def _predict_text(text: str) -> PredictResponse:
+    # A profiled request is scored inline: the batcher thread is outside the profile.
+    if predict_batcher is not None and not profiling_active():
+        # Cache hits are answered here instead of waiting for the batching window.
+        result = _require_model().cached(text)
+        if result is None:
+            started = time.perf_counter()
+            result = predict_batcher(text)
+            record_timing("batch", time.perf_counter() - started)
+    else:
+        result = _require_model().classify(text)
+    stats_tracker.record(text, result["label"], result["scores"])
     return PredictResponse(**result)
 
 
-@app.post("/predict_batch", response_model=BatchPredictResponse)
-def predict_batch(request: BatchPredictRequest) -> BatchPredictResponse:
+@app.websocket("/ws/predict")
+async def predict_ws(websocket: WebSocket) -> None:
+    """Поток классификации: {"id", "text"} или {"items": [...]} на входе, результат с тем же id на выходе."""
+
+    session = StreamSession(
+        websocket,
+        _score_stream_texts,
+        max_inflight=settings.ws_max_inflight,
+        max_group=settings.ws_max_group,
+        stats=stream_stats,
+    )
+    await session.run()
+
+
+async def _score_stream_texts(texts: list[str]) -> list[dict]:
+    batcher = predict_batcher
+    if batcher is not None:
+        # Shares the /predict micro-batcher, so texts from all connections are scored together.
+        predictions = await asyncio.gather(*(asyncio.wrap_future(batcher.submit(text)) for text in texts))
+    else:
+        predictions = await _require_executor().run(_require_model().classify_batch, texts)
+    await run_in_threadpool(_record_predictions, texts, predictions)
+    return list(predictions)
+
+
+def _record_predictions(texts: list[str], predictions: list[dict]) -> None:
+    stats_tracker.record_many((text, pred["label"], pred["scores"]) for text, pred in zip(texts, predictions))
+
+
+def _record_scores(texts: list[str], labels: list[str], label_ids: list[int], scores: object) -> None:
+    # History is stored per prediction, so the score dicts are built here, not in the response.
+    rows = scores.tolist() if hasattr(scores, "tolist") else scores
+    stats_tracker.record_many(
+        (text, labels[label_idx], dict(zip(labels, row))) for text, label_idx, row in zip(texts, label_ids, rows)
+    )
+
+
+def _response_format(accept: str | None) -> str:
+    try:
+        return negotiate(accept)
+    except NotAcceptable as exc:
+        raise HTTPException(status_code=406, detail=str(exc)) from exc
+
+
+def _require_executor() -> BlockingExecutor:
+    if blocking_executor is None:
+        raise HTTPException(status_code=503, detail="Сервис ещё не запущен")
+    return blocking_executor
+
+
+@app.post(
+    "/predict_batch",
+    response_model=BatchPredictResponse,
+    openapi_extra={
+        "requestBody": {
+            "required": True,
+            "content": {"application/json": {"schema": BatchPredictRequest.schema()}},
+        }
+    },
+)
+async def predict_batch(request: Request, accept: str | None = Header(default=None)) -> Response:
+    """Пакетная классификация; компактный формат ответа выбирается заголовком Accept."""
+
+    media_type = _response_format(accept)
+    body = await request.body()
+    return await _require_executor().run(profiled, _predict_batch_body, body, media_type)
+
+
+def _predict_batch_body(body: bytes, media_type: str) -> Response:
+    # The body is parsed and validated here in one pass instead of per-item pydantic models.
+    try:
+        with stage("parse"):
+            texts = parse_texts(body)
+    except RequestValidationFailed as exc:
+        raise HTTPException(status_code=422, detail=exc.errors) from exc
     model = _require_model()
-    predictions = model.classify_batch(request.texts)
-    for text, pred in zip(request.texts, predictions):
-        stats_tracker.record(text, pred["label"], pred["scores"])
-    return BatchPredictResponse(predictions=[PredictResponse(**pred) for pred in predictions])
+    if media_type != JSON:
+        label_ids, scores = _score_many(model, texts)
+        _record_scores(texts, model.labels, label_ids, scores)
+        with stage("serialize"):
+            content = encode_scores(label_ids, scores, model.labels, media_type)
+        return Response(content, media_type=media_type)
+    predictions = _classify_many(model, texts)
+    _record_predictions(texts, predictions)
+    with stage("serialize"):
+        content = encode_predictions(predictions, model.labels, media_type)
+    return Response(content, media_type=media_type)
 
 
 @app.post("/predict_file", response_model=FilePredictResponse)
-async def predict_file(file: UploadFile = File(...)) -> FilePredictResponse:
+async def predict_file(file: UploadFile = File(...), accept: str | None = Header(default=None)) -> Response:
     """Обработка CSV с колонкой text."""
 
+    media_type = _response_format(accept)
     try:
         content = await file.read()
     except Exception as exc:  # pragma: no cover - FastAPI handles IO
         raise HTTPException(status_code=400, detail="Не удалось прочитать файл") from exc
 
+    # Parsing, inference and stats bookkeeping block; keep them off the event loop.
+    return await _require_executor().run(profiled, _predict_file_content, content, media_type)
+
+
+def _predict_file_content(content: bytes, media_type: str = JSON) -> Response:
     if not content:
         raise HTTPException(status_code=400, detail="Файл пустой")
 
     try:
-        decoded = content.decode("utf-8")
+        with stage("decode"):
+            decoded = content.decode("utf-8")
     except UnicodeDecodeError as exc:
         raise HTTPException(status_code=400, detail="CSV должен быть в кодировке UTF-8") from exc
 
     try:
-        dataframe = pd.read_csv(io.StringIO(decoded))
+        with stage("parse"):
+            dataframe = pd.read_csv(io.StringIO(decoded))
     except Exception as exc:
         raise HTTPException(
             status_code=400,
@@ -141,27 +537,151 @@ async def predict_file(file: UploadFile = File(...)) -> FilePredictResponse:
 
     model = _require_model()
     texts = dataframe["text"].astype(str).tolist()
-    raw_predictions = model.classify_batch(texts)
+    rows = [int(idx) for idx in dataframe.index.tolist()]
+    summary = {
+        "input_rows": int(input_rows),
+        "processed_rows": len(texts),
+        "skipped_rows": max(0, int(input_rows) - len(texts)),
+        "unique_texts": len({normalize_text(text) for text in texts}),
+    }
+
+    if media_type != JSON:
+        label_ids, scores = _score_many(model, texts)
+        _record_scores(texts, model.labels, label_ids, scores)
+        class_counts = Counter(model.labels[label_idx] for label_idx in label_ids)
+        extra = {"summary": {**summary, "class_counts": dict(class_counts)}, "rows": rows}
+        with stage("serialize"):
+            content = encode_scores(label_ids, scores, model.labels, media_type, extra)
+        return Response(content, media_type=media_type)
+
+    raw_predictions = _classify_many(model, texts)
+    _record_predictions(texts, raw_predictions)
 
     items = []
-    for idx, text, pred in zip(dataframe.index.tolist(), texts, raw_predictions):
-        stats_tracker.record(text, pred["label"], pred["scores"])
+    for row, text, pred in zip(rows, texts, raw_predictions):
         items.append({
-            "row": int(idx),
+            "row": row,
             "text": text,
             "label": pred["label"],
             "scores": pred["scores"],
         })
 
     class_counts = Counter(item["label"] for item in items)
-    summary = {
-        "input_rows": int(input_rows),
-        "processed_rows": len(items),
-        "skipped_rows": max(0, int(input_rows) - len(items)),
-        "class_counts": dict(class_counts),
-    }
+    summary["class_counts"] = dict(class_counts)
+    with stage("serialize"):
+        content = encode_predictions(items, model.labels, media_type, {"summary": summary})
+    return Response(content, media_type=media_type)
 
-    return FilePredictResponse(summary=summary, predictions=items)
+
+def _open_csv_chunks(stream: io.TextIOBase):
+    """Parse the first chunk eagerly so bad uploads still get a 400 status."""
+
+    try:
+        reader = pd.read_csv(stream, chunksize=settings.stream_chunk_size)
+        first = next(reader)
+    except pd.errors.EmptyDataError as exc:
+        raise HTTPException(status_code=400, detail="Файл пустой") from exc
+    except StopIteration as exc:
+        raise HTTPException(status_code=400, detail="В колонке 'text' нет строк для обработки") from exc
+    except UnicodeDecodeError as exc:
+        raise HTTPException(status_code=400, detail="CSV должен быть в кодировке UTF-8") from exc
+    except Exception as exc:
+        raise HTTPException(status_code=400, detail=f"Не удалось распарсить CSV: {exc}") from exc
+    if "text" not in first.columns:
+        raise HTTPException(status_code=400, detail="CSV должен содержать колонку 'text'")
+    return first, reader
+
+
+@app.post("/predict_file/stream")
+def predict_file_stream(
+    file: UploadFile = File(...),
+    format: str = Query("ndjson", regex="^(ndjson|csv)$"),
+) -> StreamingResponse:
+    """Потоковая обработка CSV любого размера: чтение и классификация по частям.
+
+    Ответ — NDJSON (по строке JSON на запись, последней идёт запись
+    ``summary`` с распределением классов и числом пропущенных строк) или CSV,
+    где сводка — последняя строка с ``label=summary``.
+    """
+
+    # FastAPI closes the upload once this handler returns, before the body is
+    # streamed, so copy it (chunk by chunk) into a temp file the response owns.
+    spool = tempfile.TemporaryFile()
+    file.file.seek(0)
+    shutil.copyfileobj(file.file, spool)
+    spool.seek(0)
+    stream = io.TextIOWrapper(spool, encoding="utf-8", newline="")
+    try:
+        first, reader = _open_csv_chunks(stream)
+    except HTTPException:
+        stream.close()
+        raise
+
+    # The whole stream is answered by one model, even if it is hot-swapped meanwhile.
+    model = _require_model()
+    records = iter_predictions(
+        itertools.chain([first], reader),
+        lambda texts: _classify_many(model, texts),
+        on_prediction=lambda text, pred: stats_tracker.record(text, pred["label"], pred["scores"]),
+    )
+    body = ndjson_lines(records) if format == "ndjson" else csv_lines(records, model.labels)
+    # Parsing and inference for each piece run on the blocking executor, not the shared threadpool.
+    return StreamingResponse(
+        _require_executor().iterate(body),
+        media_type=MEDIA_TYPES[format],
+        background=BackgroundTask(stream.close),
+    )
+
+
+def _require_jobs() -> JobManager:
+    if job_manager is None:
+        raise HTTPException(status_code=503, detail="Фоновые задачи недоступны")
+    return job_manager
+
+
+@app.post("/jobs", response_model=JobResponse, status_code=202)
+def create_job(
+    file: UploadFile = File(...),
+    format: str = Query("ndjson", regex="^(ndjson|csv)$"),
+) -> JobResponse:
+    """Фоновая классификация CSV: файл сохраняется на диск и обрабатывается по частям."""
+
+    manager = _require_jobs()
+    file.file.seek(0)
+    try:
+        job = manager.create(file.file, file.filename or "upload.csv", format)
+    except JobError as exc:
+        raise HTTPException(status_code=400, detail=str(exc)) from exc
+    return JobResponse(**job)
+
+
+@app.get("/jobs", response_model=JobListResponse)
+def list_jobs() -> JobListResponse:
+    return JobListResponse(jobs=_require_jobs().list())
+
+
+@app.get("/jobs/{job_id}", response_model=JobResponse)
+def job_status(job_id: str) -> JobResponse:
+    try:
+        return JobResponse(**_require_jobs().get(job_id))
+    except JobError as exc:
+        raise HTTPException(status_code=404, detail=str(exc)) from exc
+
+
+@app.get("/jobs/{job_id}/result")
+def job_result(job_id: str) -> FileResponse:
+    manager = _require_jobs()
+    try:
+        job = manager.get(job_id)
+    except JobError as exc:
+        raise HTTPException(status_code=404, detail=str(exc)) from exc
+    if job["status"] != "completed":
+        raise HTTPException(status_code=409, detail=f"Задача ещё не завершена: {job['status']}")
+    return FileResponse(
+        manager.result_path(job_id),
+        media_type=MEDIA_TYPES[job["format"]],
+        filename=f"{Path(job['filename']).stem}-predictions.{job['format']}",
+    )
 
 
 @app.get("/")
@@ -172,8 +692,14 @@ def root() -> dict:
             "/predict",
             "/predict_batch",
             "/predict_file",
+            "/predict_file/stream",
+            "/ws/predict",
+            "/jobs",
             "/stats",
             "/model",
+            "/runtime",
+            "/runtime/startup",
+            "/metrics",
             "/reports/metrics",
             "/reports/history",
             "/health",
@@ -190,7 +716,121 @@ def stats() -> StatsResponse:
 @app.get("/model", response_model=ModelInfoResponse)
 def model_info() -> ModelInfoResponse:
     model = _require_model()
-    return ModelInfoResponse(**model.metadata)
+    return ModelInfoResponse(
+        **{
+            **model.metadata,
+            "load_time_ms": round(model.load_time_ms, 3),
+            "warmup_ms": round(model.warmup_ms, 3) if model.warmup_ms is not None else None,
+            "loaded_at": model.loaded_at,
+        }
+    )
+
+
+@app.post("/admin/reload-model", response_model=ReloadStats, status_code=202)
+def reload_model(x_admin_token: str | None = Header(default=None)) -> ReloadStats:
+    """Перезагрузка модели в фоне без остановки сервиса."""
+
+    if settings.admin_token and x_admin_token != settings.admin_token:
+        raise HTTPException(status_code=403, detail="Неверный токен администратора")
+    if model_reloader is None:
+        raise HTTPException(status_code=503, detail="Перезагрузка модели недоступна")
+    if not model_reloader.reload():
+        raise HTTPException(status_code=409, detail="Перезагрузка модели уже выполняется")
+    return ReloadStats(**model_reloader.status())
+
+
+@app.get("/admin/profiles/{profile_id}")
+def download_profile(
+    profile_id: str,
+    kind: str = Query("prof", alias="format", pattern="^(prof|txt)$"),
+    x_admin_token: str | None = Header(default=None),
+) -> FileResponse:
+    """Профиль cProfile запроса (?profile=1): .prof для pstats/snakeviz или текстовая сводка."""
+
+    if settings.admin_token and x_admin_token != settings.admin_token:
+        raise HTTPException(status_code=403, detail="Неверный токен администратора")
+    path = profile_path(settings.profile_dir, profile_id, f".{kind}")
+    if path is None:
+        raise HTTPException(status_code=404, detail="Профиль не найден")
+    media_type = "text/plain; charset=utf-8" if kind == "txt" else "application/octet-stream"
+    return FileResponse(path, media_type=media_type, filename=path.name)
+
+
+def _register_gauges() -> None:
+    """Values owned by other components, read when /metrics is scraped."""
+
+    def model_value(name):
+        return lambda: getattr(sentiment_model, name, None)
+
+    metrics.gauge("mlweb_model_load_ms", "Time to build the current model adapter.", model_value("load_time_ms"))
+    metrics.gauge("mlweb_model_warmup_ms", "Warm-up time of the current model.", model_value("warmup_ms"))
+    metrics.gauge(
+        "mlweb_queue_depth",
+        "Items waiting in each queue.",
+        lambda: {
+            ("batcher",): predict_batcher.queue_depth() if predict_batcher is not None else None,
+            ("executor",): blocking_executor.snapshot()["queue_depth"] if blocking_executor is not None else None,
+            ("workers",): inference_pool.snapshot()["inflight"] if inference_pool is not None else None,
+            ("jobs",): sum(job["status"] == "queued" for job in job_manager.list()) if job_manager is not None else None,
+            ("stats_history",): (stats_tracker.writer_snapshot() or {}).get("pending"),
+        },
+        ["queue"],
+    )
+    metrics.gauge(
+        "mlweb_websocket_connections",
+        "Open /ws/predict connections.",
+        lambda: stream_stats.snapshot()["active"],
+    )
+    metrics.gauge(
+        "mlweb_cache_lookups_total",
+        "Prediction cache lookups by result.",
+        lambda: {(key,): prediction_cache.snapshot()[key] for key in ("hits", "misses")}
+        if prediction_cache is not None
+        else None,
+        ["result"],
+        kind="counter",
+    )
+    metrics.gauge(
+        "mlweb_predictions_total",
+        "Predictions recorded by StatsTracker since start (including loaded history).",
+        lambda: stats_tracker.snapshot()["total_predictions"],
+        kind="counter",
+    )
+
+
+_register_gauges()
+
+
+@app.get("/metrics", response_class=PlainTextResponse, include_in_schema=False)
+def prometheus_metrics() -> PlainTextResponse:
+    return PlainTextResponse(metrics.render(), media_type="text/plain; version=0.0.4; charset=utf-8")
+
+
+@app.get("/runtime", response_model=RuntimeResponse)
+def runtime_info() -> RuntimeResponse:
+    batching = predict_batcher.snapshot() if predict_batcher is not None else None
+    cache = prediction_cache.snapshot() if prediction_cache is not None else None
+    workers = inference_pool.snapshot() if inference_pool is not None else None
+    executor = blocking_executor.snapshot() if blocking_executor is not None else None
+    reload = model_reloader.status() if model_reloader is not None else None
+    adapter = sentiment_model.adapter if sentiment_model is not None else None
+    cascade = adapter.snapshot() if isinstance(adapter, CascadeAdapter) else None
+    return RuntimeResponse(
+        batching=batching,
+        cache=cache,
+        workers=workers,
+        executor=executor,
+        websocket=stream_stats.snapshot(),
+        stats_writer=stats_tracker.writer_snapshot(),
+        reload=reload,
+        cascade=cascade,
+        startup=startup_report.snapshot(),
+    )
+
+
+@app.get("/runtime/startup", response_model=StartupStats)
+def startup_info() -> StartupStats:
+    return StartupStats(**startup_report.snapshot())
 
 
 @app.get("/reports/metrics", response_model=EvalMetricsResponse)
@@ -0,0 +1,320 @@
+"""In-process counters and latency histograms rendered in Prometheus text format.
+
+No client library or push gateway is needed: every metric keeps its buckets in
+memory behind one lock (an ``observe`` is a bisect and a few additions), and
+``/metrics`` renders the current values on scrape.  Values that already live
+elsewhere (queue depths, model load time) are registered as gauge callbacks
+and read only at scrape time.
+"""
+from __future__ import annotations
+
+import time
+from bisect import bisect_left
+from contextvars import ContextVar
+from threading import Lock
+from typing import Callable, Dict, List, Optional, Sequence, Tuple, Union
+
+LabelValues = Tuple[str, ...]
+GaugeValue = Union[float, Dict[LabelValues, float], None]
+
+# Seconds; covers a cached single text (tens of µs) up to a large CSV.
+LATENCY_BUCKETS = (0.0001, 0.00025, 0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+SIZE_BUCKETS = (1, 2, 4, 8, 16, 32, 64, 128, 256, 512, 1024, 4096)
+
+
+def _format_labels(names: Sequence[str], values: Sequence[str], extra: str = "") -> str:
+    pairs = [f'{name}="{_escape(value)}"' for name, value in zip(names, values)]
+    if extra:
+        pairs.append(extra)
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+def _escape(value: str) -> str:
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_value(value: float) -> str:
+    if value == float("inf"):
+        return "+Inf"
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+class Counter:
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = ()) -> None:
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._values: Dict[LabelValues, float] = {}
+        self._lock = Lock()
+
+    def inc(self, *labels: str, amount: float = 1) -> None:
+        with self._lock:
+            self._values[labels] = self._values.get(labels, 0) + amount
+
+    def render(self) -> List[str]:
+        lines = [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} counter"]
+        with self._lock:
+            values = sorted(self._values.items())
+        for labels, value in values:
+            lines.append(f"{self.name}{_format_labels(self.labelnames, labels)} {_format_value(value)}")
+        return lines
+
+
+class Histogram:
+    def __init__(
+        self,
+        name: str,
+        documentation: str,
+        labelnames: Sequence[str] = (),
+        buckets: Sequence[float] = LATENCY_BUCKETS,
+    ) -> None:
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self.buckets = tuple(sorted(buckets))
+        # Per label set: [count per bucket (+Inf last)], sum, count.
+        self._series: Dict[LabelValues, Tuple[List[int], List[float]]] = {}
+        self._lock = Lock()
+
+    def observe(self, value: float, *labels: str) -> None:
+        index = bisect_left(self.buckets, value)
+        with self._lock:
+            series = self._series.get(labels)
+            if series is None:
+                series = self._series[labels] = ([0] * (len(self.buckets) + 1), [0.0, 0])
+            series[0][index] += 1
+            series[1][0] += value
+            series[1][1] += 1
+
+    def time(self, *labels: str) -> "_Timer":
+        return _Timer(self, labels)
+
+    def snapshot(self, *labels: str) -> Optional[Dict[str, float]]:
+        with self._lock:
+            series = self._series.get(labels)
+            if series is None:
+                return None
+            return {"count": series[1][1], "sum": series[1][0]}
+
+    def render(self) -> List[str]:
+        lines = [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} histogram"]
+        with self._lock:
+            series = sorted((labels, (list(counts), list(totals))) for labels, (counts, totals) in self._series.items())
+        for labels, (counts, (total, count)) in series:
+            cumulative = 0
+            for bound, bucket_count in zip((*self.buckets, float("inf")), counts):
+                cumulative += bucket_count
+                le = 'le="' + _format_value(float(bound)) + '"'
+                lines.append(f"{self.name}_bucket{_format_labels(self.labelnames, labels, le)} {cumulative}")
+            lines.append(f"{self.name}_sum{_format_labels(self.labelnames, labels)} {_format_value(total)}")
+            lines.append(f"{self.name}_count{_format_labels(self.labelnames, labels)} {count}")
+        return lines
+
+
+class _Timer:
+    """``with histogram.time(...)``; a plain class is cheaper than ``@contextmanager``."""
+
+    __slots__ = ("histogram", "labels", "started")
+
+    def __init__(self, histogram: Histogram, labels: LabelValues) -> None:
+        self.histogram = histogram
+        self.labels = labels
+
+    def __enter__(self) -> None:
+        self.started = time.perf_counter()
+
+    def __exit__(self, *exc_info) -> None:
+        self.histogram.observe(time.perf_counter() - self.started, *self.labels)
+
+
+class Gauge:
+    """Read at scrape time from ``read()``: a number, ``{label values: number}`` or ``None``.
+
+    ``kind="counter"`` exposes a monotonic total kept by another component
+    (cache hits, dispatched batches) under the counter type.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        documentation: str,
+        read: Callable[[], GaugeValue],
+        labelnames: Sequence[str] = (),
+        kind: str = "gauge",
+    ) -> None:
+        self.name = name
+        self.documentation = documentation
+        self.read = read
+        self.labelnames = tuple(labelnames)
+        self.kind = kind
+
+    def render(self) -> List[str]:
+        try:
+            value = self.read()
+        except Exception:  # noqa: BLE001 - a broken gauge must not break the scrape
+            value = None
+        if value is None:
+            return []
+        lines = [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} {self.kind}"]
+        values = value if isinstance(value, dict) else {(): value}
+        for labels, number in sorted(values.items()):
+            if number is not None:
+                lines.append(f"{self.name}{_format_labels(self.labelnames, labels)} {_format_value(float(number))}")
+        return lines
+
+
+class MetricsRegistry:
+    def __init__(self) -> None:
+        self._metrics: Dict[str, Union[Counter, Histogram, Gauge]] = {}
+        self._lock = Lock()
+
+    def _register(self, metric):
+        with self._lock:
+            existing = self._metrics.get(metric.name)
+            if existing is not None:
+                if isinstance(metric, Gauge):  # re-registration replaces the callback
+                    self._metrics[metric.name] = metric
+                    return metric
+                return existing
+            self._metrics[metric.name] = metric
+            return metric
+
+    def counter(self, name: str, documentation: str, labelnames: Sequence[str] = ()) -> Counter:
+        return self._register(Counter(name, documentation, labelnames))
+
+    def histogram(
+        self,
+        name: str,
+        documentation: str,
+        labelnames: Sequence[str] = (),
+        buckets: Sequence[float] = LATENCY_BUCKETS,
+    ) -> Histogram:
+        return self._register(Histogram(name, documentation, labelnames, buckets))
+
+    def gauge(
+        self,
+        name: str,
+        documentation: str,
+        read: Callable[[], GaugeValue],
+        labelnames: Sequence[str] = (),
+        kind: str = "gauge",
+    ) -> Gauge:
+        return self._register(Gauge(name, documentation, read, labelnames, kind))
+
+    def render(self) -> str:
+        with self._lock:
+            metrics = list(self._metrics.values())
+        lines: List[str] = []
+        for metric in metrics:
+            lines.extend(metric.render())
+        return "\n".join(lines) + "\n"
+
+
+metrics = MetricsRegistry()
+
+STAGE_SECONDS = metrics.histogram(
+    "mlweb_stage_seconds",
+    "Time spent in an internal stage (parse, tokenize, infer, postprocess, persist).",
+    ["stage"],
+)
+BATCH_SIZE = metrics.histogram(
+    "mlweb_model_batch_size",
+    "Texts per adapter call after cache lookups and deduplication.",
+    buckets=SIZE_BUCKETS,
+)
+
+
+# Stage durations of the current HTTP request, summed per stage for the
+# Server-Timing header.  Threads started through anyio or BlockingExecutor run
+# in a copy of the request context and add to the same dict.
+_request_timings: ContextVar[Optional[Dict[str, float]]] = ContextVar("mlweb_request_timings", default=None)
+
+STAGE_DESCRIPTIONS = {
+    "postprocess": "guardrails",
+    "persist": "stats journal",
+    "batch": "shared micro-batch wait and inference",
+}
+
+
+class _StageTimer(_Timer):
+    __slots__ = ()
+
+    def __exit__(self, *exc_info) -> None:
+        elapsed = time.perf_counter() - self.started
+        self.histogram.observe(elapsed, *self.labels)
+        record_timing(self.labels[0], elapsed)
+
+
+def stage(name: str) -> _Timer:
+    """``with stage("infer"): ...`` records the block's duration for ``name``.
+
+    The duration goes to ``mlweb_stage_seconds`` and, inside an HTTP request,
+    to that request's ``Server-Timing`` header.
+    """
+
+    return _StageTimer(STAGE_SECONDS, (name,))
+
+
+def record_timing(name: str, seconds: float) -> None:
+    """Add ``seconds`` to the current request's ``Server-Timing`` entry ``name``."""
+
+    timings = _request_timings.get()
+    if timings is not None:
+        timings[name] = timings.get(name, 0.0) + seconds
+
+
+def server_timing(timings: Dict[str, float], total: float) -> str:
+    entries = []
+    for name, seconds in (*timings.items(), ("total", total)):
+        desc = STAGE_DESCRIPTIONS.get(name)
+        desc_part = f';desc="{desc}"' if desc else ""
+        entries.append(f"{name}{desc_part};dur={seconds * 1000:.3f}")
+    return ", ".join(entries)
+
+
+class MetricsMiddleware:
+    """ASGI middleware: latency histogram and request counter per route.
+
+    Requests are labelled with the route template (``/jobs/{job_id}``), not
+    the raw path, so the number of series stays bounded; paths that match no
+    API route (static files, 404s) share the ``other`` label.  Every response
+    also carries a ``Server-Timing`` header with the stages recorded while
+    handling it and the ``total`` time until the headers were sent.
+    """
+
+    def __init__(self, app, registry: MetricsRegistry = metrics) -> None:
+        self.app = app
+        self.latency = registry.histogram(
+            "mlweb_http_request_duration_seconds",
+            "HTTP request latency until the last body byte is sent.",
+            ["method", "route"],
+        )
+        self.requests = registry.counter(
+            "mlweb_http_requests_total",
+            "HTTP requests by route and status code.",
+            ["method", "route", "status"],
+        )
+
+    async def __call__(self, scope, receive, send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        started = time.perf_counter()
+        status = ["500"]
+        timings: Dict[str, float] = {}
+        token = _request_timings.set(timings)
+
+        async def send_wrapper(message) -> None:
+            if message["type"] == "http.response.start":
+                status[0] = str(message["status"])
+                header = server_timing(timings, time.perf_counter() - started).encode("latin-1")
+                message = {**message, "headers": [*message.get("headers", []), (b"server-timing", header)]}
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            _request_timings.reset(token)
+            route = getattr(scope.get("route"), "path", "other")
+            self.latency.observe(time.perf_counter() - started, scope["method"], route)
+            self.requests.inc(scope["method"], route, status[0])
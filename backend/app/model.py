@@ -1,22 +1,147 @@
 """Utilities to load and run the sentiment classifier."""
 from __future__ import annotations
 
+import hashlib
 import json
+import logging
+import math
+import re
+import threading
+import time
+import zlib
+from datetime import datetime, timezone
 from pathlib import Path
-from typing import Dict, Iterable, List
+from typing import Callable, Dict, Iterable, List, Optional, Sequence, Tuple
 
-try:  # pragma: no cover - optional dependency
-    import joblib
-except ImportError:  # pragma: no cover
-    joblib = None
+from .cache import PredictionCache, normalize_text
+from .keywords import KeywordMatcher, load_keywords
+from .metrics import BATCH_SIZE, stage
+from .startup import optional_import
 
 try:  # pragma: no cover - optional dependency
-    from transformers import AutoModelForSequenceClassification, AutoTokenizer
-    from transformers.pipelines import TextClassificationPipeline
+    import numpy as np
 except ImportError:  # pragma: no cover
-    AutoModelForSequenceClassification = None
-    AutoTokenizer = None
-    TextClassificationPipeline = None
+    np = None
+
+logger = logging.getLogger(__name__)
+
+# joblib, torch, transformers and onnxruntime are imported lazily through
+# ``optional_import`` when the matching adapter is built.
+
+ONNX_FILENAME = "model.onnx"
+QUANTIZED_WEIGHTS = "quantized_model.pt"
+LINEAR_MANIFEST = "manifest.json"
+LINEAR_FORMAT = "sparse-linear"
+LINEAR_VERSION = 2
+
+Scorer = Callable[[List[str]], Tuple[List[int], object]]
+
+KEYWORD_FILES = {
+    "toxic": "toxic.txt",
+    "positive": "positive.txt",
+    "negative": "negative.txt",
+}
+
+
+WARMUP_TEXTS = [
+    "Спасибо, всё работает быстро и удобно",
+    "Приложение постоянно вылетает, невозможно записаться к врачу",
+    "Подал заявление через портал, жду ответа",
+    "Нормально",
+] * 4
+
+
+def artifact_signature(paths: Iterable[Path], salt: str = "") -> str:
+    """Hash of path, size and mtime of every file under ``paths``.
+
+    Missing paths contribute only their name, so the signature also changes
+    when an artifact appears or disappears.
+    """
+
+    digest = hashlib.blake2b(digest_size=12)
+    digest.update(salt.encode("utf-8"))
+    for root in paths:
+        root = Path(root)
+        digest.update(str(root.resolve()).encode("utf-8"))
+        if root.is_dir():
+            files = sorted(path for path in root.iterdir() if path.is_file())
+        elif root.exists():
+            files = [root]
+        else:
+            files = []
+        for path in files:
+            stat = path.stat()
+            digest.update(f"{path.name}:{stat.st_size}:{stat.st_mtime_ns}".encode("utf-8"))
+    return digest.hexdigest()
+
+
+def _as_matrix(rows: Sequence[Sequence[float]]):
+    """Return ``rows`` as an ``(n, k)`` float array when NumPy is available."""
+
+    if np is None:
+        return [list(row) for row in rows]
+    return np.asarray(rows, dtype=np.float64)
+
+
+def _labels_from_config(config) -> List[str]:
+    """Class names in logit order, as stored in a Hugging Face config."""
+
+    if getattr(config, "id2label", None):
+        labels_map = config.id2label
+        try:
+            ordered_keys = sorted(labels_map.keys(), key=lambda key: int(key))
+        except (TypeError, ValueError):
+            ordered_keys = sorted(labels_map.keys())
+        return [labels_map[key] for key in ordered_keys]
+    return [f"LABEL_{idx}" for idx in range(config.num_labels)]
+
+
+def _softmax(logits):
+    logits = np.asarray(logits, dtype=np.float64)
+    logits = logits - logits.max(axis=1, keepdims=True)
+    proba = np.exp(logits)
+    return proba / proba.sum(axis=1, keepdims=True)
+
+
+def _bucketed_proba(
+    texts: List[str],
+    tokenizer,
+    num_classes: int,
+    forward: Callable[[Dict[str, object]], object],
+    return_tensors: str,
+    batch_size: int = 16,
+    max_length: int | None = None,
+    sort_by_length: bool = True,
+):
+    """Score ``texts`` in sub-batches of similar token length.
+
+    Texts are tokenized once without padding, ordered by length and padded
+    only up to the longest member of each sub-batch, so one long complaint no
+    longer inflates every short text it happens to share a batch with.
+    Rows are written back in the caller's order.
+    """
+
+    proba = np.zeros((len(texts), num_classes), dtype=np.float64)
+    if not texts:
+        return proba
+    with stage("tokenize"):
+        encoded = tokenizer(texts, truncation=True, max_length=max_length)
+    columns = list(encoded.keys())
+    order = list(range(len(texts)))
+    if sort_by_length:
+        order.sort(key=lambda idx: len(encoded["input_ids"][idx]))
+    for start in range(0, len(order), max(1, batch_size)):
+        chunk = order[start : start + batch_size]
+        features = [{name: encoded[name][idx] for name in columns} for idx in chunk]
+        batch = tokenizer.pad(features, padding=True, return_tensors=return_tensors)
+        proba[chunk] = _softmax(forward(batch))
+    return proba
+
+
+def _argmax_rows(rows) -> List[int]:
+    if np is not None and isinstance(rows, np.ndarray):
+        return rows.argmax(axis=1).tolist() if len(rows) else []
+    return [max(range(len(row)), key=row.__getitem__) for row in rows]
 
 
 class BaseAdapter:
@@ -33,12 +158,245 @@ class JoblibAdapter(BaseAdapter):
     def __init__(self, pipeline) -> None:
         self.pipeline = pipeline
         self.classes_ = list(getattr(pipeline, "classes_", ["negative", "neutral", "positive"]))
+        # Pipeline.predict_proba split in two, so feature extraction is timed on its own.
+        steps = getattr(pipeline, "steps", None)
+        self._transform = pipeline[:-1] if steps and len(steps) > 1 else None
 
     def predict(self, texts: Iterable[str]) -> List[str]:
         return list(self.pipeline.predict(list(texts)))
 
     def predict_proba(self, texts: Iterable[str]):
-        return self.pipeline.predict_proba(list(texts))
+        if self._transform is None:
+            return self.pipeline.predict_proba(list(texts))
+        with stage("tokenize"):
+            features = self._transform.transform(list(texts))
+        return self.pipeline[-1].predict_proba(features)
+
+
+def _term_hash(data: bytes) -> int:
+    """Stable 64-bit hash of an encoded vocabulary term (same in every process)."""
+
+    return (zlib.crc32(data) << 32) | zlib.adler32(data)
+
+
+class MappedVocabulary:
+    """Token -> feature index table stored as flat NumPy arrays.
+
+    Terms are kept in the order of their 64-bit hashes (``vocab_hashes.npy``),
+    with feature ids, byte offsets and the concatenated UTF-8 terms alongside.
+    Opened with ``mmap_mode="r"`` the arrays live in the page cache and are
+    shared by every process on the node instead of each one building its own
+    ``dict``.  Hash hits are confirmed against the stored bytes, so collisions
+    never produce a wrong feature.
+    """
+
+    FILES = ("vocab_hashes.npy", "vocab_ids.npy", "vocab_offsets.npy", "vocab_terms.npy")
+
+    def __init__(self, model_dir: Path, mmap_mode: str | None = "r") -> None:
+        # ``np.asarray`` drops the ``memmap`` subclass (and its per-access
+        # overhead) while keeping the file-backed buffer.
+        self.hashes, self.ids, self.offsets, self.terms = (
+            np.asarray(np.load(model_dir / name, mmap_mode=mmap_mode)) for name in self.FILES
+        )
+        self._terms_view = memoryview(self.terms)
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+    @classmethod
+    def save(cls, model_dir: Path, vocabulary: Dict[str, int]) -> None:
+        entries = sorted(
+            ((_term_hash(term.encode("utf-8")), term.encode("utf-8"), idx) for term, idx in vocabulary.items())
+        )
+        lengths = [len(data) for _, data, _ in entries]
+        arrays = (
+            np.array([item[0] for item in entries], dtype=np.uint64),
+            np.array([item[2] for item in entries], dtype=np.int64),
+            np.concatenate([[0], np.cumsum(lengths, dtype=np.int64)]).astype(np.int64),
+            np.frombuffer(b"".join(data for _, data, _ in entries), dtype=np.uint8),
+        )
+        for name, array in zip(cls.FILES, arrays):
+            np.save(model_dir / name, array)
+
+    def items(self) -> Iterable[Tuple[str, int]]:
+        offsets = self.offsets.tolist()
+        blob = self.terms.tobytes()
+        for pos, idx in enumerate(self.ids.tolist()):
+            yield blob[offsets[pos] : offsets[pos + 1]].decode("utf-8"), idx
+
+    def lookup(self, terms: Sequence[str]) -> List[int]:
+        """Feature index of every term, ``-1`` for out-of-vocabulary ones."""
+
+        size = len(self.hashes)
+        if not terms or not size:
+            return [-1] * len(terms)
+        encoded = [term.encode("utf-8") for term in terms]
+        hashes = np.fromiter((_term_hash(data) for data in encoded), dtype=np.uint64, count=len(encoded))
+        positions = np.searchsorted(self.hashes, hashes)
+        np.minimum(positions, size - 1, out=positions)
+        hits = np.flatnonzero(self.hashes[positions] == hashes)
+        found = [-1] * len(terms)
+        if not len(hits):
+            return found
+        # One gather per array for all hits; the loop below only compares bytes.
+        hit_positions = positions[hits]
+        starts = self.offsets[hit_positions].tolist()
+        ends = self.offsets[hit_positions + 1].tolist()
+        ids = self.ids[hit_positions].tolist()
+        view = self._terms_view
+        for item, pos, start, end, idx in zip(hits.tolist(), hit_positions.tolist(), starts, ends, ids):
+            data = encoded[item]
+            if view[start:end] == data:
+                found[item] = idx
+            else:
+                found[item] = self._probe(pos + 1, data)
+        return found
+
+    def _probe(self, pos: int, data: bytes) -> int:
+        """Walk the rest of a run of equal hashes (a 64-bit collision)."""
+
+        target = self.hashes[pos - 1]
+        while pos < len(self.hashes) and self.hashes[pos] == target:
+            if self._terms_view[self.offsets[pos] : self.offsets[pos + 1]] == data:
+                return int(self.ids[pos])
+            pos += 1
+        return -1
+
+
+class _DictVocabulary:
+    """In-process ``dict`` built from a :class:`MappedVocabulary`: faster, not shared."""
+
+    def __init__(self, mapped: MappedVocabulary) -> None:
+        self._index = dict(mapped.items())
+
+    def __len__(self) -> int:
+        return len(self._index)
+
+    def lookup(self, terms: Sequence[str]) -> List[int]:
+        get = self._index.get
+        return [get(term, -1) for term in terms]
+
+
+class LinearAdapter(BaseAdapter):
+    """TF-IDF + linear classifier evaluated directly from exported arrays.
+
+    Reads the pickle-free artifact written by ``ml/export_linear.py``
+    (``manifest.json``, the :class:`MappedVocabulary` arrays, ``idf.npy``,
+    ``coef.npy``, ``intercept.npy``) and reproduces ``TfidfVectorizer`` +
+    ``LogisticRegression`` without sklearn: regex tokens, word n-grams,
+    (sublinear) tf * idf, row normalisation and softmax over
+    ``coef @ x + intercept``.  With ``mmap=True`` every array is memory-mapped
+    read-only, so uvicorn workers on one node share a single copy.
+    """
+
+    def __init__(self, model_dir: Path, mmap: bool = False) -> None:
+        if np is None:
+            raise ImportError("numpy is required for the linear engine")
+        manifest = json.loads((model_dir / LINEAR_MANIFEST).read_text(encoding="utf-8"))
+        if manifest.get("format") != LINEAR_FORMAT:
+            raise ValueError(f"{model_dir} is not a {LINEAR_FORMAT} artifact")
+        if manifest.get("version") != LINEAR_VERSION:
+            raise ValueError(
+                f"{model_dir} has {LINEAR_FORMAT} version {manifest.get('version')}, "
+                f"this service reads version {LINEAR_VERSION}; re-run ml/export_linear.py"
+            )
+        self.manifest = manifest
+        self.classes_ = list(manifest["classes"])
+        self.lowercase = bool(manifest["lowercase"])
+        self.token_pattern = re.compile(manifest["token_pattern"])
+        self.min_n, self.max_n = manifest["ngram_range"]
+        self.stop_words = frozenset(manifest.get("stop_words") or ())
+        self.binary = bool(manifest["binary"])
+        self.sublinear_tf = bool(manifest["sublinear_tf"])
+        self.norm = manifest["norm"]
+        self.multi_class = manifest["multi_class"]
+        mmap_mode = "r" if mmap else None
+        self.mmap = mmap
+        mapped = MappedVocabulary(model_dir, mmap_mode=mmap_mode)
+        self.vocabulary = mapped if mmap else _DictVocabulary(mapped)
+        idf_path = model_dir / "idf.npy"
+        self.idf = np.asarray(np.load(idf_path, mmap_mode=mmap_mode)) if idf_path.exists() else None
+        # Stored as sklearn's (n_classes, n_features); rows of the transposed
+        # view are gathered per feature.  Only the private copy is made
+        # contiguous, a mapped file is used as is.
+        weights = np.asarray(np.load(model_dir / "coef.npy", mmap_mode=mmap_mode)).T
+        self.weights = weights if mmap else np.ascontiguousarray(weights)
+        self.intercept = np.load(model_dir / "intercept.npy")
+
+    def _features(self, text: str) -> Tuple[List[int], List[float]]:
+        """Sorted feature indices and tf-idf values of one document."""
+
+        if self.lowercase:
+            text = text.lower()
+        tokens = self.token_pattern.findall(text)
+        if self.stop_words:
+            tokens = [token for token in tokens if token not in self.stop_words]
+        grams: List[str] = []
+        for n in range(self.min_n, min(self.max_n, len(tokens)) + 1):
+            if n == 1:
+                grams.extend(tokens)
+            else:
+                grams.extend(" ".join(tokens[i : i + n]) for i in range(len(tokens) - n + 1))
+        counts: Dict[int, int] = {}
+        for idx in self.vocabulary.lookup(grams):
+            if idx >= 0:
+                counts[idx] = counts.get(idx, 0) + 1
+        indices = sorted(counts)
+        if self.binary:
+            values = [1.0] * len(indices)
+        elif self.sublinear_tf:
+            values = [math.log(counts[idx]) + 1.0 for idx in indices]
+        else:
+            values = [float(counts[idx]) for idx in indices]
+        return indices, values
+
+    def decision_function(self, texts: Iterable[str]):
+        texts = list(texts)
+        rows: List[int] = []
+        indices: List[int] = []
+        values: List[float] = []
+        with stage("tokenize"):
+            for row, text in enumerate(texts):
+                row_indices, row_values = self._features(text)
+                rows.extend([row] * len(row_indices))
+                indices.extend(row_indices)
+                values.extend(row_values)
+        rows_arr = np.asarray(rows, dtype=np.intp)
+        idx_arr = np.asarray(indices, dtype=np.intp)
+        data = np.asarray(values, dtype=np.float64)
+        if self.idf is not None:
+            data *= self.idf[idx_arr]
+        if self.norm == "l2":
+            norms = np.sqrt(np.bincount(rows_arr, weights=data * data, minlength=len(texts)))
+        elif self.norm == "l1":
+            norms = np.bincount(rows_arr, weights=np.abs(data), minlength=len(texts))
+        else:
+            norms = None
+        if norms is not None and len(data):
+            norms[norms == 0.0] = 1.0
+            data /= norms[rows_arr]
+        contributions = self.weights[idx_arr] * data[:, None]
+        scores = np.empty((len(texts), self.weights.shape[1]), dtype=np.float64)
+        for column in range(self.weights.shape[1]):
+            scores[:, column] = np.bincount(
+                rows_arr, weights=contributions[:, column], minlength=len(texts)
+            )
+        return scores + self.intercept
+
+    def predict(self, texts: Iterable[str]) -> List[str]:
+        return [self.classes_[idx] for idx in _argmax_rows(self.predict_proba(texts))]
+
+    def predict_proba(self, texts: Iterable[str]):
+        scores = self.decision_function(texts)
+        if scores.shape[1] == 1 and self.multi_class == "multinomial":
+            return _softmax(np.column_stack([-scores[:, 0], scores[:, 0]]))
+        if scores.shape[1] == 1:
+            positive = 1.0 / (1.0 + np.exp(-scores[:, 0]))
+            return np.column_stack([1.0 - positive, positive])
+        if self.multi_class == "ovr":
+            proba = 1.0 / (1.0 + np.exp(-scores))
+            return proba / proba.sum(axis=1, keepdims=True)
+        return _softmax(scores)
 
 
 class KeywordFallbackAdapter(BaseAdapter):
@@ -67,21 +425,31 @@ class KeywordFallbackAdapter(BaseAdapter):
         "проблема",
     }
 
+    def __init__(
+        self,
+        positive_keywords: Iterable[str] | None = None,
+        negative_keywords: Iterable[str] | None = None,
+        matcher: KeywordMatcher | None = None,
+    ) -> None:
+        # ``matcher`` may hold more categories (SentimentModel shares one with
+        # the toxicity guardrail); only ``positive`` and ``negative`` are scored.
+        self.matcher = matcher or KeywordMatcher(
+            {
+                "positive": self.positive_keywords if positive_keywords is None else positive_keywords,
+                "negative": self.negative_keywords if negative_keywords is None else negative_keywords,
+            }
+        )
+
     def predict(self, texts: Iterable[str]) -> List[str]:
-        return [self._predict_text(text) for text in texts]
+        return [self.classes_[idx] for idx in _argmax_rows(self.predict_proba(texts))]
 
     def predict_proba(self, texts: Iterable[str]):
-        return [self._scores(text) for text in texts]
-
-    def _predict_text(self, text: str) -> str:
-        probs = self._scores(text)
-        max_index = max(range(len(probs)), key=lambda idx: probs[idx])
-        return self.classes_[max_index]
+        return _as_matrix([self._scores(text) for text in texts])
 
     def _scores(self, text: str) -> List[float]:
-        text_lower = text.lower()
-        pos_hits = sum(word in text_lower for word in self.positive_keywords)
-        neg_hits = sum(word in text_lower for word in self.negative_keywords)
+        hits = self.matcher.find(text)
+        pos_hits = len(hits.get("positive", ()))
+        neg_hits = len(hits.get("negative", ()))
         total = pos_hits + neg_hits
         if total == 0:
             return [0.2, 0.6, 0.2]
@@ -96,53 +464,205 @@ class KeywordFallbackAdapter(BaseAdapter):
 
 
 class TransformerAdapter(BaseAdapter):
-    def __init__(self, model_dir: Path) -> None:
-        if AutoTokenizer is None or AutoModelForSequenceClassification is None:
-            raise ImportError("transformers is required to load transformer models")
-        self.tokenizer = AutoTokenizer.from_pretrained(model_dir)
-        self.model = AutoModelForSequenceClassification.from_pretrained(model_dir)
-        if TextClassificationPipeline is None:  # pragma: no cover
-            raise ImportError("transformers pipelines are required")
-        self.pipeline = TextClassificationPipeline(
-            model=self.model,
-            tokenizer=self.tokenizer,
-            function_to_apply="softmax",
-            top_k=None,
-        )
-        if hasattr(self.model.config, "id2label"):
-            labels_map = self.model.config.id2label
-            try:
-                ordered_keys = sorted(labels_map.keys(), key=lambda key: int(key))
-            except (TypeError, ValueError):
-                ordered_keys = sorted(labels_map.keys())
-            self.classes_ = [labels_map[key] for key in ordered_keys]
+    """Hugging Face classifier; loads int8 weights when ``quantized_model.pt`` is present.
+
+    Inputs are scored in length-bucketed sub-batches of ``batch_size`` texts
+    truncated to ``max_length`` tokens (the tokenizer limit by default).
+    """
+
+    def __init__(
+        self,
+        model_dir: Path,
+        batch_size: int = 16,
+        max_length: int | None = None,
+        sort_by_length: bool = True,
+    ) -> None:
+        self._torch = optional_import("torch")
+        transformers = optional_import("transformers")
+        if transformers is None or self._torch is None:
+            raise ImportError("transformers and torch are required to load transformer models")
+        self.batch_size = batch_size
+        self.max_length = max_length
+        self.sort_by_length = sort_by_length
+        self.tokenizer = transformers.AutoTokenizer.from_pretrained(model_dir)
+        self.quantized = (model_dir / QUANTIZED_WEIGHTS).exists()
+        if self.quantized:
+            self.model = self._load_quantized(model_dir)
         else:
-            self.classes_ = [f"LABEL_{idx}" for idx in range(self.model.config.num_labels)]
+            self.model = transformers.AutoModelForSequenceClassification.from_pretrained(model_dir)
+        self.model.eval()
+        self.classes_ = _labels_from_config(self.model.config)
+
+    def _load_quantized(self, model_dir: Path):
+        """Rebuild the architecture, apply dynamic int8 quantization, load weights."""
+
+        torch = self._torch
+        transformers = optional_import("transformers")
+        config = transformers.AutoConfig.from_pretrained(model_dir)
+        model = transformers.AutoModelForSequenceClassification.from_config(config)
+        model = torch.quantization.quantize_dynamic(model, {torch.nn.Linear}, dtype=torch.qint8)
+        model.load_state_dict(torch.load(model_dir / QUANTIZED_WEIGHTS, map_location="cpu"))
+        model.eval()
+        return model
 
     def predict(self, texts: Iterable[str]) -> List[str]:
-        proba = self.predict_proba(texts)
-        predictions = []
-        for row in proba:
-            max_index = max(range(len(row)), key=lambda idx: row[idx])
-            predictions.append(self.classes_[max_index])
-        return predictions
+        return [self.classes_[idx] for idx in _argmax_rows(self.predict_proba(texts))]
 
     def predict_proba(self, texts: Iterable[str]):
-        outputs = self.pipeline(
+        return _bucketed_proba(
             list(texts),
-            truncation=True,
-            padding=True,
-            return_all_scores=True,
+            self.tokenizer,
+            len(self.classes_),
+            self._forward,
+            return_tensors="pt",
+            batch_size=self.batch_size,
+            max_length=self.max_length,
+            sort_by_length=self.sort_by_length,
+        )
+
+    def _forward(self, batch) -> object:
+        with self._torch.inference_mode():
+            return self.model(**batch).logits.float().numpy()
+
+
+class OnnxAdapter(BaseAdapter):
+    """Run an exported transformer graph with ONNX Runtime on CPU.
+
+    Expects ``model.onnx`` (see ``ml/export_onnx.py``) next to the tokenizer
+    and ``config.json`` of the fine-tuned model; classes follow the
+    ``id2label`` order exactly like :class:`TransformerAdapter`.
+    """
+
+    def __init__(
+        self,
+        model_dir: Path,
+        batch_size: int = 16,
+        max_length: int | None = None,
+        sort_by_length: bool = True,
+        intra_op_threads: int = 0,
+    ) -> None:
+        onnxruntime = optional_import("onnxruntime")
+        transformers = optional_import("transformers")
+        if onnxruntime is None or transformers is None or np is None:
+            raise ImportError("onnxruntime, transformers and numpy are required for ONNX models")
+        self.batch_size = batch_size
+        self.max_length = max_length
+        self.sort_by_length = sort_by_length
+        self.tokenizer = transformers.AutoTokenizer.from_pretrained(model_dir)
+        self.classes_ = _labels_from_config(transformers.AutoConfig.from_pretrained(model_dir))
+        options = onnxruntime.SessionOptions()
+        options.graph_optimization_level = onnxruntime.GraphOptimizationLevel.ORT_ENABLE_ALL
+        if intra_op_threads:
+            options.intra_op_num_threads = intra_op_threads
+        self.session = onnxruntime.InferenceSession(
+            str(model_dir / ONNX_FILENAME),
+            sess_options=options,
+            providers=["CPUExecutionProvider"],
         )
-        proba_rows = []
-        for sample_scores in outputs:
-            mapping = {item["label"]: float(item["score"]) for item in sample_scores}
-            row = [mapping.get(label, 0.0) for label in self.classes_]
-            total = sum(row)
-            if total:
-                row = [val / total for val in row]
-            proba_rows.append(row)
-        return proba_rows
+        self._input_names = [item.name for item in self.session.get_inputs()]
+
+    def predict(self, texts: Iterable[str]) -> List[str]:
+        return [self.classes_[idx] for idx in _argmax_rows(self.predict_proba(texts))]
+
+    def predict_proba(self, texts: Iterable[str]):
+        return _bucketed_proba(
+            list(texts),
+            self.tokenizer,
+            len(self.classes_),
+            self._forward,
+            return_tensors="np",
+            batch_size=self.batch_size,
+            max_length=self.max_length,
+            sort_by_length=self.sort_by_length,
+        )
+
+    def _forward(self, batch) -> object:
+        feeds = {name: batch[name].astype(np.int64) for name in self._input_names if name in batch}
+        (logits,) = self.session.run(["logits"], feeds)
+        return logits
+
+
+class CascadeAdapter(BaseAdapter):
+    """Answer from a cheap adapter, escalate low-confidence rows to an expensive one.
+
+    Rows whose top ``primary`` probability is below ``threshold`` are sent to
+    ``fallback`` in one batch and their scores replaced.  Both adapters must
+    predict the same label set; ``fallback`` columns are reordered to the
+    ``primary`` class order.
+    """
+
+    def __init__(self, primary: BaseAdapter, fallback: BaseAdapter, threshold: float = 0.8) -> None:
+        if np is None:
+            raise ImportError("numpy is required for the model cascade")
+        if set(primary.classes_) != set(fallback.classes_):
+            raise ValueError(
+                f"Cascade stages predict different labels: {primary.classes_} vs {fallback.classes_}"
+            )
+        self.primary = primary
+        self.fallback = fallback
+        self.threshold = threshold
+        self.classes_ = list(primary.classes_)
+        self._columns = [list(fallback.classes_).index(label) for label in self.classes_]
+        self._lock = threading.Lock()
+        self._calls = 0
+        self._rows = 0
+        self._escalated = 0
+        self._primary_seconds = 0.0
+        self._fallback_seconds = 0.0
+
+    def predict(self, texts: Iterable[str]) -> List[str]:
+        return [self.classes_[idx] for idx in _argmax_rows(self.predict_proba(texts))]
+
+    def predict_proba(self, texts: Iterable[str]):
+        texts = list(texts)
+        started = time.perf_counter()
+        proba = np.array(self.primary.predict_proba(texts), dtype=np.float64)
+        primary_seconds = time.perf_counter() - started
+        fallback_seconds = 0.0
+        uncertain = np.flatnonzero(proba.max(axis=1) < self.threshold) if len(texts) else []
+        if len(uncertain):
+            started = time.perf_counter()
+            escalated = self.fallback.predict_proba([texts[idx] for idx in uncertain.tolist()])
+            fallback_seconds = time.perf_counter() - started
+            proba[uncertain] = np.asarray(escalated, dtype=np.float64)[:, self._columns]
+        with self._lock:
+            self._calls += 1
+            self._rows += len(texts)
+            self._escalated += len(uncertain)
+            self._primary_seconds += primary_seconds
+            self._fallback_seconds += fallback_seconds
+        return proba
+
+    def snapshot(self) -> Dict[str, object]:
+        with self._lock:
+            rows, escalated = self._rows, self._escalated
+            return {
+                "threshold": self.threshold,
+                "primary": type(self.primary).__name__,
+                "fallback": type(self.fallback).__name__,
+                "calls": self._calls,
+                "rows": rows,
+                "escalated": escalated,
+                "escalation_rate": escalated / rows if rows else 0.0,
+                "primary_ms_per_row": self._primary_seconds * 1000 / rows if rows else 0.0,
+                "fallback_ms_per_row": self._fallback_seconds * 1000 / escalated if escalated else 0.0,
+            }
+
+
+def dedupe_texts(texts: Sequence[str]) -> Tuple[List[str], List[int]]:
+    """First occurrence of each normalized text and, per input, its index in that list."""
+
+    seen: Dict[str, int] = {}
+    unique: List[str] = []
+    positions: List[int] = []
+    for text in texts:
+        key = normalize_text(text)
+        pos = seen.get(key)
+        if pos is None:
+            pos = seen[key] = len(unique)
+            unique.append(text)
+        positions.append(pos)
+    return unique, positions
 
 
 class SentimentModel:
@@ -164,34 +684,138 @@ class SentimentModel:
         "грязн",
     }
 
-    def __init__(self, model_path: Path, metadata_path: Path | None = None):
+    def __init__(
+        self,
+        model_path: Path,
+        metadata_path: Path | None = None,
+        cache: PredictionCache | None = None,
+        keywords_dir: Path | None = None,
+        transformer_options: Dict[str, object] | None = None,
+        mmap: bool = False,
+        cascade_path: Path | None = None,
+        cascade_threshold: float = 0.8,
+        fallback_path: Path | None = None,
+    ):
         self.model_path = model_path
+        self.fallback_path = fallback_path
+        self.mmap = mmap
+        self.cascade_path = cascade_path
+        self.cascade_threshold = cascade_threshold
+        self.keywords_dir = keywords_dir
+        self.transformer_options = dict(transformer_options or {})
+        self.keywords = self._load_keywords()
+        # One automaton over every category serves both the guardrail and the
+        # keyword fallback adapter.
+        self._keyword_matcher = KeywordMatcher(self.keywords)
         if metadata_path is not None:
             self.metadata_path = metadata_path
         elif model_path.is_dir():
             self.metadata_path = model_path / "metadata.json"
         else:
             self.metadata_path = model_path.with_name("metadata.json")
+        started = time.perf_counter()
         self.adapter = self._build_adapter(model_path)
+        if cascade_path is not None:
+            self.adapter = self._build_cascade(self.adapter, cascade_path)
+        self.load_time_ms = (time.perf_counter() - started) * 1000
+        self.warmup_ms: float | None = None
+        self.loaded_at = datetime.now(timezone.utc).isoformat()
         self.labels: List[str] = list(
             getattr(self.adapter, "classes_", ["negative", "neutral", "positive"])
         )
         self.metadata = self._load_metadata()
         self._negative_label = self._find_negative_label()
+        self._guardrail_row = self._build_guardrail_row()
+        self.fingerprint = self._compute_fingerprint()
+        self.cache = cache
+        if self.cache is not None:
+            self.cache.bind(self.fingerprint)
 
     def _build_adapter(self, model_path: Path) -> BaseAdapter:
+        if model_path.is_dir() and (model_path / LINEAR_MANIFEST).exists():
+            try:
+                return LinearAdapter(model_path, mmap=self.mmap)
+            except Exception:
+                # A stale or half-written export must not degrade the
+                # service to keywords while the source pipeline is there.
+                logger.exception("Cannot load the linear engine from %s", model_path)
+                if self.fallback_path is not None and self.fallback_path != model_path:
+                    logger.warning("Serving %s instead", self.fallback_path)
+                    return self._build_adapter(self.fallback_path)
         if model_path.is_dir() and (model_path / "config.json").exists():
+            if (model_path / ONNX_FILENAME).exists():
+                try:
+                    return OnnxAdapter(model_path, **self.transformer_options)
+                except Exception:  # pragma: no cover - fall back to PyTorch below
+                    pass
             try:
-                return TransformerAdapter(model_path)
+                return TransformerAdapter(model_path, **self.transformer_options)
             except Exception:  # pragma: no cover - fallback handled gracefully
                 pass
-        if joblib is not None and model_path.exists():
+        joblib = optional_import("joblib") if model_path.is_file() else None
+        if joblib is not None:
             try:
-                pipeline = joblib.load(model_path)
+                # Uncompressed joblib files keep NumPy arrays (idf, coef) in
+                # place, so ``mmap_mode`` shares them; the vocabulary dict
+                # is still unpickled per process.
+                pipeline = joblib.load(model_path, mmap_mode="r" if self.mmap else None)
                 return JoblibAdapter(pipeline)
             except Exception:  # pragma: no cover - fallback handled below
                 pass
-        return KeywordFallbackAdapter()
+        return KeywordFallbackAdapter(matcher=self._keyword_matcher)
+
+    def _build_cascade(self, primary: BaseAdapter, cascade_path: Path) -> BaseAdapter:
+        """Put the adapter at ``cascade_path`` behind ``primary``; skip if either is missing."""
+
+        fallback = self._build_adapter(cascade_path)
+        if isinstance(primary, KeywordFallbackAdapter):
+            return fallback
+        if isinstance(fallback, KeywordFallbackAdapter):
+            return primary
+        return CascadeAdapter(primary, fallback, self.cascade_threshold)
+
+    def _keyword_files(self) -> Dict[str, Path]:
+        if self.keywords_dir is None:
+            return {}
+        files = {
+            category: self.keywords_dir / filename for category, filename in KEYWORD_FILES.items()
+        }
+        return {category: path for category, path in files.items() if path.exists()}
+
+    def _load_keywords(self) -> Dict[str, set]:
+        """Built-in dictionaries extended by optional files from ``keywords_dir``."""
+
+        keywords = {
+            "toxic": set(self.toxic_keywords),
+            "positive": set(KeywordFallbackAdapter.positive_keywords),
+            "negative": set(KeywordFallbackAdapter.negative_keywords),
+        }
+        for category, path in self._keyword_files().items():
+            keywords[category].update(load_keywords(path))
+        return keywords
+
+    def _compute_fingerprint(self) -> str:
+        """Identify the loaded artifact (path, size and mtime of its files)."""
+
+        paths = [self.model_path, *self._keyword_files().values()]
+        salt = type(self.adapter).__name__
+        if isinstance(self.adapter, CascadeAdapter):
+            paths.append(self.cascade_path)
+            salt += f":{self.cascade_threshold}"
+        return artifact_signature(paths, salt=salt)
+
+    def warmup(self, texts: Sequence[str] | None = None) -> float:
+        """Run synthetic batches through the adapter; returns elapsed ms.
+
+        Uses :meth:`score_batch` so the prediction cache is not populated.
+        """
+
+        texts = list(texts or WARMUP_TEXTS)
+        started = time.perf_counter()
+        self.score_batch(texts)
+        self.score_batch(texts[:1])
+        self.warmup_ms = (time.perf_counter() - started) * 1000
+        return self.warmup_ms
 
     def _load_metadata(self) -> Dict[str, object]:
         if not self.metadata_path.exists():
@@ -214,20 +838,134 @@ class SentimentModel:
     def predict_label(self, text: str) -> str:
         return self.adapter.predict([text])[0]
 
+    def cached(self, text: str) -> Optional[Dict[str, object]]:
+        """Cached result for ``text`` or ``None``; the miss is left to the classify call that follows."""
+
+        if self.cache is None:
+            return None
+        return self.cache.get(self.cache.key(text, self.fingerprint), count_miss=False)
+
     def classify(self, text: str) -> Dict[str, object]:
-        probabilities = self.predict(text)
-        label = max(probabilities.items(), key=lambda pair: pair[1])[0]
-        return {"label": label, "scores": probabilities}
-
-    def classify_batch(self, texts: List[str]) -> List[Dict[str, object]]:
-        results: List[Dict[str, object]] = []
-        proba = self.adapter.predict_proba(texts)
-        for text, row in zip(texts, proba):
-            probabilities = {cls: float(score) for cls, score in zip(self.labels, row)}
-            probabilities = self._apply_guardrails(text, probabilities)
-            label = max(probabilities.items(), key=lambda item: item[1])[0]
-            results.append({"label": label, "scores": probabilities})
-        return results
+        key = self.cache.key(text, self.fingerprint) if self.cache is not None else None
+        if key is not None:
+            cached = self.cache.get(key)
+            if cached is not None:
+                return cached
+        result = self._classify_uncached([text])[0]
+        if key is not None:
+            self.cache.put(key, result)
+        return result
+
+    def classify_batch(
+        self, texts: List[str], scorer: Scorer | None = None
+    ) -> List[Dict[str, object]]:
+        """Classify ``texts``; ``scorer`` replaces :meth:`score_batch` for cache misses.
+
+        Texts that are equal after :func:`normalize_text` (the cache key) are
+        scored once and the shared result is returned at every position.
+        """
+
+        unique, positions = dedupe_texts(texts)
+        if self.cache is None:
+            results = self._classify_uncached(unique, scorer)
+        else:
+            keys = [self.cache.key(text, self.fingerprint) for text in unique]
+            cached: List[Optional[Dict[str, object]]] = [self.cache.get(key) for key in keys]
+            missing = [idx for idx, result in enumerate(cached) if result is None]
+            if missing:
+                computed = self._classify_uncached([unique[idx] for idx in missing], scorer)
+                for idx, result in zip(missing, computed):
+                    self.cache.put(keys[idx], result)
+                    cached[idx] = result
+            results = cached  # type: ignore[assignment]
+        if len(unique) == len(texts):
+            return results  # type: ignore[return-value]
+        return [results[pos] for pos in positions]  # type: ignore[misc]
+
+    def score_texts(self, texts: List[str], scorer: Scorer | None = None) -> Tuple[List[int], object]:
+        """:meth:`classify_batch` as label indices and an ``(n, k)`` score matrix.
+
+        Used for the compact response formats: cache hits and fresh scores are
+        assembled into one matrix in ``self.labels`` order without building a
+        ``{"label", "scores"}`` dict per row.
+        """
+
+        unique, positions = dedupe_texts(texts)
+        if not unique:
+            return [], np.zeros((0, len(self.labels))) if np is not None else []
+        if self.cache is None:
+            label_ids, proba = (scorer or self.score_batch)(unique)
+        else:
+            labels = tuple(self.labels)
+            index = {label: idx for idx, label in enumerate(labels)}
+            keys = [self.cache.key(text, self.fingerprint) for text in unique]
+            entries = [self.cache.get_row(key) for key in keys]
+            missing = [idx for idx, entry in enumerate(entries) if entry is None]
+            if len(missing) == len(unique):
+                label_ids, proba = (scorer or self.score_batch)(unique)
+                rows = proba.tolist() if hasattr(proba, "tolist") else proba
+                for key, label_idx, row in zip(keys, label_ids, rows):
+                    self.cache.put_row(key, labels[label_idx], labels, row)
+            else:
+                label_ids = [0] * len(unique)
+                rows = [None] * len(unique)
+                for idx, entry in enumerate(entries):
+                    if entry is not None:
+                        label, cached_labels, row = entry
+                        if cached_labels != labels:
+                            row = [dict(zip(cached_labels, row))[name] for name in labels]
+                        label_ids[idx], rows[idx] = index[label], row
+                if missing:
+                    computed_ids, computed = (scorer or self.score_batch)([unique[idx] for idx in missing])
+                    computed_rows = computed.tolist() if hasattr(computed, "tolist") else computed
+                    for idx, label_idx, row in zip(missing, computed_ids, computed_rows):
+                        self.cache.put_row(keys[idx], labels[label_idx], labels, row)
+                        label_ids[idx], rows[idx] = label_idx, row
+                proba = np.asarray(rows, dtype=np.float64) if np is not None else rows
+        if len(unique) == len(texts):
+            return list(label_ids), proba
+        if np is not None:
+            proba = np.asarray(proba)[positions]
+        else:
+            proba = [proba[pos] for pos in positions]
+        return [label_ids[pos] for pos in positions], proba
+
+    def score_batch(self, texts: List[str]) -> Tuple[List[int], object]:
+        """Label indices and the ``(n, k)`` score matrix after guardrails.
+
+        Scores stay a NumPy array (list of rows without NumPy) in
+        ``self.labels`` order, so callers that do not need per-row dicts can
+        skip materializing them.
+        """
+
+        BATCH_SIZE.observe(len(texts))
+        with stage("infer"):
+            proba = self.adapter.predict_proba(texts)
+        with stage("postprocess"):
+            toxic = [self._keyword_matcher.contains(text, "toxic") for text in texts]
+            if np is not None:
+                proba = np.array(proba, dtype=np.float64)
+                mask = np.fromiter(toxic, dtype=bool, count=len(texts))
+                if mask.any():
+                    proba[mask] = self._guardrail_row
+            else:
+                proba = [
+                    list(self._guardrail_row) if is_toxic else [float(score) for score in row]
+                    for row, is_toxic in zip(proba, toxic)
+                ]
+            label_ids = _argmax_rows(proba)
+        return label_ids, proba
+
+    def _classify_uncached(
+        self, texts: List[str], scorer: Scorer | None = None
+    ) -> List[Dict[str, object]]:
+        label_ids, proba = (scorer or self.score_batch)(texts)
+        rows = proba.tolist() if hasattr(proba, "tolist") else proba
+        labels = self.labels
+        return [
+            {"label": labels[label_idx], "scores": dict(zip(labels, row))}
+            for label_idx, row in zip(label_ids, rows)
+        ]
 
     def _find_negative_label(self) -> str:
         """Best-effort pick for the negative class label name."""
@@ -237,6 +975,14 @@ class SentimentModel:
                 return label
         return self.labels[0]
 
+    def _build_guardrail_row(self) -> List[float]:
+        """Scores assigned to texts caught by the toxic guardrail."""
+
+        adjusted = {label: 0.01 for label in self.labels}
+        adjusted[self._negative_label] = 0.98
+        total = sum(adjusted.values())
+        return [adjusted[label] / total for label in self.labels]
+
     def _apply_guardrails(
         self, text: str, probabilities: Dict[str, float]
     ) -> Dict[str, float]:
@@ -247,13 +993,6 @@ class SentimentModel:
         оскорбления не маркировались как positive/neutral.
         """
 
-        lower = text.casefold()
-        if not any(token in lower for token in self.toxic_keywords):
+        if not self._keyword_matcher.contains(text, "toxic"):
             return probabilities
-
-        adjusted = {label: 0.01 for label in self.labels}
-        adjusted[self._negative_label] = 0.98
-        total = sum(adjusted.values())
-        if total:
-            adjusted = {label: score / total for label, score in adjusted.items()}
-        return adjusted
+        return dict(zip(self.labels, self._guardrail_row))
@@ -0,0 +1,165 @@
+"""Opt-in cProfile capture of a single request.
+
+With ``APP_PROFILE_REQUESTS=true`` a request sent with ``?profile=1`` or an
+``X-Profile: 1`` header (plus ``X-Admin-Token`` when ``APP_ADMIN_TOKEN`` is
+set) is profiled.  Blocking work runs in worker threads, and cProfile only sees
+the thread it is enabled in, so the code paths wrap their work in
+:func:`profiled`.  It is a plain call unless the current request asked for a
+profile.  The merged profile is written to ``APP_PROFILE_DIR`` as
+``<id>.prof`` (``pstats``/snakeviz) and ``<id>.txt`` (top functions by
+cumulative time); only the newest ``APP_PROFILE_KEEP`` profiles are kept.
+The response names it in ``X-Profile-Id``; both files are served by
+``GET /admin/profiles/{id}``.
+"""
+from __future__ import annotations
+
+import cProfile
+import io
+import pstats
+import re
+import threading
+import uuid
+from contextvars import ContextVar
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Callable, List, Optional, TypeVar
+
+from starlette.concurrency import run_in_threadpool
+
+R = TypeVar("R")
+
+PROFILE_ID = re.compile(r"^[\w.-]+$")
+TOP_FUNCTIONS = 60
+
+
+class ProfileSession:
+    def __init__(self, profile_id: str) -> None:
+        self.profile_id = profile_id
+        self._profiles: List[cProfile.Profile] = []
+        self._lock = threading.Lock()
+        self._threads: set = set()
+
+    def run(self, func: Callable[..., R], *args, **kwargs) -> R:
+        thread_id = threading.get_ident()
+        with self._lock:
+            nested = thread_id in self._threads
+            self._threads.add(thread_id)
+        if nested:  # one profiler per thread; the outer call already covers this one
+            return func(*args, **kwargs)
+        profile = cProfile.Profile()
+        profile.enable()
+        try:
+            return func(*args, **kwargs)
+        finally:
+            profile.disable()
+            with self._lock:
+                self._threads.discard(thread_id)
+                self._profiles.append(profile)
+
+    def save(self, directory: Path) -> Optional[Path]:
+        with self._lock:
+            profiles = list(self._profiles)
+        if not profiles:
+            return None
+        directory.mkdir(parents=True, exist_ok=True)
+        stats = pstats.Stats(profiles[0])
+        for profile in profiles[1:]:
+            stats.add(profile)
+        path = directory / f"{self.profile_id}.prof"
+        stats.dump_stats(str(path))
+        text = io.StringIO()
+        pstats.Stats(str(path), stream=text).sort_stats("cumulative").print_stats(TOP_FUNCTIONS)
+        path.with_suffix(".txt").write_text(text.getvalue(), encoding="utf-8")
+        return path
+
+
+_session: ContextVar[Optional[ProfileSession]] = ContextVar("mlweb_profile_session", default=None)
+
+
+def profiled(func: Callable[..., R], *args, **kwargs) -> R:
+    """Call ``func``; under cProfile if the current request is being profiled."""
+
+    session = _session.get()
+    if session is None:
+        return func(*args, **kwargs)
+    return session.run(func, *args, **kwargs)
+
+
+def profiling_active() -> bool:
+    return _session.get() is not None
+
+
+def prune_profiles(directory: Path, keep: int) -> int:
+    """Delete all but the ``keep`` newest profiles; returns how many were removed."""
+
+    if keep <= 0 or not directory.is_dir():
+        return 0
+    paths = sorted(directory.glob("*.prof"), key=lambda path: path.stat().st_mtime, reverse=True)
+    for path in paths[keep:]:
+        path.unlink(missing_ok=True)
+        path.with_suffix(".txt").unlink(missing_ok=True)
+    return len(paths[keep:])
+
+
+def profile_path(directory: Path, profile_id: str, suffix: str = ".prof") -> Optional[Path]:
+    if not PROFILE_ID.match(profile_id):
+        return None
+    path = directory / f"{profile_id}{suffix}"
+    return path if path.is_file() else None
+
+
+class ProfileMiddleware:
+    """Start a :class:`ProfileSession` for requests that ask for one.
+
+    ``settings`` is read per request (``profile_requests``, ``profile_dir``,
+    ``profile_keep``, ``admin_token``), so the mode can be switched in a
+    running test or process.
+    """
+
+    def __init__(self, app, settings) -> None:
+        self.app = app
+        self.settings = settings
+
+    def _requested(self, scope) -> bool:
+        if scope["type"] != "http" or not self.settings.profile_requests:
+            return False
+        headers = dict(scope.get("headers") or [])
+        query = scope.get("query_string", b"").decode("latin-1")
+        asked = headers.get(b"x-profile", b"").decode("latin-1") in ("1", "true") or re.search(
+            r"(^|&)profile=(1|true)(&|$)", query
+        )
+        if not asked:
+            return False
+        token = self.settings.admin_token
+        return not token or headers.get(b"x-admin-token", b"").decode("latin-1") == token
+
+    def _save(self, session: ProfileSession) -> Optional[Path]:
+        directory = Path(self.settings.profile_dir)
+        path = session.save(directory)
+        if path is not None:
+            prune_profiles(directory, self.settings.profile_keep)
+        return path
+
+    async def __call__(self, scope, receive, send) -> None:
+        if not self._requested(scope):
+            await self.app(scope, receive, send)
+            return
+        stamp = datetime.now(timezone.utc).strftime("%Y%m%dT%H%M%S")
+        session = ProfileSession(f"{stamp}-{uuid.uuid4().hex[:8]}")
+        token = _session.set(session)
+
+        async def send_wrapper(message) -> None:
+            # Endpoints finish their work before the response starts, so the
+            # profile is complete here and can be named in a header.  pstats
+            # merging and file writes stay off the event loop.
+            if message["type"] == "http.response.start":
+                path = await run_in_threadpool(self._save, session)
+                if path is not None:
+                    header = (b"x-profile-id", session.profile_id.encode("latin-1"))
+                    message = {**message, "headers": [*message.get("headers", []), header]}
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            _session.reset(token)
@@ -0,0 +1,176 @@
+"""WebSocket session for continuous classification of incoming messages.
+
+Protocol (JSON text frames):
+
+* client → ``{"id": "a1", "text": "..."}`` or ``{"items": [{"id": ..., "text": ...}, ...]}``;
+* server → ``{"id": "a1", "label": "...", "scores": {...}}`` per text, as soon
+  as its batch is scored (not necessarily in send order), or
+  ``{"id": ..., "error": "..."}`` for a rejected text or message.
+"""
+from __future__ import annotations
+
+import asyncio
+from threading import Lock
+from typing import Awaitable, Callable, Dict, List, Optional, Tuple
+
+from starlette.websockets import WebSocket, WebSocketDisconnect
+
+from .serialization import MAX_TEXT_LENGTH, dumps, loads
+
+TEXT_ERROR = f"text должен быть строкой от 1 до {MAX_TEXT_LENGTH} символов"
+
+Submit = Callable[[List[str]], Awaitable[List[Dict[str, object]]]]
+
+
+class StreamStats:
+    """Counters shared by all WebSocket sessions, reported in ``/runtime``."""
+
+    def __init__(self) -> None:
+        self._lock = Lock()
+        self._connections = 0
+        self._active = 0
+        self._received = 0
+        self._sent = 0
+        self._errors = 0
+        self._throttled = 0
+
+    def add(self, **deltas: int) -> None:
+        with self._lock:
+            for name, delta in deltas.items():
+                setattr(self, f"_{name}", getattr(self, f"_{name}") + delta)
+
+    def snapshot(self) -> Dict[str, int]:
+        with self._lock:
+            return {
+                "connections": self._connections,
+                "active": self._active,
+                "received": self._received,
+                "sent": self._sent,
+                "errors": self._errors,
+                "throttled": self._throttled,
+            }
+
+
+class StreamSession:
+    """Serve one WebSocket connection until the client disconnects.
+
+    Every text is handed to ``submit`` (which batches across connections) and
+    its result is sent back with the client's ``id``.  At most ``max_inflight``
+    texts (or error replies) per connection are pending at a time: when the
+    client sends faster than that, the session stops reading the socket until
+    replies go out, so the backlog stays in the client's TCP buffers instead of
+    the server's memory.
+    """
+
+    def __init__(
+        self,
+        websocket: WebSocket,
+        submit: Submit,
+        max_inflight: int = 256,
+        max_group: int = 64,
+        stats: Optional[StreamStats] = None,
+    ) -> None:
+        self.websocket = websocket
+        self.submit = submit
+        self.max_inflight = max(1, max_inflight)
+        self.max_group = max(1, min(max_group, self.max_inflight))
+        self.stats = stats or StreamStats()
+        self._capacity = asyncio.Semaphore(self.max_inflight)
+        self._outbox: "asyncio.Queue[Tuple[bytes, bool, int]]" = asyncio.Queue()
+        self._tasks: set = set()
+        self._sender: Optional[asyncio.Future] = None
+
+    async def run(self) -> None:
+        await self.websocket.accept()
+        self.stats.add(connections=1, active=1)
+        self._sender = sender = asyncio.ensure_future(self._send_loop())
+        try:
+            while True:
+                message = await self.websocket.receive_text()
+                items, error = self._parse(message)
+                # Error replies hold a slot until sent as well, so a client
+                # flooding invalid messages without reading is throttled too.
+                await self._reserve(1 if error is not None else len(items))
+                if error is not None:
+                    self._reply({"id": None, "error": error}, release=1)
+                    continue
+                accepted = []
+                for item_id, text in items:
+                    if isinstance(text, str) and 0 < len(text.strip()) <= MAX_TEXT_LENGTH:
+                        accepted.append((item_id, text.strip()))
+                    else:
+                        self._reply({"id": item_id, "error": TEXT_ERROR}, release=1)
+                if accepted:
+                    task = asyncio.ensure_future(self._score(accepted))
+                    self._tasks.add(task)
+                    task.add_done_callback(self._tasks.discard)
+        except WebSocketDisconnect:
+            pass
+        finally:
+            for task in list(self._tasks):
+                task.cancel()
+            sender.cancel()
+            self.stats.add(active=-1)
+
+    def _parse(self, message: str) -> Tuple[List[Tuple[object, object]], Optional[str]]:
+        try:
+            payload = loads(message)
+        except ValueError:
+            return [], "Сообщение должно быть JSON"
+        if isinstance(payload, dict) and "items" in payload:
+            items = payload["items"]
+            if not isinstance(items, list) or not all(isinstance(item, dict) for item in items):
+                return [], "items должен быть списком объектов {id, text}"
+            if len(items) > self.max_group:
+                return [], f"Не больше {self.max_group} текстов в одном сообщении"
+            self.stats.add(received=len(items))
+            return [(item.get("id"), item.get("text")) for item in items], None
+        if isinstance(payload, dict):
+            self.stats.add(received=1)
+            return [(payload.get("id"), payload.get("text"))], None
+        return [], "Ожидается объект {id, text} или {items: [...]}"
+
+    async def _reserve(self, count: int) -> None:
+        if self._capacity.locked():
+            self.stats.add(throttled=1)
+        for _ in range(count):
+            if not self._capacity.locked():
+                await self._capacity.acquire()
+                continue
+            # Slots come back from the sender; if it died (client gone), stop waiting.
+            acquire = asyncio.ensure_future(self._capacity.acquire())
+            await asyncio.wait({acquire, self._sender}, return_when=asyncio.FIRST_COMPLETED)
+            if not acquire.done():
+                acquire.cancel()
+                raise WebSocketDisconnect()
+
+    async def _score(self, items: List[Tuple[object, str]]) -> None:
+        try:
+            predictions = await self.submit([text for _, text in items])
+        except asyncio.CancelledError:
+            raise
+        except Exception as exc:  # noqa: BLE001 - reported to the client
+            for item_id, _ in items:
+                self._reply({"id": item_id, "error": str(exc)}, release=1)
+        else:
+            for (item_id, _), pred in zip(items, predictions):
+                self._reply({"id": item_id, "label": pred["label"], "scores": pred["scores"]}, release=1)
+
+    def _reply(self, payload: Dict[str, object], release: int = 0) -> None:
+        """Queue ``payload``; ``release`` capacity slots are freed once it is sent."""
+
+        self._outbox.put_nowait((dumps(payload), "error" in payload, release))
+
+    async def _send_loop(self) -> None:
+        # The only writer: Starlette does not allow concurrent sends on one socket.
+        while True:
+            data, is_error, release = await self._outbox.get()
+            try:
+                await self.websocket.send_text(data.decode("utf-8"))
+            except Exception:  # noqa: BLE001 - the receive loop sees the disconnect
+                return
+            self.stats.add(**({"errors": 1} if is_error else {"sent": 1}))
+            # Slots are freed only after sending, so a client that stops reading
+            # results is throttled too.
+            for _ in range(release):
+                self._capacity.release()
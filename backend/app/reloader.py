@@ -0,0 +1,138 @@
+"""Background model reloads: build and warm up off the request path, then swap."""
+from __future__ import annotations
+
+import logging
+import threading
+import time
+from datetime import datetime, timezone
+from typing import Callable, Dict, Generic, Optional, TypeVar
+
+logger = logging.getLogger(__name__)
+
+ModelT = TypeVar("ModelT")
+
+
+class ModelReloader(Generic[ModelT]):
+    """Rebuild the model in a background thread and hand it to ``swap``.
+
+    ``build`` must return a fully warmed-up model; requests keep being served by
+    the current instance until ``swap`` replaces the reference, and requests
+    already holding the old instance finish on it.  With a positive
+    ``poll_interval`` the artifact ``signature`` is polled and a reload starts
+    once it has changed and stayed the same for two consecutive polls, so a
+    half-copied artifact is not picked up.
+    """
+
+    def __init__(
+        self,
+        build: Callable[[], ModelT],
+        swap: Callable[[ModelT], None],
+        signature: Optional[Callable[[], str]] = None,
+        poll_interval: float = 0.0,
+    ) -> None:
+        self.build = build
+        self.swap = swap
+        self.signature = signature
+        self.poll_interval = poll_interval
+        self._lock = threading.Lock()
+        self._thread: Optional[threading.Thread] = None
+        self._stop = threading.Event()
+        self._watcher: Optional[threading.Thread] = None
+        self._reloads = 0
+        self._failures = 0
+        self._last_error: Optional[str] = None
+        self._last_reload_at: Optional[str] = None
+        self._last_duration_ms: Optional[float] = None
+        self._rejected: Optional[str] = None
+        self._signature = signature() if signature is not None else None
+
+    @property
+    def in_progress(self) -> bool:
+        with self._lock:
+            return self._thread is not None and self._thread.is_alive()
+
+    def reload(self) -> bool:
+        """Start a background reload; returns ``False`` if one is already running."""
+
+        with self._lock:
+            if self._thread is not None and self._thread.is_alive():
+                return False
+            self._thread = threading.Thread(target=self._run, name="model-reloader", daemon=True)
+            self._thread.start()
+        return True
+
+    def wait(self, timeout: Optional[float] = None) -> None:
+        with self._lock:
+            thread = self._thread
+        if thread is not None:
+            thread.join(timeout)
+
+    def _run(self) -> None:
+        started = time.perf_counter()
+        signature = self.signature() if self.signature is not None else None
+        try:
+            model = self.build()
+            self.swap(model)
+        except Exception as exc:  # keep serving the current model
+            logger.exception("Model reload failed, keeping the current model")
+            with self._lock:
+                self._failures += 1
+                self._last_error = str(exc)
+                # Do not let the watcher retry the same broken artifact forever.
+                self._rejected = signature
+            return
+        duration_ms = (time.perf_counter() - started) * 1000
+        logger.info("Model reloaded in %.1f ms", duration_ms)
+        with self._lock:
+            self._reloads += 1
+            self._last_error = None
+            self._last_duration_ms = round(duration_ms, 3)
+            self._last_reload_at = datetime.now(timezone.utc).isoformat()
+            if signature is not None:
+                self._signature = signature
+
+    def start_watching(self) -> None:
+        if self.signature is None or self.poll_interval <= 0 or self._watcher is not None:
+            return
+        self._watcher = threading.Thread(target=self._watch, name="model-watcher", daemon=True)
+        self._watcher.start()
+
+    def _watch(self) -> None:
+        assert self.signature is not None
+        pending: Optional[str] = None
+        while not self._stop.wait(self.poll_interval):
+            try:
+                current = self.signature()
+            except OSError:  # artifact is being replaced right now
+                pending = None
+                continue
+            with self._lock:
+                known = (self._signature, self._rejected)
+            if current in known:
+                pending = None
+            elif current == pending:
+                logger.info("Model artifact changed on disk, reloading")
+                self.reload()
+                pending = None
+            else:
+                pending = current
+
+    def close(self) -> None:
+        self._stop.set()
+        if self._watcher is not None:
+            self._watcher.join()
+            self._watcher = None
+        self.wait()
+
+    def status(self) -> Dict[str, object]:
+        with self._lock:
+            return {
+                "in_progress": self._thread is not None and self._thread.is_alive(),
+                "watching": self._watcher is not None,
+                "poll_interval": self.poll_interval,
+                "reloads": self._reloads,
+                "failures": self._failures,
+                "last_error": self._last_error,
+                "last_reload_at": self._last_reload_at,
+                "last_duration_ms": self._last_duration_ms,
+            }
@@ -75,6 +75,9 @@ class ModelInfoResponse(BaseModel):
     metrics: Optional[Dict[str, Any]] = None
     test_size: Optional[float] = None
     random_state: Optional[int] = None
+    load_time_ms: Optional[float] = Field(None, description="Время загрузки артефакта")
+    warmup_ms: Optional[float] = Field(None, description="Длительность прогрева модели")
+    loaded_at: Optional[str] = Field(None, description="Момент загрузки модели (UTC)")
 
 
 class FilePrediction(BaseModel):
@@ -88,6 +91,7 @@ class FilePredictionSummary(BaseModel):
     input_rows: int = Field(..., description="Количество строк в CSV")
     processed_rows: int = Field(..., description="Сколько строк обработано")
     skipped_rows: int = Field(..., description="Сколько строк пропущено")
+    unique_texts: int = Field(..., description="Сколько различных текстов среди обработанных строк")
     class_counts: Dict[str, int] = Field(
         ..., description="Количество предсказаний по классам"
     )
@@ -98,6 +102,31 @@ class FilePredictResponse(BaseModel):
     predictions: List[FilePrediction]
 
 
+class JobResponse(BaseModel):
+    id: str
+    filename: str
+    format: str = Field(..., description="Формат файла результатов: ndjson или csv")
+    status: str = Field(..., description="queued, running, completed или failed")
+    created_at: str
+    started_at: Optional[str] = None
+    finished_at: Optional[str] = None
+    rows_total: Optional[int] = Field(None, description="Строк во входном файле")
+    rows_done: int = Field(..., description="Строк в завершённых частях")
+    processed_rows: int
+    skipped_rows: int = Field(..., description="Строки без текста")
+    chunks_done: int
+    results_bytes: int
+    elapsed_seconds: float = Field(..., description="Время классификации без ожидания в очереди")
+    rows_per_sec: Optional[float] = None
+    eta_seconds: Optional[float] = Field(None, description="Оценка оставшегося времени")
+    class_counts: Dict[str, int]
+    error: Optional[str] = None
+
+
+class JobListResponse(BaseModel):
+    jobs: List[JobResponse]
+
+
 class ConfusionMatrixPayload(BaseModel):
     labels: List[str]
     matrix: List[List[int]]
@@ -123,3 +152,119 @@ class HistorySummaryResponse(BaseModel):
     last_timestamp: Optional[str]
     average_text_length: float
     generated_at: Optional[str] = None
+
+
+class BatchingStats(BaseModel):
+    queue_depth: int = Field(..., description="Запросов в очереди на классификацию")
+    max_batch_size: int
+    max_wait_ms: float
+    batches: int = Field(..., description="Сколько пакетов отправлено в модель")
+    items: int = Field(..., description="Сколько текстов обработано через очередь")
+    average_batch_size: float
+    average_wait_ms: float
+    batch_size_histogram: Dict[str, int] = Field(
+        ..., description="Количество пакетов по размеру"
+    )
+
+
+class CacheStats(BaseModel):
+    size: int = Field(..., description="Сколько результатов сейчас в кэше")
+    max_size: int
+    ttl_seconds: Optional[float] = None
+    hits: int
+    misses: int
+    hit_rate: float
+    evictions: int
+    expirations: int
+    invalidations: int = Field(..., description="Сколько раз кэш сброшен из-за смены модели")
+    fingerprint: str = Field(..., description="Отпечаток модели, для которой собран кэш")
+
+
+class WorkerPoolStats(BaseModel):
+    workers: int = Field(..., description="Количество процессов инференса")
+    threads_per_worker: int
+    start_method: str
+    max_inflight: int
+    inflight: int = Field(..., description="Сколько частей пакета сейчас в работе")
+    shard_size: int
+    shards: int
+    restarts: int = Field(..., description="Сколько раз пул перезапускался после падения воркера")
+    retries: int
+    fallbacks: int = Field(..., description="Части, досчитанные в основном процессе")
+    timeouts: int = Field(..., description="Части, не дождавшиеся ответа воркера за APP_INFERENCE_RESULT_TIMEOUT")
+
+
+class ExecutorStats(BaseModel):
+    name: str
+    max_workers: int = Field(..., description="Потоков для блокирующей работы async-обработчиков")
+    queue_depth: int = Field(..., description="Задач, ожидающих свободный поток")
+    active: int
+    completed: int
+    failed: int
+    average_wait_ms: float = Field(..., description="Среднее ожидание в очереди")
+    max_wait_ms: float
+    average_run_ms: float
+
+
+class WebSocketStats(BaseModel):
+    connections: int = Field(..., description="Всего подключений к /ws/predict")
+    active: int = Field(..., description="Открытые подключения")
+    received: int = Field(..., description="Принятые тексты")
+    sent: int = Field(..., description="Отправленные результаты")
+    errors: int
+    throttled: int = Field(..., description="Сколько раз чтение из сокета приостанавливалось из-за лимита")
+
+
+class StatsWriterStats(BaseModel):
+    mode: str = Field(..., description="async — запись в фоне, fsync — в фоне с fsync каждой группы")
+    pending: int = Field(..., description="Записей истории, ожидающих записи на диск")
+    written: int
+    flushes: int = Field(..., description="Сколько раз буфер сбрасывался в файл")
+    average_group_size: float
+    average_flush_ms: float
+    producer_waits: int = Field(..., description="Сколько раз запросы ждали из-за переполненного буфера")
+    errors: int
+
+
+class ReloadStats(BaseModel):
+    in_progress: bool = Field(..., description="Идёт ли сейчас перезагрузка модели")
+    watching: bool = Field(..., description="Включено ли отслеживание артефактов на диске")
+    poll_interval: float
+    reloads: int = Field(..., description="Успешные перезагрузки")
+    failures: int = Field(..., description="Неудачные перезагрузки")
+    last_error: Optional[str] = None
+    last_reload_at: Optional[str] = None
+    last_duration_ms: Optional[float] = Field(None, description="Загрузка, прогрев и замена")
+
+
+class StartupStats(BaseModel):
+    imports: Dict[str, float] = Field(
+        default_factory=dict, description="Время ленивого импорта тяжёлых зависимостей, мс"
+    )
+    stages: Dict[str, float] = Field(
+        default_factory=dict, description="Этапы холодного старта: загрузка модели, первый инференс, мс"
+    )
+
+
+class CascadeStats(BaseModel):
+    threshold: float = Field(..., description="Порог уверенности дешёвой модели")
+    primary: str = Field(..., description="Первая (дешёвая) ступень каскада")
+    fallback: str = Field(..., description="Вторая (точная) ступень каскада")
+    calls: int
+    rows: int = Field(..., description="Сколько текстов прошло через каскад")
+    escalated: int = Field(..., description="Сколько текстов передано второй ступени")
+    escalation_rate: float
+    primary_ms_per_row: float = Field(..., description="Средняя задержка первой ступени на текст")
+    fallback_ms_per_row: float = Field(..., description="Средняя задержка второй ступени на переданный текст")
+
+
+class RuntimeResponse(BaseModel):
+    batching: Optional[BatchingStats] = None
+    cache: Optional[CacheStats] = None
+    workers: Optional[WorkerPoolStats] = None
+    executor: Optional[ExecutorStats] = None
+    websocket: Optional[WebSocketStats] = None
+    stats_writer: Optional[StatsWriterStats] = None
+    reload: Optional[ReloadStats] = None
+    cascade: Optional[CascadeStats] = None
+    startup: Optional[StartupStats] = None
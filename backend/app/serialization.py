@@ -0,0 +1,205 @@
+"""Fast request parsing and response encoding for the batch endpoints.
+
+Per-item pydantic models cost more than the inference itself on large batches:
+``BatchPredictRequest`` validates every ``constr`` element and
+``BatchPredictResponse`` builds one ``PredictResponse`` per text before FastAPI
+re-validates and JSON-encodes it.  Here the body is parsed with ``orjson``,
+text lengths are checked in one pass and responses are written as ready bytes.
+
+Clients choose the response format with ``Accept``:
+
+* ``application/json`` (default) — the usual ``{"predictions": [...]}``;
+* ``application/vnd.mlweb.compact+json`` — ``labels``, ``label_ids`` and a
+  float32 ``scores`` matrix in ``labels`` column order;
+* ``application/msgpack`` — the compact payload in MessagePack, with
+  ``scores`` as raw little-endian float32 bytes and its ``shape``.
+"""
+from __future__ import annotations
+
+import json
+from typing import Dict, List, Optional, Sequence
+
+try:  # pragma: no cover - optional dependency
+    import numpy as np
+except ImportError:  # pragma: no cover
+    np = None
+
+try:  # pragma: no cover - optional dependency
+    import orjson
+except ImportError:  # pragma: no cover
+    orjson = None
+
+try:  # pragma: no cover - optional dependency
+    import msgpack
+except ImportError:  # pragma: no cover
+    msgpack = None
+
+JSON = "application/json"
+COMPACT_JSON = "application/vnd.mlweb.compact+json"
+MSGPACK = "application/msgpack"
+MEDIA_ALIASES = {"application/x-msgpack": MSGPACK}
+MAX_TEXT_LENGTH = 2000
+
+Prediction = Dict[str, object]
+
+
+class NotAcceptable(ValueError):
+    """The client accepts none of the formats this server can produce."""
+
+
+class RequestValidationFailed(ValueError):
+    """Body errors in the FastAPI ``detail`` shape (``loc``/``msg``/``type``)."""
+
+    def __init__(self, errors: List[Dict[str, object]]) -> None:
+        super().__init__(errors[0]["msg"] if errors else "invalid request")
+        self.errors = errors
+
+
+def available_formats() -> List[str]:
+    formats = [JSON, COMPACT_JSON]
+    if msgpack is not None:
+        formats.append(MSGPACK)
+    return formats
+
+
+def negotiate(accept: Optional[str]) -> str:
+    """Pick the response media type from an ``Accept`` header (JSON by default)."""
+
+    if not accept:
+        return JSON
+    offered = available_formats()
+    ranges = []
+    for position, part in enumerate(accept.split(",")):
+        media, _, params = part.strip().partition(";")
+        quality = 1.0
+        for param in params.split(";"):
+            name, _, value = param.strip().partition("=")
+            if name == "q":
+                try:
+                    quality = float(value)
+                except ValueError:
+                    quality = 0.0
+        media = media.strip().lower()
+        ranges.append((-quality, position, MEDIA_ALIASES.get(media, media)))
+    for negative_quality, _, media in sorted(ranges):
+        if negative_quality >= 0:
+            break
+        if media in offered:
+            return media
+        if media in ("*/*", "application/*"):
+            return JSON
+    raise NotAcceptable(f"Поддерживаемые форматы ответа: {', '.join(offered)}")
+
+
+def loads(body: bytes) -> object:
+    if orjson is not None:
+        return orjson.loads(body)
+    return json.loads(body)
+
+
+def parse_texts(body: bytes, max_length: int = MAX_TEXT_LENGTH) -> List[str]:
+    """``BatchPredictRequest.texts`` with the same rules, checked in one pass.
+
+    Texts are stripped and must be 1..``max_length`` characters long.
+    """
+
+    try:
+        payload = loads(body)
+    except ValueError as exc:
+        raise RequestValidationFailed(
+            [{"loc": ["body"], "msg": f"JSON decode error: {exc}", "type": "value_error.jsondecode"}]
+        ) from exc
+    texts = payload.get("texts") if isinstance(payload, dict) else None
+    if not isinstance(texts, list):
+        raise RequestValidationFailed(
+            [{"loc": ["body", "texts"], "msg": "field required (list of strings)", "type": "value_error.missing"}]
+        )
+    if not all(type(text) is str for text in texts):
+        raise RequestValidationFailed(
+            [
+                {"loc": ["body", "texts", idx], "msg": "str type expected", "type": "type_error.str"}
+                for idx, text in enumerate(texts)
+                if not isinstance(text, str)
+            ]
+        )
+    texts = [text.strip() for text in texts]
+    lengths = list(map(len, texts))
+    if lengths and (min(lengths) < 1 or max(lengths) > max_length):
+        raise RequestValidationFailed(
+            [
+                {
+                    "loc": ["body", "texts", idx],
+                    "msg": "ensure this value has at least 1 characters"
+                    if length < 1
+                    else f"ensure this value has at most {max_length} characters",
+                    "type": "value_error.any_str.min_length" if length < 1 else "value_error.any_str.max_length",
+                }
+                for idx, length in enumerate(lengths)
+                if length < 1 or length > max_length
+            ]
+        )
+    return texts
+
+
+def dumps(payload: object) -> bytes:
+    if orjson is not None:
+        return orjson.dumps(payload, option=orjson.OPT_SERIALIZE_NUMPY)
+    return json.dumps(payload, ensure_ascii=False, default=_to_builtin).encode("utf-8")
+
+
+def _to_builtin(value: object) -> object:
+    if hasattr(value, "tolist"):
+        return value.tolist()
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+
+def compact_payload(label_ids: Sequence[int], scores: object, labels: Sequence[str]) -> Dict[str, object]:
+    """Label indices plus an ``(n, k)`` float32 score matrix in ``labels`` order."""
+
+    if np is not None:
+        scores = np.asarray(scores, dtype=np.float32).reshape(len(label_ids), len(labels))
+    return {"labels": list(labels), "label_ids": list(label_ids), "scores": scores}
+
+
+def encode_scores(
+    label_ids: Sequence[int],
+    scores: object,
+    labels: Sequence[str],
+    media_type: str = COMPACT_JSON,
+    extra: Optional[Dict[str, object]] = None,
+) -> bytes:
+    """Compact body straight from :meth:`SentimentModel.score_texts` output.
+
+    ``scores`` is the ``(n, k)`` matrix (NumPy array or list of rows) in
+    ``labels`` column order; no per-row dicts are built on this path.
+    """
+
+    payload = {**(extra or {}), **compact_payload(label_ids, scores, labels)}
+    if media_type == COMPACT_JSON:
+        return dumps(payload)
+    if media_type == MSGPACK and msgpack is not None:
+        payload["shape"] = [len(label_ids), len(labels)]
+        if np is not None:
+            payload["scores"] = payload["scores"].astype("<f4").tobytes()
+        return msgpack.packb(payload, use_bin_type=True)
+    raise NotAcceptable(f"Формат {media_type} недоступен")
+
+
+def encode_predictions(
+    predictions: Sequence[Prediction],
+    labels: Sequence[str],
+    media_type: str = JSON,
+    extra: Optional[Dict[str, object]] = None,
+) -> bytes:
+    """Response body for ``predictions`` in ``media_type``; ``extra`` keys are merged in.
+
+    Meant for the default JSON format; the endpoints encode compact formats
+    with :func:`encode_scores` from the score matrix instead.
+    """
+
+    if media_type == JSON:
+        return dumps({**(extra or {}), "predictions": list(predictions)})
+    index = {label: idx for idx, label in enumerate(labels)}
+    label_ids = [index[pred["label"]] for pred in predictions]
+    rows = [[pred["scores"][label] for label in labels] for pred in predictions]  # type: ignore[index]
+    return encode_scores(label_ids, rows, labels, media_type, extra)
@@ -0,0 +1,62 @@
+"""Cold-start instrumentation: lazy imports of heavy dependencies and stage timings."""
+from __future__ import annotations
+
+import importlib
+import sys
+import time
+from contextlib import contextmanager
+from threading import Lock
+from types import ModuleType
+from typing import Dict, Iterator, Optional
+
+
+class StartupReport:
+    """Collects how long heavy imports and startup stages took, in milliseconds."""
+
+    def __init__(self) -> None:
+        self._lock = Lock()
+        self.imports: Dict[str, float] = {}
+        self.stages: Dict[str, float] = {}
+
+    def record_import(self, name: str, elapsed_ms: float) -> None:
+        with self._lock:
+            self.imports.setdefault(name, round(elapsed_ms, 3))
+
+    def record(self, stage: str, elapsed_ms: float) -> None:
+        with self._lock:
+            self.stages[stage] = round(elapsed_ms, 3)
+
+    @contextmanager
+    def stage(self, name: str) -> Iterator[None]:
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.record(name, (time.perf_counter() - started) * 1000)
+
+    def snapshot(self) -> Dict[str, Dict[str, float]]:
+        with self._lock:
+            return {"imports": dict(self.imports), "stages": dict(self.stages)}
+
+
+startup_report = StartupReport()
+
+
+def optional_import(name: str) -> Optional[ModuleType]:
+    """Import ``name`` on first use and record the cost; ``None`` if it is missing.
+
+    Heavy backends (torch, transformers, onnxruntime) are only imported when the
+    matching adapter is built, so the joblib baseline and the keyword fallback
+    start without paying for them.
+    """
+
+    module = sys.modules.get(name)
+    if module is not None:
+        return module
+    started = time.perf_counter()
+    try:
+        module = importlib.import_module(name)
+    except ImportError:
+        return None
+    startup_report.record_import(name, (time.perf_counter() - started) * 1000)
+    return module
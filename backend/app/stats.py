@@ -2,12 +2,16 @@
 from __future__ import annotations
 
 import json
+import os
+import time
 from collections import Counter, deque
-from dataclasses import asdict, dataclass
+from dataclasses import dataclass
 from datetime import datetime, timezone
 from pathlib import Path
-from threading import Lock
-from typing import Deque, Dict, Optional
+from threading import Condition, Lock, Thread
+from typing import Deque, Dict, Iterable, List, Optional, Tuple
+
+from .metrics import stage
 
 
 @dataclass
@@ -18,13 +22,184 @@ class PredictionRecord:
     timestamp: str
 
     def to_dict(self) -> Dict[str, object]:
-        return asdict(self)
+        # Spelled out: dataclasses.asdict deep-copies and dominated the cost of writing history.
+        return {"text": self.text, "label": self.label, "scores": dict(self.scores), "timestamp": self.timestamp}
+
+
+DURABILITY_MODES = ("sync", "async", "fsync")
+
+
+class HistoryWriter:
+    """Background group commit of history records to a JSONL file.
+
+    Callers only append to an in-memory buffer; a writer thread serializes
+    the buffered records and appends them with one ``open``/``write`` when
+    ``flush_size`` records are waiting or ``flush_interval`` seconds after the
+    first one arrived.  The buffer is bounded by ``max_pending`` records: when
+    the disk cannot keep up, callers wait instead of growing memory without
+    limit.  ``fsync=True`` also syncs every group to disk.  The thread starts
+    on first use and again after :meth:`close`, which writes what is left.
+    """
+
+    def __init__(
+        self,
+        path: Path,
+        flush_size: int = 512,
+        flush_interval: float = 0.5,
+        max_pending: int = 100_000,
+        fsync: bool = False,
+    ) -> None:
+        if flush_size < 1 or max_pending < flush_size:
+            raise ValueError("need 1 <= flush_size <= max_pending")
+        self.path = path
+        self.flush_size = flush_size
+        self.flush_interval = max(0.0, flush_interval)
+        self.max_pending = max_pending
+        self.fsync = fsync
+        self._pending: List[PredictionRecord] = []
+        self._first_pending_at = 0.0
+        self._cond = Condition()
+        self._thread: Optional[Thread] = None
+        self._closing = False
+        self._urgent = 0  # flush() callers and producers blocked on a full buffer
+        self._enqueued = 0
+        self._written = 0
+        self._flushes = 0
+        self._waits = 0
+        self._errors = 0
+        self._write_seconds = 0.0
+
+    def submit(self, records: List[PredictionRecord]) -> None:
+        with self._cond:
+            if self._thread is None:
+                self._start()
+            if len(self._pending) + len(records) > self.max_pending and self._pending:
+                self._waits += 1
+                self._urgent += 1
+                self._cond.notify_all()
+                while len(self._pending) + len(records) > self.max_pending and self._pending:
+                    self._cond.wait()
+                self._urgent -= 1
+            first = not self._pending
+            if first:
+                self._first_pending_at = time.monotonic()
+            self._pending.extend(records)
+            self._enqueued += len(records)
+            if first or len(self._pending) >= self.flush_size:
+                self._cond.notify_all()
+
+    def flush(self, timeout: float | None = 10.0) -> bool:
+        """Wait until everything submitted so far is written; ``False`` on timeout."""
+
+        deadline = None if timeout is None else time.monotonic() + timeout
+        with self._cond:
+            target = self._enqueued
+            self._urgent += 1
+            self._cond.notify_all()
+            try:
+                while self._written < target and self._thread is not None:
+                    remaining = None if deadline is None else deadline - time.monotonic()
+                    if remaining is not None and remaining <= 0:
+                        return False
+                    self._cond.wait(remaining)
+                return True
+            finally:
+                self._urgent -= 1
+
+    def close(self, timeout: float | None = 10.0) -> None:
+        with self._cond:
+            thread = self._thread
+            self._closing = True
+            self._cond.notify_all()
+        if thread is not None:
+            thread.join(timeout)
+
+    def snapshot(self) -> Dict[str, object]:
+        with self._cond:
+            return {
+                "mode": "fsync" if self.fsync else "async",
+                "pending": len(self._pending),
+                "written": self._written,
+                "flushes": self._flushes,
+                "average_group_size": self._written / self._flushes if self._flushes else 0.0,
+                "average_flush_ms": self._write_seconds / self._flushes * 1000.0 if self._flushes else 0.0,
+                "producer_waits": self._waits,
+                "errors": self._errors,
+            }
+
+    def _start(self) -> None:
+        self._closing = False
+        self._thread = Thread(target=self._run, name="stats-history-writer", daemon=True)
+        self._thread.start()
+
+    def _run(self) -> None:
+        while True:
+            with self._cond:
+                while not self._due():
+                    if self._closing and not self._pending:
+                        self._thread = None
+                        self._cond.notify_all()
+                        return
+                    wait = None
+                    if self._pending:
+                        wait = max(0.0, self._first_pending_at + self.flush_interval - time.monotonic())
+                    self._cond.wait(wait)
+                group, self._pending = self._pending, []
+                self._cond.notify_all()  # producers blocked on a full buffer
+            self._write(group)
+
+    def _due(self) -> bool:
+        # Called with the condition held.
+        if not self._pending:
+            return False
+        return (
+            len(self._pending) >= self.flush_size
+            or time.monotonic() - self._first_pending_at >= self.flush_interval
+            or self._closing
+            or self._urgent > 0
+        )
+
+    def _write(self, group: List[PredictionRecord]) -> None:
+        started = time.perf_counter()
+        failed = False
+        with stage("persist"):
+            payload = "".join(json.dumps(record.to_dict(), ensure_ascii=False) + "\n" for record in group)
+            try:
+                with self.path.open("a", encoding="utf-8") as fh:
+                    fh.write(payload)
+                    if self.fsync:
+                        fh.flush()
+                        os.fsync(fh.fileno())
+            except OSError:
+                failed = True
+        with self._cond:
+            self._written += len(group)
+            self._flushes += 1
+            self._errors += failed
+            self._write_seconds += time.perf_counter() - started
+            self._cond.notify_all()
 
 
 class StatsTracker:
-    """Thread-safe tracker that stores aggregate stats and optional JSONL history."""
+    """Thread-safe tracker that stores aggregate stats and optional JSONL history.
 
-    def __init__(self, max_history: int = 50, history_path: Optional[Path] = None) -> None:
+    ``durability`` decides how the history file is written: ``sync`` appends
+    on the caller's thread before ``record``/``record_many`` return, ``async``
+    hands records to a :class:`HistoryWriter` (a crash loses at most the
+    unflushed window), ``fsync`` does the same and syncs every group to disk.
+    """
+
+    def __init__(
+        self,
+        max_history: int = 50,
+        history_path: Optional[Path] = None,
+        durability: str = "sync",
+        flush_size: int = 512,
+        flush_interval: float = 0.5,
+        max_pending: int = 100_000,
+    ) -> None:
+        if durability not in DURABILITY_MODES:
+            raise ValueError(f"durability must be one of {DURABILITY_MODES}, got {durability!r}")
         self.max_history = max_history
         self._history: Deque[PredictionRecord] = deque(maxlen=max_history)
         self._counts: Counter[str] = Counter()
@@ -33,24 +208,56 @@ class StatsTracker:
         self._file_lock = Lock()
         self._default_labels = ["negative", "neutral", "positive"]
         self.history_path = Path(history_path) if history_path else None
+        self.durability = durability
+        self._writer: Optional[HistoryWriter] = None
         if self.history_path:
             self.history_path.parent.mkdir(parents=True, exist_ok=True)
             self._load_history_from_disk()
+            if durability != "sync":
+                self._writer = HistoryWriter(
+                    self.history_path,
+                    flush_size=flush_size,
+                    flush_interval=flush_interval,
+                    max_pending=max_pending,
+                    fsync=durability == "fsync",
+                )
 
     def record(self, text: str, label: str, scores: Dict[str, float]) -> PredictionRecord:
+        return self.record_many([(text, label, scores)])[0]
+
+    def record_many(self, items: Iterable[Tuple[str, str, Dict[str, float]]]) -> List[PredictionRecord]:
+        """Record ``(text, label, scores)`` triples with one lock and one history write."""
+
         timestamp = datetime.now(timezone.utc).isoformat()
-        record = PredictionRecord(
-            text=_truncate_text(text),
-            label=label,
-            scores=scores,
-            timestamp=timestamp,
-        )
+        records = [
+            PredictionRecord(text=_truncate_text(text), label=label, scores=scores, timestamp=timestamp)
+            for text, label, scores in items
+        ]
+        if not records:
+            return records
         with self._lock:
-            self._history.appendleft(record)
-            self._counts[label] += 1
-            self._total += 1
-        self._append_record(record)
-        return record
+            self._history.extendleft(records)
+            self._counts.update(record.label for record in records)
+            self._total += len(records)
+        if self._writer is not None:
+            self._writer.submit(records)
+        else:
+            self._append_records(records)
+        return records
+
+    def flush(self, timeout: float | None = 10.0) -> bool:
+        """Block until recorded history is on disk (no-op in ``sync`` mode)."""
+
+        return self._writer.flush(timeout) if self._writer is not None else True
+
+    def close(self) -> None:
+        """Write buffered history and stop the writer; later records restart it."""
+
+        if self._writer is not None:
+            self._writer.close()
+
+    def writer_snapshot(self) -> Dict[str, object] | None:
+        return self._writer.snapshot() if self._writer is not None else None
 
     def snapshot(self) -> Dict[str, object]:
         with self._lock:
@@ -73,14 +280,14 @@ class StatsTracker:
             self._counts.clear()
             self._total = 0
 
-    def _append_record(self, record: PredictionRecord) -> None:
+    def _append_records(self, records: List[PredictionRecord]) -> None:
         if not self.history_path:
             return
-        payload = json.dumps(record.to_dict(), ensure_ascii=False)
-        with self._file_lock:
+        payload = "".join(json.dumps(record.to_dict(), ensure_ascii=False) + "\n" for record in records)
+        with stage("persist"), self._file_lock:
             try:
                 with self.history_path.open("a", encoding="utf-8") as fh:
-                    fh.write(payload + "\n")
+                    fh.write(payload)
             except OSError:
                 pass
 
@@ -0,0 +1,151 @@
+"""Chunked CSV classification for the streaming ``/predict_file`` mode."""
+from __future__ import annotations
+
+import csv
+import io
+import json
+from collections import Counter
+from typing import Callable, Dict, Iterable, Iterator, List, Set
+
+from .cache import normalize_text
+
+Record = Dict[str, object]
+Classifier = Callable[[List[str]], List[Dict[str, object]]]
+
+MEDIA_TYPES = {"ndjson": "application/x-ndjson", "csv": "text/csv; charset=utf-8"}
+# Output is flushed in pieces of about this size instead of once per row, so
+# a large file is not sent as hundreds of thousands of tiny writes.
+FLUSH_BYTES = 64 * 1024
+# ``label`` of the trailing summary row in CSV output.
+SUMMARY_LABEL = "summary"
+
+
+def iter_predictions(
+    chunks: Iterable["object"],
+    classify: Classifier,
+    on_prediction: Callable[[str, Dict[str, object]], None] | None = None,
+) -> Iterator[Record]:
+    """Yield one record per classified row, then ``{"summary": ...}``.
+
+    ``chunks`` are DataFrames with a ``text`` column (``pd.read_csv(...,
+    chunksize=N)``); only one chunk is held in memory at a time.  A parsing
+    error in a later chunk cannot change the HTTP status any more, so it ends
+    the stream with an ``error`` field in the summary.  Errors raised by
+    ``classify`` are not parsing errors and propagate to the caller.
+    """
+
+    input_rows = 0
+    processed_rows = 0
+    class_counts: Counter = Counter()
+    seen: Set[int] = set()
+    error = None
+    reader = iter(chunks)
+    while True:
+        # Only reading the next chunk counts as a parse error; model errors propagate.
+        try:
+            chunk = next(reader)
+        except StopIteration:
+            break
+        except (ValueError, UnicodeDecodeError) as exc:
+            error = f"Не удалось распарсить CSV: {exc}"
+            break
+        input_rows += len(chunk)
+        records = classify_chunk(chunk, classify, on_prediction)
+        seen |= text_keys(record["text"] for record in records)
+        for record in records:
+            class_counts[record["label"]] += 1
+            processed_rows += 1
+            yield record
+    trailer = summary_record(input_rows, processed_rows, class_counts, len(seen))
+    if error is not None:
+        trailer["summary"]["error"] = error
+    yield trailer
+
+
+def classify_chunk(
+    chunk: "object",
+    classify: Classifier,
+    on_prediction: Callable[[str, Dict[str, object]], None] | None = None,
+) -> List[Record]:
+    """Records for the non-empty ``text`` rows of one DataFrame chunk."""
+
+    chunk = chunk.dropna(subset=["text"])
+    if chunk.empty:
+        return []
+    texts = chunk["text"].astype(str).tolist()
+    records = []
+    for idx, text, pred in zip(chunk.index.tolist(), texts, classify(texts)):
+        if on_prediction is not None:
+            on_prediction(text, pred)
+        records.append({"row": int(idx), "text": text, "label": pred["label"], "scores": pred["scores"]})
+    return records
+
+
+def text_keys(texts: Iterable[str]) -> Set[int]:
+    """Hashes of the normalized texts, for counting ``unique_texts``.
+
+    A stream keeps one int per distinct text rather than the texts themselves;
+    that set is the only state that grows with the size of the file.
+    """
+
+    return {hash(normalize_text(text)) for text in texts}
+
+
+def summary_record(
+    input_rows: int, processed_rows: int, class_counts: Dict[str, int], unique_texts: int
+) -> Record:
+    return {
+        "summary": {
+            "input_rows": input_rows,
+            "processed_rows": processed_rows,
+            "skipped_rows": input_rows - processed_rows,
+            "unique_texts": unique_texts,
+            "class_counts": dict(class_counts),
+        }
+    }
+
+
+def ndjson_lines(records: Iterable[Record]) -> Iterator[bytes]:
+    buffer = io.StringIO()
+    for record in records:
+        buffer.write(json.dumps(record, ensure_ascii=False))
+        buffer.write("\n")
+        if buffer.tell() >= FLUSH_BYTES or "summary" in record:
+            yield _drain(buffer)
+    if buffer.tell():
+        yield _drain(buffer)
+
+
+def csv_lines(records: Iterable[Record], labels: List[str], header: bool = True) -> Iterator[bytes]:
+    """CSV rows with one ``score_<label>`` column per class.
+
+    The summary trailer is a last row with an empty ``row``, ``label`` set to
+    ``summary`` and the summary JSON (including any parsing ``error``) in the
+    ``text`` column.  It has the same columns as the predictions, so plain CSV
+    readers load the file as is and an interrupted file is told apart from a
+    complete one by the missing trailer.
+    """
+
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    if header:
+        writer.writerow(["row", "text", "label", *(f"score_{label}" for label in labels)])
+    for record in records:
+        if "summary" in record:
+            summary = json.dumps(record["summary"], ensure_ascii=False)
+            writer.writerow(["", summary, SUMMARY_LABEL, *("" for _ in labels)])
+            yield _drain(buffer)
+            continue
+        scores = record["scores"]
+        writer.writerow([record["row"], record["text"], record["label"], *(scores[label] for label in labels)])
+        if buffer.tell() >= FLUSH_BYTES:
+            yield _drain(buffer)
+    if buffer.tell():
+        yield _drain(buffer)
+
+
+def _drain(buffer: io.StringIO) -> bytes:
+    data = buffer.getvalue().encode("utf-8")
+    buffer.seek(0)
+    buffer.truncate()
+    return data
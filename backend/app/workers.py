@@ -0,0 +1,248 @@
+"""Process pool that shards large inference batches across CPU cores."""
+from __future__ import annotations
+
+import logging
+import multiprocessing
+import os
+import sys
+from concurrent.futures import CancelledError, Future, ProcessPoolExecutor
+from concurrent.futures import TimeoutError as FutureTimeoutError
+from concurrent.futures.process import BrokenProcessPool
+from threading import BoundedSemaphore, Lock
+from typing import Dict, List, Optional, Tuple
+
+from .model import SentimentModel
+
+try:  # pragma: no cover - optional dependency
+    import numpy as np
+except ImportError:  # pragma: no cover
+    np = None
+
+logger = logging.getLogger(__name__)
+
+_worker_model: Optional[SentimentModel] = None
+
+
+def _init_worker(model: Optional[SentimentModel], model_kwargs: Dict[str, object], threads: int) -> None:
+    """Runs once per worker: pin thread pools and attach the model."""
+
+    global _worker_model
+    for variable in ("OMP_NUM_THREADS", "MKL_NUM_THREADS", "OPENBLAS_NUM_THREADS"):
+        os.environ[variable] = str(threads)
+    # With the fork start method ``model`` is the parent's instance shared
+    # copy-on-write; otherwise it is rebuilt from ``model_kwargs``.
+    _worker_model = model if model is not None else SentimentModel(**model_kwargs)
+    # Only a transformer adapter imports torch; joblib/linear workers must not
+    # pay for importing it just to pin its thread pool.
+    torch = sys.modules.get("torch")
+    if torch is not None:  # pragma: no cover - optional dependency
+        torch.set_num_threads(threads)
+
+
+def _score_shard(texts: List[str]) -> Tuple[List[int], object]:
+    if _worker_model is None:  # pragma: no cover - initializer always runs first
+        raise RuntimeError("Inference worker is not initialised")
+    return _worker_model.score_batch(texts)
+
+
+def _worker_pid() -> int:
+    return os.getpid()
+
+
+class InferencePool:
+    """Shard ``score_batch`` calls across worker processes, bypassing the GIL.
+
+    ``max_inflight`` bounds the number of shards queued or running at once;
+    callers beyond that block until a shard completes.  A crashed worker breaks
+    the executor, so it is rebuilt and the affected shards are resubmitted; if
+    that keeps failing the shard is scored in-process so no request is lost.
+    A shard that takes longer than ``result_timeout`` seconds (e.g. a worker
+    deadlocked on a lock inherited through fork) is scored in-process too and
+    the pool's processes are replaced.
+
+    ``start_method`` defaults to ``fork`` where available, which is only safe
+    while no other threads hold locks (service startup).  Pools created later
+    (model hot swap) should pass ``"forkserver"``; restarts always use
+    :func:`safe_start_method`.
+    """
+
+    def __init__(
+        self,
+        model: SentimentModel,
+        model_kwargs: Dict[str, object],
+        workers: int,
+        threads_per_worker: int = 1,
+        max_inflight: int = 0,
+        shard_size: int = 256,
+        max_retries: int = 2,
+        result_timeout: float = 60.0,
+        start_method: Optional[str] = None,
+    ) -> None:
+        if workers < 1:
+            raise ValueError("workers must be positive")
+        self.model = model
+        self.model_kwargs = model_kwargs
+        self.workers = workers
+        self.threads_per_worker = max(1, threads_per_worker)
+        self.max_inflight = max_inflight or workers * 2
+        self.shard_size = max(1, shard_size)
+        self.max_retries = max_retries
+        self.result_timeout = result_timeout if result_timeout > 0 else None
+        methods = multiprocessing.get_all_start_methods()
+        self.start_method = start_method or ("fork" if "fork" in methods else "spawn")
+        self._slots = BoundedSemaphore(self.max_inflight)
+        self._lock = Lock()
+        self._inflight = 0
+        self._shards = 0
+        self._restarts = 0
+        self._retries = 0
+        self._fallbacks = 0
+        self._timeouts = 0
+        self._generation = 0
+        self._closed = False
+        self._executor = self._start_executor(self.start_method)
+
+    def _start_executor(self, start_method: str) -> ProcessPoolExecutor:
+        fork = start_method == "fork"
+        executor = ProcessPoolExecutor(
+            max_workers=self.workers,
+            mp_context=multiprocessing.get_context(start_method),
+            initializer=_init_worker,
+            initargs=(self.model if fork else None, self.model_kwargs, self.threads_per_worker),
+        )
+        # Spawn every worker now, before request threads start touching the
+        # model, instead of lazily on the first large batch.
+        try:
+            for future in [executor.submit(_worker_pid) for _ in range(self.workers)]:
+                future.result(timeout=self.result_timeout)
+        except FutureTimeoutError:
+            logger.warning("Inference workers did not start within %s s", self.result_timeout)
+        return executor
+
+    def _restart(self, generation: int) -> None:
+        with self._lock:
+            if self._closed or generation != self._generation:
+                return  # closed, or another caller already replaced the broken executor
+            logger.warning("Inference worker pool is broken, restarting %s workers", self.workers)
+            old = self._executor
+            # A hung worker never exits on its own; shutdown() alone would leave it.
+            for process in list((getattr(old, "_processes", None) or {}).values()):
+                process.terminate()
+            old.shutdown(wait=False, cancel_futures=True)
+            # Request threads are running now, so never fork here.
+            self._executor = self._start_executor(safe_start_method())
+            self._generation += 1
+            self._restarts += 1
+
+    def score_batch(self, texts: List[str]) -> Tuple[List[int], object]:
+        if self._closed:
+            # Requests still draining after shutdown (or racing a model swap)
+            # must not respawn workers that nobody will stop again.
+            return self.model.score_batch(texts)
+        shards = [texts[start : start + self.shard_size] for start in range(0, len(texts), self.shard_size)]
+        pending = {idx: self._submit(shard) for idx, shard in enumerate(shards)}
+        results: Dict[int, Tuple[List[int], object]] = {}
+        for idx, shard in enumerate(shards):
+            future, generation = pending[idx]
+            attempts = 0
+            while True:
+                try:
+                    results[idx] = future.result(timeout=self.result_timeout)
+                    break
+                except FutureTimeoutError:
+                    logger.error("Shard took over %s s, scoring it in-process", self.result_timeout)
+                    with self._lock:
+                        self._timeouts += 1
+                        self._fallbacks += 1
+                    self._restart(generation)
+                    results[idx] = self.model.score_batch(shard)
+                    break
+                except (BrokenProcessPool, CancelledError):
+                    attempts += 1
+                    self._restart(generation)
+                    if attempts > self.max_retries:
+                        logger.error("Shard failed %s times, scoring it in-process", attempts)
+                        with self._lock:
+                            self._fallbacks += 1
+                        results[idx] = self.model.score_batch(shard)
+                        break
+                    with self._lock:
+                        self._retries += 1
+                    future, generation = self._submit(shard)
+        return _concat([results[idx] for idx in range(len(shards))])
+
+    def _submit(self, shard: List[str]) -> Tuple["Future[Tuple[List[int], object]]", int]:
+        self._slots.acquire()
+        with self._lock:
+            closed = self._closed
+            executor = self._executor
+            generation = self._generation
+            self._inflight += 1
+            self._shards += 1
+        if closed:
+            # Retries after close() score in-process instead of reviving the pool.
+            future = Future()
+            try:
+                future.set_result(self.model.score_batch(shard))
+            except BaseException as exc:
+                future.set_exception(exc)
+            future.add_done_callback(self._release)
+            return future, generation
+        try:
+            future = executor.submit(_score_shard, shard)
+        except BaseException as exc:
+            # Submitting to a broken executor raises instead of failing the
+            # future; surface it the same way so the retry loop handles it.
+            future = Future()
+            future.set_exception(exc if isinstance(exc, BrokenProcessPool) else BrokenProcessPool(str(exc)))
+        future.add_done_callback(self._release)
+        return future, generation
+
+    def _release(self, _future: Future) -> None:
+        with self._lock:
+            self._inflight -= 1
+        self._slots.release()
+
+    def snapshot(self) -> Dict[str, object]:
+        with self._lock:
+            return {
+                "workers": self.workers,
+                "threads_per_worker": self.threads_per_worker,
+                "start_method": self.start_method,
+                "max_inflight": self.max_inflight,
+                "inflight": self._inflight,
+                "shard_size": self.shard_size,
+                "shards": self._shards,
+                "restarts": self._restarts,
+                "retries": self._retries,
+                "fallbacks": self._fallbacks,
+                "timeouts": self._timeouts,
+            }
+
+    def close(self) -> None:
+        """Wait for in-flight shards, then stop the workers."""
+
+        with self._lock:
+            self._closed = True
+            executor = self._executor
+        executor.shutdown(wait=True)
+
+
+def safe_start_method() -> str:
+    """Start method that does not copy locks held by other threads of the server."""
+
+    return "forkserver" if "forkserver" in multiprocessing.get_all_start_methods() else "spawn"
+
+
+def _concat(parts: List[Tuple[List[int], object]]) -> Tuple[List[int], object]:
+    label_ids: List[int] = []
+    rows: List[object] = []
+    for ids, proba in parts:
+        label_ids.extend(ids)
+        rows.append(proba)
+    if np is not None and rows and all(isinstance(part, np.ndarray) for part in rows):
+        return label_ids, np.concatenate(rows, axis=0)
+    merged: List[object] = []
+    for part in rows:
+        merged.extend(part.tolist() if hasattr(part, "tolist") else part)
+    return label_ids, merged
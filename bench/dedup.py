@@ -0,0 +1,73 @@
+"""Throughput of ``classify_batch`` with in-batch deduplication vs scoring every row.
+
+Builds a batch where a share of rows repeat earlier texts (template forms,
+resubmissions; repeats follow a Zipf-like distribution, with spacing and case
+variants), then times ``classify_batch`` (dedup) against ``_classify_uncached``
+(every row scored), both without the prediction cache:
+
+    PYTHONPATH=. python bench/dedup.py --model models/baseline-linear --rows 10000 --unique-ratio 0.3
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import random
+import time
+from pathlib import Path
+from typing import Callable, Dict, List
+
+import pandas as pd
+
+from backend.app.model import SentimentModel, dedupe_texts
+
+
+def duplicated_batch(texts: List[str], rows: int, unique_ratio: float, seed: int = 0) -> List[str]:
+    rng = random.Random(seed)
+    pool = [f"{rng.choice(texts)} (обращение {idx})" for idx in range(max(1, int(rows * unique_ratio)))]
+    weights = [1 / (rank + 1) for rank in range(len(pool))]
+    batch = list(pool)
+    for text in rng.choices(pool, weights=weights, k=rows - len(pool)):
+        batch.append(f"  {text} " if rng.random() < 0.2 else text)
+    rng.shuffle(batch)
+    return batch
+
+
+def rows_per_sec(func: Callable[[], object], rows: int, repeat: int) -> float:
+    best = min(_timed(func) for _ in range(repeat))
+    return round(rows / best, 1)
+
+
+def _timed(func: Callable[[], object]) -> float:
+    started = time.perf_counter()
+    func()
+    return time.perf_counter() - started
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--model", type=Path, default=Path("models/baseline-linear"))
+    parser.add_argument("--data", type=Path, default=Path("data/sample_reviews.csv"))
+    parser.add_argument("--rows", type=int, default=10_000)
+    parser.add_argument("--unique-ratio", type=float, default=0.3)
+    parser.add_argument("--repeat", type=int, default=5)
+    return parser.parse_args()
+
+
+def main() -> None:
+    args = parse_args()
+    model = SentimentModel(args.model)
+    texts = pd.read_csv(args.data)["text"].astype(str).tolist()
+    report: Dict[str, object] = {"adapter": type(model.adapter).__name__, "rows": args.rows}
+    for unique_ratio in sorted({args.unique_ratio, 1.0}):
+        batch = duplicated_batch(texts, args.rows, unique_ratio)
+        unique, _ = dedupe_texts(batch)
+        report[f"unique_ratio_{unique_ratio}"] = {
+            "unique_texts": len(unique),
+            "all_rows_per_sec": rows_per_sec(lambda: model._classify_uncached(batch), args.rows, args.repeat),
+            "dedup_rows_per_sec": rows_per_sec(lambda: model.classify_batch(batch), args.rows, args.repeat),
+        }
+    print(json.dumps(report, indent=2))
+
+
+if __name__ == "__main__":
+    main()
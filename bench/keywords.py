@@ -0,0 +1,95 @@
+"""Micro-benchmark: per-text keyword scan cost versus dictionary size.
+
+Compares the previous ``any(word in text for word in keywords)`` scan with the
+Aho-Corasick ``KeywordMatcher`` used by the guardrails and the keyword fallback
+(the automaton is forced on for every size; in the service dictionaries up to
+``SCAN_THRESHOLD`` keywords keep using the substring scan).
+
+    PYTHONPATH=. python bench/keywords.py --sizes 10 100 1000 10000
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import random
+import time
+from typing import Callable, Dict, List
+
+from backend.app.keywords import KeywordMatcher
+
+ALPHABET = "абвгдежзийклмнопрстуфхцчшщьыэюя"
+
+
+def random_words(count: int, rng: random.Random) -> List[str]:
+    return ["".join(rng.choice(ALPHABET) for _ in range(rng.randint(4, 9))) for _ in range(count)]
+
+
+def random_texts(count: int, length: int, rng: random.Random) -> List[str]:
+    texts = []
+    for _ in range(count):
+        words = random_words(length // 7 + 1, rng)
+        texts.append(" ".join(words)[:length])
+    return texts
+
+
+def per_text_us(scan: Callable[[str], object], texts: List[str], repeat: int) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        started = time.perf_counter()
+        for text in texts:
+            scan(text)
+        best = min(best, time.perf_counter() - started)
+    return best / len(texts) * 1e6
+
+
+def run(sizes: List[int], num_texts: int, text_length: int, repeat: int, seed: int) -> List[Dict[str, float]]:
+    rng = random.Random(seed)
+    texts = random_texts(num_texts, text_length, rng)
+    rows = []
+    for size in sizes:
+        words = random_words(size, rng)
+        started = time.perf_counter()
+        matcher = KeywordMatcher({"toxic": words}, scan_threshold=0)
+        build_ms = (time.perf_counter() - started) * 1000
+
+        def old_scan(text: str) -> bool:
+            lower = text.lower()
+            return any(word in lower for word in words)
+
+        def old_count(text: str) -> int:
+            lower = text.lower()
+            return sum(word in lower for word in words)
+
+        rows.append(
+            {
+                "dictionary_size": size,
+                "build_ms": round(build_ms, 3),
+                "old_any_us": round(per_text_us(old_scan, texts, repeat), 3),
+                "old_count_us": round(per_text_us(old_count, texts, repeat), 3),
+                "matcher_contains_us": round(
+                    per_text_us(lambda text: matcher.contains(text, "toxic"), texts, repeat), 3
+                ),
+                "matcher_find_us": round(per_text_us(matcher.find, texts, repeat), 3),
+            }
+        )
+    return rows
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10, 100, 1000, 10000])
+    parser.add_argument("--texts", type=int, default=500)
+    parser.add_argument("--text-length", type=int, default=200)
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--seed", type=int, default=13)
+    return parser.parse_args()
+
+
+def main() -> None:
+    args = parse_args()
+    rows = run(args.sizes, args.texts, args.text_length, args.repeat, args.seed)
+    print(json.dumps(rows, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,68 @@
+"""Single-text latency and load time: joblib Pipeline vs the exported linear engine,
+with its vocabulary in a process-local ``dict`` and memory-mapped (``APP_MODEL_MMAP``).
+
+    PYTHONPATH=. python bench/linear.py --model models/baseline.joblib --linear-dir models/baseline-linear
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import time
+from pathlib import Path
+from typing import Dict, List
+
+import joblib
+import numpy as np
+import pandas as pd
+
+from backend.app.model import BaseAdapter, JoblibAdapter, LinearAdapter
+
+
+def latency_us(adapter: BaseAdapter, texts: List[str], repeat: int) -> Dict[str, float]:
+    samples = []
+    for _ in range(repeat):
+        for text in texts:
+            started = time.perf_counter()
+            adapter.predict_proba([text])
+            samples.append((time.perf_counter() - started) * 1e6)
+    return {
+        "p50_us": round(float(np.percentile(samples, 50)), 1),
+        "p95_us": round(float(np.percentile(samples, 95)), 1),
+    }
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--model", type=Path, default=Path("models/baseline.joblib"))
+    parser.add_argument("--linear-dir", type=Path, default=Path("models/baseline-linear"))
+    parser.add_argument("--data", type=Path, default=Path("data/sample_reviews.csv"))
+    parser.add_argument("--repeat", type=int, default=50)
+    return parser.parse_args()
+
+
+def main() -> None:
+    args = parse_args()
+    texts = pd.read_csv(args.data)["text"].astype(str).tolist()
+    report: Dict[str, object] = {"rows": len(texts), "repeat": args.repeat}
+
+    started = time.perf_counter()
+    joblib_adapter = JoblibAdapter(joblib.load(args.model))
+    joblib_load = (time.perf_counter() - started) * 1000
+    started = time.perf_counter()
+    linear_adapter = LinearAdapter(args.linear_dir)
+    linear_load = (time.perf_counter() - started) * 1000
+    started = time.perf_counter()
+    mapped_adapter = LinearAdapter(args.linear_dir, mmap=True)
+    mapped_load = (time.perf_counter() - started) * 1000
+
+    report["joblib"] = {"load_ms": round(joblib_load, 3), **latency_us(joblib_adapter, texts, args.repeat)}
+    report["linear"] = {"load_ms": round(linear_load, 3), **latency_us(linear_adapter, texts, args.repeat)}
+    report["linear_mmap"] = {"load_ms": round(mapped_load, 3), **latency_us(mapped_adapter, texts, args.repeat)}
+    expected = joblib_adapter.predict_proba(texts)
+    report["max_abs_score_diff"] = float(np.abs(expected - linear_adapter.predict_proba(texts)).max())
+    report["mmap_max_abs_score_diff"] = float(np.abs(expected - mapped_adapter.predict_proba(texts)).max())
+    print(json.dumps(report, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,483 @@
+"""Concurrent load test with SLO checks.
+
+A scenario is a list of phases; each phase runs its flows side by side for
+``--duration`` seconds.  A flow sends one kind of request in one of three modes:
+
+* ``rate`` — open loop, Poisson arrivals per second (interactive users: new
+  requests keep coming whether or not the service keeps up);
+* ``users`` + ``interval`` — each user fires every ``interval`` seconds without
+  waiting for the previous reply, like ``setInterval`` in ``frontend/app.js``;
+* ``users`` alone — closed loop, each user sends back to back after ``think``
+  seconds (concurrency ramps, bulk uploads).
+
+Latency is measured from the scheduled send time, so queueing inside the load
+generator is not hidden (no coordinated omission).  Requests that would exceed
+``--max-inflight`` are counted as ``dropped`` and requests still running when
+a phase's drain timeout expires are cancelled; both count as errors.  Each flow
+reports throughput, p50/p95/p99/max latency and error rate and is checked
+against its SLO, unless nothing was scheduled for it in the phase (a low-rate
+flow in a short run), in which case its SLO is reported as not evaluated.
+
+Canned scenarios:
+
+* ``frontend`` — open tabs poll ``/stats`` every 5 s and sometimes reload
+  ``/model``; users send ``/predict`` at ``--rate`` and sometimes ``/feedback``;
+* ``interference`` — the same interactive traffic alone, then with
+  ``--uploaders`` clients posting ``--file-rows``-row CSVs to ``/predict_file``;
+  reports how much ``/predict`` p95 grows;
+* ``ramp`` — closed-loop ``/predict`` at each ``--concurrency`` level; reports
+  the throughput curve, the saturation point and the highest level that still
+  meets the ``/predict`` SLO.
+
+Target: ``--url`` of a running service, ``--spawn`` (starts uvicorn on a free
+port with stats/feedback/jobs in a temporary directory) or ``--in-process``
+(the ASGI app on the generator's own event loop; cheap, but the generator and
+the service share one CPU):
+
+    PYTHONPATH=. python bench/load.py --scenario frontend --spawn --tabs 100 --rate 20
+    PYTHONPATH=. python bench/load.py --scenario ramp --url http://127.0.0.1:8000 --concurrency 1 4 16 64
+    PYTHONPATH=. python bench/load.py --scenario interference --in-process --slo predict:p95=80,errors=0.001 --fail-on-slo
+"""
+from __future__ import annotations
+
+import argparse
+import asyncio
+import contextlib
+import csv
+import io
+import json
+import os
+import random
+import socket
+import subprocess
+import sys
+import tempfile
+import time
+from collections import Counter
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import AsyncIterator, Callable, Dict, List, Optional
+
+import httpx
+
+from bench.suite import percentile
+from bench.textgen import generate_texts
+
+SCENARIOS = ("frontend", "interference", "ramp")
+STATS_POLL_SECONDS = 5.0  # setInterval(refreshStats, 5000) in frontend/app.js
+
+
+@dataclass
+class Slo:
+    p95_ms: Optional[float] = None
+    p99_ms: Optional[float] = None
+    error_rate: float = 0.01
+
+    def violations(self, stats: Dict[str, float]) -> List[str]:
+        found = []
+        for metric, limit in (("p95_ms", self.p95_ms), ("p99_ms", self.p99_ms)):
+            if limit is not None and stats[metric] > limit:
+                found.append(f"{metric} {stats[metric]} > {limit}")
+        if stats["error_rate"] > self.error_rate:
+            found.append(f"error_rate {stats['error_rate']} > {self.error_rate}")
+        return found
+
+
+@dataclass
+class Flow:
+    name: str
+    method: str
+    path: str
+    request: Callable[[random.Random], dict] = lambda rng: {}
+    rate: float = 0.0
+    users: int = 0
+    interval: float = 0.0
+    think: float = 0.0
+    slo: Optional[Slo] = None
+
+
+@dataclass
+class Phase:
+    name: str
+    flows: List[Flow]
+
+
+@dataclass
+class FlowResult:
+    latencies: List[float] = field(default_factory=list)
+    errors: Counter = field(default_factory=Counter)
+    dropped: int = 0
+
+    def summary(self, duration: float) -> Dict[str, object]:
+        samples = sorted(self.latencies)
+        requests = len(samples)
+        failed = sum(self.errors.values())
+        ok = requests - failed
+        attempted = requests + self.dropped
+
+        def pct(value: float) -> float:
+            return round(percentile(samples, value) * 1000, 2) if samples else 0.0
+
+        return {
+            "requests": requests,
+            "throughput_rps": round(ok / duration, 2),
+            "error_rate": round((failed + self.dropped) / attempted, 4) if attempted else 0.0,
+            "errors": dict(self.errors),
+            "dropped": self.dropped,
+            "p50_ms": pct(50),
+            "p95_ms": pct(95),
+            "p99_ms": pct(99),
+            "max_ms": round(samples[-1] * 1000, 2) if samples else 0.0,
+        }
+
+
+class LoadRunner:
+    def __init__(self, client: httpx.AsyncClient, max_inflight: int = 512, seed: int = 0) -> None:
+        self.client = client
+        self.max_inflight = max_inflight
+        self.rng = random.Random(seed)
+        self._inflight = 0
+        self._tasks: set = set()
+
+    async def _send(self, flow: Flow, result: FlowResult, scheduled: float) -> None:
+        self._inflight += 1
+        try:
+            response = await self.client.request(flow.method, flow.path, **flow.request(self.rng))
+            if response.status_code >= 400:
+                result.errors[str(response.status_code)] += 1
+        except httpx.HTTPError as exc:
+            result.errors[type(exc).__name__] += 1
+        except asyncio.CancelledError:
+            result.errors["cancelled"] += 1
+            raise
+        finally:
+            self._inflight -= 1
+            result.latencies.append(time.perf_counter() - scheduled)
+
+    def _launch(self, flow: Flow, result: FlowResult, scheduled: float) -> None:
+        if self._inflight >= self.max_inflight:
+            result.dropped += 1
+            return
+        task = asyncio.ensure_future(self._send(flow, result, scheduled))
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+    async def _sleep_until(self, moment: float) -> None:
+        delay = moment - time.perf_counter()
+        if delay > 0:
+            await asyncio.sleep(delay)
+
+    async def _open_loop(self, flow: Flow, result: FlowResult, deadline: float) -> None:
+        scheduled = time.perf_counter()
+        while True:
+            scheduled += self.rng.expovariate(flow.rate)
+            if scheduled >= deadline:
+                return
+            await self._sleep_until(scheduled)
+            self._launch(flow, result, scheduled)
+
+    async def _periodic_user(self, flow: Flow, result: FlowResult, deadline: float) -> None:
+        scheduled = time.perf_counter() + self.rng.uniform(0, flow.interval)
+        while scheduled < deadline:
+            await self._sleep_until(scheduled)
+            self._launch(flow, result, scheduled)
+            scheduled += flow.interval
+
+    async def _closed_user(self, flow: Flow, result: FlowResult, deadline: float) -> None:
+        while time.perf_counter() < deadline:
+            await self._send(flow, result, time.perf_counter())
+            if flow.think:
+                await asyncio.sleep(self.rng.expovariate(1 / flow.think))
+
+    async def run_phase(self, phase: Phase, duration: float, drain_timeout: float = 30.0) -> Dict[str, object]:
+        results = {flow.name: FlowResult() for flow in phase.flows}
+        started = time.perf_counter()
+        deadline = started + duration
+        generators = []
+        for flow in phase.flows:
+            result = results[flow.name]
+            if flow.rate > 0:
+                generators.append(self._open_loop(flow, result, deadline))
+            elif flow.interval > 0:
+                generators.extend(self._periodic_user(flow, result, deadline) for _ in range(flow.users))
+            else:
+                generators.extend(self._closed_user(flow, result, deadline) for _ in range(flow.users))
+        await asyncio.gather(*generators)
+        if self._tasks:
+            _, pending = await asyncio.wait(set(self._tasks), timeout=drain_timeout)
+            # Stragglers would otherwise land in the next phase's report.
+            for task in pending:
+                task.cancel()
+            await asyncio.gather(*pending, return_exceptions=True)
+        elapsed = max(duration, time.perf_counter() - started)
+        report: Dict[str, object] = {"duration_s": round(elapsed, 2), "flows": {}}
+        for flow in phase.flows:
+            stats = results[flow.name].summary(elapsed)
+            if flow.slo is not None:
+                scheduled = stats["requests"] or stats["dropped"]
+                # ``None``: not evaluated, nothing was due in this phase.
+                stats["slo_violations"] = flow.slo.violations(stats) if scheduled else None
+            report["flows"][flow.name] = stats
+        return report
+
+
+def _texts(args: argparse.Namespace) -> List[str]:
+    return generate_texts(args.texts, mean_words=args.mean_words, duplicate_ratio=args.duplicate_ratio, seed=args.seed)
+
+
+def _predict_flow(texts: List[str], **kwargs) -> Flow:
+    return Flow("predict", "POST", "/predict", lambda rng: {"json": {"text": rng.choice(texts)}}, **kwargs)
+
+
+def _csv_upload(texts: List[str], rows: int, rng: random.Random) -> bytes:
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerow(["text"])
+    writer.writerows([text] for text in rng.choices(texts, k=rows))
+    return buffer.getvalue().encode("utf-8")
+
+
+def _interactive_flows(texts: List[str], args: argparse.Namespace) -> List[Flow]:
+    def feedback(rng: random.Random) -> dict:
+        label = rng.choice(["negative", "neutral", "positive"])
+        return {"json": {"text": rng.choice(texts), "predicted_label": label, "user_label": label}}
+
+    return [
+        _predict_flow(texts, rate=args.rate, slo=Slo(p95_ms=args.predict_p95_ms, p99_ms=args.predict_p95_ms * 4)),
+        Flow("stats", "GET", "/stats", users=args.tabs, interval=STATS_POLL_SECONDS, slo=Slo(p95_ms=50.0)),
+        Flow("feedback", "POST", "/feedback", feedback, rate=args.rate * 0.05, slo=Slo(p95_ms=100.0)),
+        # A tab reload fetches /model (and the static reports) again; about once a minute per tab.
+        Flow("model", "GET", "/model", rate=args.tabs / 60, slo=Slo(p95_ms=50.0)),
+    ]
+
+
+def build_scenario(args: argparse.Namespace) -> List[Phase]:
+    texts = _texts(args)
+    if args.scenario == "frontend":
+        return [Phase("frontend", _interactive_flows(texts, args))]
+    if args.scenario == "interference":
+        upload = Flow(
+            "predict_file",
+            "POST",
+            "/predict_file",
+            lambda rng: {"files": {"file": ("load.csv", _csv_upload(texts, args.file_rows, rng), "text/csv")}},
+            users=args.uploaders,
+            think=1.0,
+            slo=Slo(p95_ms=None, error_rate=0.0),
+        )
+        return [
+            Phase("interactive", _interactive_flows(texts, args)),
+            Phase("with_uploads", [*_interactive_flows(texts, args), upload]),
+        ]
+    return [
+        Phase(f"concurrency_{level}", [_predict_flow(texts, users=level, slo=Slo(p95_ms=args.predict_p95_ms))])
+        for level in args.concurrency
+    ]
+
+
+def saturation(points: List[Dict[str, float]], min_gain: float = 0.1) -> Optional[float]:
+    """First concurrency after which throughput grows by less than ``min_gain``."""
+
+    for previous, current in zip(points, points[1:]):
+        if current["throughput_rps"] < previous["throughput_rps"] * (1 + min_gain):
+            return previous["concurrency"]
+    return None
+
+
+def summarize(args: argparse.Namespace, phases: Dict[str, Dict[str, object]]) -> Dict[str, object]:
+    if args.scenario == "interference":
+        before = phases["interactive"]["flows"]["predict"]
+        after = phases["with_uploads"]["flows"]["predict"]
+        return {
+            "predict_p95_ms": [before["p95_ms"], after["p95_ms"]],
+            "predict_p95_growth": round(after["p95_ms"] / before["p95_ms"], 2) if before["p95_ms"] else None,
+        }
+    if args.scenario == "ramp":
+        points = [
+            {"concurrency": level, **{key: phase["flows"]["predict"][key] for key in ("throughput_rps", "p95_ms")}}
+            for level, phase in zip(args.concurrency, phases.values())
+        ]
+        within_slo = [
+            level
+            for level, phase in zip(args.concurrency, phases.values())
+            if not phase["flows"]["predict"].get("slo_violations")
+        ]
+        return {
+            "curve": points,
+            "saturation_concurrency": saturation(points),
+            "max_concurrency_within_slo": max(within_slo, default=None),
+        }
+    return {}
+
+
+def parse_slo(specs: List[str]) -> Dict[str, Dict[str, float]]:
+    """``predict:p95=80,p99=300,errors=0.001`` -> ``{"predict": {"p95_ms": 80, ...}}``."""
+
+    names = {"p95": "p95_ms", "p99": "p99_ms", "errors": "error_rate"}
+    overrides: Dict[str, Dict[str, float]] = {}
+    for spec in specs:
+        flow, _, limits = spec.partition(":")
+        for item in filter(None, limits.split(",")):
+            key, _, value = item.partition("=")
+            if key not in names:
+                raise argparse.ArgumentTypeError(f"unknown SLO metric {key!r} in {spec!r}, expected p95, p99 or errors")
+            overrides.setdefault(flow, {})[names[key]] = float(value)
+    return overrides
+
+
+def apply_slo(phases: List[Phase], overrides: Dict[str, Dict[str, float]]) -> None:
+    for phase in phases:
+        for flow in phase.flows:
+            if flow.name in overrides:
+                base = flow.slo or Slo()
+                flow.slo = Slo(**{**base.__dict__, **overrides[flow.name]})
+
+
+def _free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def _service_env(workdir: Path) -> Dict[str, str]:
+    env = dict(os.environ)
+    for name, value in {
+        "APP_HISTORY_PATH": workdir / "history.jsonl",
+        "APP_FEEDBACK_PATH": workdir / "feedback.jsonl",
+        "APP_JOBS_DIR": workdir / "jobs",
+    }.items():
+        env.setdefault(name, str(value))
+    return env
+
+
+@contextlib.asynccontextmanager
+async def target(args: argparse.Namespace) -> AsyncIterator[httpx.AsyncClient]:
+    limits = httpx.Limits(max_connections=args.max_inflight, max_keepalive_connections=args.max_inflight)
+    timeout = httpx.Timeout(args.timeout)
+    if args.url:
+        async with httpx.AsyncClient(base_url=args.url, limits=limits, timeout=timeout) as client:
+            yield client
+        return
+    with tempfile.TemporaryDirectory() as tmp:
+        env = _service_env(Path(tmp))
+        if args.in_process:
+            os.environ.update({key: value for key, value in env.items() if key.startswith("APP_")})
+            from backend.app import main
+
+            transport = httpx.ASGITransport(app=main.app)
+            async with main.app.router.lifespan_context(main.app):
+                async with httpx.AsyncClient(transport=transport, base_url="http://load", timeout=timeout) as client:
+                    yield client
+            return
+        port = _free_port()
+        command = [sys.executable, "-m", "uvicorn", "backend.app.main:app", "--host", "127.0.0.1", "--port", str(port)]
+        command += ["--workers", str(args.server_workers), "--log-level", "warning"]
+        server = subprocess.Popen(command, env=env)
+        try:
+            url = f"http://127.0.0.1:{port}"
+            async with httpx.AsyncClient(base_url=url, limits=limits, timeout=timeout) as client:
+                for _ in range(300):
+                    if server.poll() is not None:
+                        raise RuntimeError(f"uvicorn exited with code {server.returncode}")
+                    with contextlib.suppress(httpx.HTTPError):
+                        if (await client.get("/health")).status_code == 200:
+                            break
+                    await asyncio.sleep(0.2)
+                else:
+                    raise RuntimeError("uvicorn did not become healthy in 60 s")
+                yield client
+        finally:
+            server.terminate()
+            server.wait(timeout=30)
+
+
+async def run(args: argparse.Namespace) -> Dict[str, object]:
+    phases = build_scenario(args)
+    apply_slo(phases, parse_slo(args.slo))
+    results: Dict[str, Dict[str, object]] = {}
+    async with target(args) as client:
+        runner = LoadRunner(client, max_inflight=args.max_inflight, seed=args.seed)
+        for text in _texts(args)[:20]:  # warm-up: connections, lazy imports, first batch
+            await client.post("/predict", json={"text": text})
+        for phase in phases:
+            results[phase.name] = await runner.run_phase(phase, args.duration)
+            print(f"{phase.name}: {json.dumps(results[phase.name]['flows'], ensure_ascii=False)}", file=sys.stderr)
+    violations = {
+        f"{phase}.{flow}": stats["slo_violations"]
+        for phase, report in results.items()
+        for flow, stats in report["flows"].items()
+        if stats.get("slo_violations")
+    }
+    not_evaluated = [
+        f"{phase}.{flow}"
+        for phase, report in results.items()
+        for flow, stats in report["flows"].items()
+        if "slo_violations" in stats and stats["slo_violations"] is None
+    ]
+    return {
+        "created_at": datetime.now(timezone.utc).isoformat(),
+        "scenario": args.scenario,
+        "target": args.url or ("in-process" if args.in_process else f"uvicorn --workers {args.server_workers}"),
+        "config": {
+            "duration_s": args.duration,
+            "rate": args.rate,
+            "tabs": args.tabs,
+            "uploaders": args.uploaders,
+            "file_rows": args.file_rows,
+            "concurrency": args.concurrency,
+            "max_inflight": args.max_inflight,
+        },
+        "phases": results,
+        "summary": summarize(args, results),
+        "slo_violations": violations,
+        "slo_not_evaluated": not_evaluated,
+        "slo_passed": not violations,
+    }
+
+
+def parse_args(argv: Optional[List[str]] = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--scenario", choices=SCENARIOS, default="frontend")
+    where = parser.add_mutually_exclusive_group()
+    where.add_argument("--url", help="running service, e.g. http://127.0.0.1:8000")
+    where.add_argument("--spawn", action="store_true", help="start uvicorn on a free port (default)")
+    where.add_argument("--in-process", action="store_true", help="ASGI app on the generator's event loop")
+    parser.add_argument("--server-workers", type=int, default=1, help="uvicorn --workers with --spawn")
+    parser.add_argument("--duration", type=float, default=30.0, help="seconds per phase")
+    parser.add_argument("--rate", type=float, default=10.0, help="interactive /predict requests per second")
+    parser.add_argument("--tabs", type=int, default=20, help="open frontend tabs polling /stats")
+    parser.add_argument("--uploaders", type=int, default=2, help="clients uploading CSVs back to back")
+    parser.add_argument("--file-rows", type=int, default=1000)
+    parser.add_argument("--concurrency", type=int, nargs="+", default=[1, 2, 4, 8, 16, 32, 64])
+    parser.add_argument("--predict-p95-ms", type=float, default=100.0, help="default /predict p95 SLO")
+    parser.add_argument("--slo", action="append", default=[], help="flow:p95=MS,p99=MS,errors=RATE; repeatable")
+    parser.add_argument("--texts", type=int, default=5000)
+    parser.add_argument("--mean-words", type=int, default=15)
+    parser.add_argument("--duplicate-ratio", type=float, default=0.2)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--max-inflight", type=int, default=512)
+    parser.add_argument("--timeout", type=float, default=30.0)
+    parser.add_argument("--output", type=Path, help="default: reports/load/<scenario>-<utc>.json")
+    parser.add_argument("--fail-on-slo", action="store_true")
+    args = parser.parse_args(argv)
+    parse_slo(args.slo)  # fail early on a malformed spec
+    return args
+
+
+def main() -> None:
+    args = parse_args()
+    report = asyncio.run(run(args))
+    stamp = datetime.now(timezone.utc).strftime("%Y%m%dT%H%M%S")
+    output = args.output or Path("reports/load") / f"{args.scenario}-{stamp}.json"
+    output.parent.mkdir(parents=True, exist_ok=True)
+    output.write_text(json.dumps(report, indent=2, ensure_ascii=False), encoding="utf-8")
+    brief = {key: report[key] for key in ("summary", "slo_violations", "slo_not_evaluated")}
+    print(json.dumps(brief, indent=2, ensure_ascii=False))
+    print(f"saved {output}", file=sys.stderr)
+    if args.fail_on_slo and not report["slo_passed"]:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,102 @@
+"""Per-worker memory of N processes serving the same model, with and without mmap.
+
+Starts ``--workers`` spawned processes that each build ``SentimentModel`` (like
+separate uvicorn workers), score a few texts and report RSS, PSS and private
+memory from ``/proc/self/smaps_rollup`` before and after loading.  PSS splits
+shared pages between the processes mapping them, so with ``mmap`` its growth
+per worker shrinks as the worker count rises while RSS stays roughly flat:
+
+    PYTHONPATH=. python bench/memory.py --model models/baseline-linear --workers 4
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import multiprocessing
+import resource
+from pathlib import Path
+from typing import Dict, List
+
+SAMPLE_TEXTS = [
+    "Спасибо, всё работает быстро и удобно",
+    "Приложение постоянно вылетает, невозможно записаться к врачу",
+    "Подал заявление через портал, жду ответа",
+]
+
+
+def memory_kb() -> Dict[str, int]:
+    """Rss/Pss/Private_* of the current process in kB (Linux), max RSS elsewhere."""
+
+    rollup = Path("/proc/self/smaps_rollup")
+    if not rollup.exists():
+        return {"rss_kb": resource.getrusage(resource.RUSAGE_SELF).ru_maxrss}
+    fields: Dict[str, int] = {}
+    for line in rollup.read_text().splitlines()[1:]:
+        name, _, value = line.partition(":")
+        fields[name] = int(value.split()[0])
+    return {
+        "rss_kb": fields.get("Rss", 0),
+        "pss_kb": fields.get("Pss", 0),
+        "private_kb": fields.get("Private_Clean", 0) + fields.get("Private_Dirty", 0),
+    }
+
+
+def _worker(model_path: str, mmap: bool, loaded, release, results) -> None:
+    from backend.app.model import SentimentModel
+
+    before = memory_kb()
+    model = SentimentModel(Path(model_path), mmap=mmap)
+    model.classify_batch(SAMPLE_TEXTS * 10)
+    loaded.wait()  # every worker holds its model before anyone measures
+    after = memory_kb()
+    results.put({"before": before, "after": after, "adapter": type(model.adapter).__name__})
+    release.wait()
+
+
+def measure(model_path: Path, workers: int, mmap: bool) -> Dict[str, object]:
+    context = multiprocessing.get_context("spawn")
+    loaded = context.Barrier(workers)
+    release = context.Event()
+    results = context.Queue()
+    processes = [
+        context.Process(target=_worker, args=(str(model_path), mmap, loaded, release, results))
+        for _ in range(workers)
+    ]
+    for process in processes:
+        process.start()
+    reports: List[Dict[str, object]] = [results.get() for _ in processes]
+    release.set()
+    for process in processes:
+        process.join()
+
+    deltas = {
+        key: [report["after"][key] - report["before"][key] for report in reports]
+        for key in reports[0]["after"]
+    }
+    return {
+        "adapter": reports[0]["adapter"],
+        "workers": reports,
+        "mean_growth_kb": {key: round(sum(values) / len(values)) for key, values in deltas.items()},
+    }
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--model", type=Path, default=Path("models/baseline-linear"))
+    parser.add_argument("--workers", type=int, default=4)
+    return parser.parse_args()
+
+
+def main() -> None:
+    args = parse_args()
+    report = {
+        "model": str(args.model),
+        "workers": args.workers,
+        "private_copy": measure(args.model, args.workers, mmap=False),
+        "mmap": measure(args.model, args.workers, mmap=True),
+    }
+    print(json.dumps(report, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,73 @@
+"""Latency/throughput of the PyTorch and ONNX Runtime transformer adapters.
+
+Requires a fine-tuned model in ``models/transformer`` and the graph produced by
+``ml/export_onnx.py``:
+
+    PYTHONPATH=. python ml/export_onnx.py
+    PYTHONPATH=. python bench/onnx.py --data data/sample_reviews.csv
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import statistics
+import time
+from pathlib import Path
+from typing import Dict, List
+
+import numpy as np
+import pandas as pd
+
+from backend.app.model import BaseAdapter, OnnxAdapter, TransformerAdapter
+
+
+def measure(adapter: BaseAdapter, texts: List[str], batch_size: int, repeat: int) -> Dict[str, float]:
+    adapter.predict_proba(texts[:batch_size])  # warmup
+    latencies = []
+    for _ in range(repeat):
+        for text in texts:
+            started = time.perf_counter()
+            adapter.predict_proba([text])
+            latencies.append((time.perf_counter() - started) * 1000)
+    started = time.perf_counter()
+    for _ in range(repeat):
+        for offset in range(0, len(texts), batch_size):
+            adapter.predict_proba(texts[offset : offset + batch_size])
+    elapsed = time.perf_counter() - started
+    quantiles = statistics.quantiles(latencies, n=100)
+    return {
+        "single_p50_ms": round(quantiles[49], 3),
+        "single_p95_ms": round(quantiles[94], 3),
+        "batch_rows_per_sec": round(len(texts) * repeat / elapsed, 1),
+    }
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--model-dir", type=Path, default=Path("models/transformer"))
+    parser.add_argument("--data", type=Path, default=Path("data/sample_reviews.csv"))
+    parser.add_argument("--batch-size", type=int, default=16)
+    parser.add_argument("--repeat", type=int, default=5)
+    return parser.parse_args()
+
+
+def main() -> None:
+    args = parse_args()
+    texts = pd.read_csv(args.data)["text"].astype(str).tolist()
+    torch_adapter = TransformerAdapter(args.model_dir)
+    onnx_adapter = OnnxAdapter(args.model_dir)
+    diff = np.abs(
+        np.asarray(torch_adapter.predict_proba(texts)) - np.asarray(onnx_adapter.predict_proba(texts))
+    ).max()
+    report = {
+        "data": str(args.data),
+        "num_texts": len(texts),
+        "max_abs_score_diff": float(diff),
+        "pytorch": measure(torch_adapter, texts, args.batch_size, args.repeat),
+        "onnxruntime": measure(onnx_adapter, texts, args.batch_size, args.repeat),
+    }
+    print(json.dumps(report, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,101 @@
+"""Rows/sec and padding waste with and without length bucketing.
+
+Builds a mixed-length workload (mostly short complaints with a long tail up to
+2000 characters, like real ``/predict_file`` uploads) and scores it with
+``TransformerAdapter`` in arrival order and in length-sorted sub-batches:
+
+    PYTHONPATH=. python bench/padding.py --model-dir models/transformer --rows 512
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import random
+import time
+from pathlib import Path
+from typing import Dict, List
+
+import numpy as np
+import pandas as pd
+
+from backend.app.model import TransformerAdapter
+
+
+def mixed_length_texts(seed_texts: List[str], rows: int, seed: int, max_chars: int = 2000) -> List[str]:
+    rng = random.Random(seed)
+    texts = []
+    for _ in range(rows):
+        target = min(max_chars, int(rng.lognormvariate(4.5, 1.0)))
+        parts: List[str] = []
+        while sum(len(part) + 1 for part in parts) < target:
+            parts.append(rng.choice(seed_texts))
+        texts.append(" ".join(parts)[:target] or rng.choice(seed_texts))
+    return texts
+
+
+def padding_stats(adapter: TransformerAdapter, texts: List[str], sort_by_length: bool) -> Dict[str, float]:
+    lengths = [
+        len(ids)
+        for ids in adapter.tokenizer(texts, truncation=True, max_length=adapter.max_length)["input_ids"]
+    ]
+    order = sorted(range(len(texts)), key=lengths.__getitem__) if sort_by_length else list(range(len(texts)))
+    real = sum(lengths)
+    padded = 0
+    for start in range(0, len(order), adapter.batch_size):
+        chunk = [lengths[idx] for idx in order[start : start + adapter.batch_size]]
+        padded += max(chunk) * len(chunk)
+    return {"real_tokens": real, "padded_tokens": padded, "padding_ratio": round(padded / real, 3)}
+
+
+def rows_per_sec(adapter: TransformerAdapter, texts: List[str], repeat: int) -> float:
+    adapter.predict_proba(texts[: adapter.batch_size])
+    started = time.perf_counter()
+    for _ in range(repeat):
+        adapter.predict_proba(texts)
+    return len(texts) * repeat / (time.perf_counter() - started)
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--model-dir", type=Path, default=Path("models/transformer"))
+    parser.add_argument("--data", type=Path, default=Path("data/sample_reviews.csv"))
+    parser.add_argument("--rows", type=int, default=512)
+    parser.add_argument("--batch-size", type=int, default=16)
+    parser.add_argument("--max-length", type=int, default=512)
+    parser.add_argument("--repeat", type=int, default=2)
+    parser.add_argument("--seed", type=int, default=7)
+    return parser.parse_args()
+
+
+def main() -> None:
+    args = parse_args()
+    seed_texts = pd.read_csv(args.data)["text"].astype(str).tolist()
+    texts = mixed_length_texts(seed_texts, args.rows, args.seed)
+    report: Dict[str, object] = {
+        "rows": len(texts),
+        "batch_size": args.batch_size,
+        "max_length": args.max_length,
+        "median_chars": float(np.median([len(text) for text in texts])),
+        "max_chars": max(len(text) for text in texts),
+    }
+    outputs = {}
+    for name, sort_by_length in (("arrival_order", False), ("length_bucketed", True)):
+        adapter = TransformerAdapter(
+            args.model_dir,
+            batch_size=args.batch_size,
+            max_length=args.max_length,
+            sort_by_length=sort_by_length,
+        )
+        report[name] = {
+            **padding_stats(adapter, texts, sort_by_length),
+            "rows_per_sec": round(rows_per_sec(adapter, texts, args.repeat), 1),
+        }
+        outputs[name] = adapter.predict_proba(texts)
+    report["max_abs_score_diff"] = float(
+        np.abs(outputs["arrival_order"] - outputs["length_bucketed"]).max()
+    )
+    print(json.dumps(report, indent=2))
+
+
+if __name__ == "__main__":
+    main()
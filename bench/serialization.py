@@ -0,0 +1,100 @@
+"""Serialization cost per N predictions: pydantic models vs the fast path.
+
+Request side: ``BatchPredictRequest.parse_raw`` vs ``parse_texts``.  Response
+side: building ``BatchPredictResponse``, re-validating it and encoding it like
+FastAPI's ``response_model`` path, vs ``encode_predictions`` for JSON and
+``encode_scores`` (from the label ids and score matrix, as the endpoints do)
+for the compact formats:
+
+    PYTHONPATH=. python bench/serialization.py --rows 10000
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import random
+import time
+from typing import Callable, Dict, List
+
+import numpy as np
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import JSONResponse
+
+from backend.app.schemas import BatchPredictRequest, BatchPredictResponse, PredictResponse
+from backend.app.serialization import (
+    COMPACT_JSON,
+    JSON,
+    MSGPACK,
+    available_formats,
+    encode_predictions,
+    encode_scores,
+    parse_texts,
+)
+
+LABELS = ["negative", "neutral", "positive"]
+
+
+def synthetic(rows: int, seed: int = 0) -> List[Dict[str, object]]:
+    rng = random.Random(seed)
+    predictions = []
+    for _ in range(rows):
+        weights = [rng.random() for _ in LABELS]
+        total = sum(weights)
+        scores = {label: weight / total for label, weight in zip(LABELS, weights)}
+        predictions.append({"label": max(scores, key=scores.get), "scores": scores})
+    return predictions
+
+
+def best_ms(func: Callable[[], object], repeat: int) -> Dict[str, float]:
+    timings = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        result = func()
+        timings.append((time.perf_counter() - started) * 1000)
+    report = {"best_ms": round(min(timings), 3)}
+    if isinstance(result, bytes):
+        report["bytes"] = len(result)
+    return report
+
+
+def pydantic_response(predictions: List[Dict[str, object]]) -> bytes:
+    response = BatchPredictResponse(predictions=[PredictResponse(**pred) for pred in predictions])
+    validated = BatchPredictResponse.validate(response)  # FastAPI re-validates against response_model
+    return JSONResponse(jsonable_encoder(validated)).body
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, default=10_000)
+    parser.add_argument("--repeat", type=int, default=5)
+    return parser.parse_args()
+
+
+def main() -> None:
+    args = parse_args()
+    predictions = synthetic(args.rows)
+    texts = [f"Отзыв номер {idx}: приложение работает нормально" for idx in range(args.rows)]
+    body = json.dumps({"texts": texts}, ensure_ascii=False).encode("utf-8")
+
+    report: Dict[str, object] = {
+        "rows": args.rows,
+        "request": {
+            "pydantic": best_ms(lambda: BatchPredictRequest.parse_raw(body).texts, args.repeat),
+            "fast": best_ms(lambda: parse_texts(body), args.repeat),
+        },
+        "response": {"pydantic": best_ms(lambda: pydantic_response(predictions), args.repeat)},
+    }
+    label_ids = [LABELS.index(pred["label"]) for pred in predictions]
+    scores = np.array([[pred["scores"][label] for label in LABELS] for pred in predictions])
+    names = {JSON: "json", COMPACT_JSON: "compact_json", MSGPACK: "msgpack"}
+    for media_type in available_formats():
+        if media_type == JSON:
+            encode = lambda: encode_predictions(predictions, LABELS, media_type)  # noqa: E731
+        else:
+            encode = lambda: encode_scores(label_ids, scores, LABELS, media_type)  # noqa: E731
+        report["response"][names[media_type]] = best_ms(encode, args.repeat)
+    print(json.dumps(report, indent=2))
+
+
+if __name__ == "__main__":
+    main()
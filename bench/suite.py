@@ -0,0 +1,351 @@
+"""Benchmark suite: adapters, ``SentimentModel`` and the HTTP endpoints.
+
+Every section runs on synthetic reviews from ``bench/textgen.py`` and reports
+throughput (texts/sec) and p50/p95/p99 latency per call:
+
+* ``adapters`` — ``predict_proba`` of ``KeywordFallbackAdapter``,
+  ``JoblibAdapter`` (``--model``) and ``TransformerAdapter``
+  (``--transformer-dir``), one text per call and ``--adapter-batch`` texts per
+  call; adapters whose artifact or dependencies are missing are reported as
+  skipped;
+* ``model`` — ``SentimentModel.classify`` vs ``classify_batch`` at each of
+  ``--batch-sizes`` (prediction cache off, in-batch deduplication on);
+* ``http`` — ``/predict``, ``/predict_batch`` and ``/predict_file`` through the
+  in-process ASGI ``TestClient`` (request/response handling, validation,
+  guardrails, stats journal; no network).  ``/predict`` goes through the
+  micro-batcher, so a lone sequential client waits ``APP_BATCH_MAX_WAIT_MS``
+  per call.  The prediction cache is off unless ``--http-cache`` is given;
+  stats and jobs go to a temporary directory.
+
+The run is written to ``reports/bench/<utc>.json``.  ``--compare`` prints the
+change of every measurement against an earlier run and flags throughput drops
+or p95 growth beyond ``--threshold``:
+
+    PYTHONPATH=. python bench/suite.py --model models/baseline.joblib
+    PYTHONPATH=. python bench/suite.py --compare reports/bench/20250101T120000.json --fail-on-regression
+    PYTHONPATH=. python bench/suite.py --current new.json --compare old.json   # two saved runs, no benchmark
+"""
+from __future__ import annotations
+
+import argparse
+import csv
+import functools
+import io
+import json
+import math
+import os
+import platform
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Callable, Dict, Iterator, List, Sequence, Tuple
+
+from bench.textgen import DISTRIBUTIONS, generate_texts
+
+SECTIONS = ("adapters", "model", "http")
+Stats = Dict[str, float]
+
+
+def percentile(sorted_samples: Sequence[float], pct: float) -> float:
+    """Nearest-rank percentile of an already sorted sequence."""
+
+    rank = max(1, math.ceil(pct / 100 * len(sorted_samples)))
+    return sorted_samples[rank - 1]
+
+
+def measure(
+    call: Callable[[object], object],
+    payloads: Sequence[object],
+    sizes: Sequence[int],
+    repeat: int = 1,
+    min_seconds: float = 0.0,
+) -> Stats:
+    """Time ``call(payload)`` per payload; ``sizes`` are the texts in each payload.
+
+    Passes over ``payloads`` repeat at least ``repeat`` times and until
+    ``min_seconds`` of calls are collected, so fast measurements are not
+    dominated by a handful of noisy samples.
+    """
+
+    if not payloads:
+        return {"calls": 0}
+    call(payloads[0])  # warm-up: lazy imports, first allocation of buffers
+    samples: List[float] = []
+    passes = 0
+    while passes < repeat or sum(samples) < min_seconds:
+        for payload in payloads:
+            started = time.perf_counter()
+            call(payload)
+            samples.append(time.perf_counter() - started)
+        passes += 1
+    total = sum(samples)
+    texts = sum(sizes) * passes
+    samples.sort()
+    return {
+        "calls": len(samples),
+        "texts": texts,
+        "texts_per_sec": round(texts / total, 1),
+        "p50_ms": round(percentile(samples, 50) * 1000, 4),
+        "p95_ms": round(percentile(samples, 95) * 1000, 4),
+        "p99_ms": round(percentile(samples, 99) * 1000, 4),
+    }
+
+
+def chunks(texts: List[str], size: int) -> List[List[str]]:
+    return [texts[start : start + size] for start in range(0, len(texts), size)]
+
+
+def _timer(args: argparse.Namespace) -> Callable[..., Stats]:
+    return functools.partial(measure, repeat=args.repeat, min_seconds=args.min_seconds)
+
+
+def _adapter_stats(adapter, texts: List[str], args: argparse.Namespace) -> Dict[str, Stats]:
+    timed = _timer(args)
+    single = texts[: args.single_calls]
+    batches = chunks(texts, args.adapter_batch)
+    return {
+        "single": timed(lambda text: adapter.predict_proba([text]), single, [1] * len(single)),
+        f"batch_{args.adapter_batch}": timed(adapter.predict_proba, batches, [len(b) for b in batches]),
+    }
+
+
+def _load_adapters(args: argparse.Namespace) -> Iterator[Tuple[str, object]]:
+    from backend.app.model import JoblibAdapter, KeywordFallbackAdapter, TransformerAdapter
+
+    yield "keyword", KeywordFallbackAdapter()
+    if not args.model.is_file():
+        yield "joblib", f"{args.model} not found (make train)"
+    else:
+        import joblib
+
+        yield "joblib", JoblibAdapter(joblib.load(args.model))
+    if not (args.transformer_dir / "config.json").exists():
+        yield "transformer", f"{args.transformer_dir} not found (make train-transformer)"
+    else:
+        try:
+            yield "transformer", TransformerAdapter(args.transformer_dir)
+        except ImportError as exc:
+            yield "transformer", str(exc)
+
+
+def bench_adapters(texts: List[str], args: argparse.Namespace) -> Dict[str, object]:
+    results: Dict[str, object] = {}
+    for name, adapter in _load_adapters(args):
+        if isinstance(adapter, str):
+            results[name] = {"skipped": adapter}
+        else:
+            results[name] = _adapter_stats(adapter, texts, args)
+    return results
+
+
+def bench_model(texts: List[str], args: argparse.Namespace) -> Dict[str, object]:
+    from backend.app.model import SentimentModel
+
+    timed = _timer(args)
+    model = SentimentModel(model_path=args.model, cache=None)
+    single = texts[: args.single_calls]
+    results: Dict[str, object] = {
+        "adapter": type(model.adapter).__name__,
+        "classify": timed(model.classify, single, [1] * len(single)),
+    }
+    for size in args.batch_sizes:
+        batches = chunks(texts, size)
+        results[f"classify_batch_{size}"] = timed(model.classify_batch, batches, [len(b) for b in batches])
+    return results
+
+
+def _http_environment(args: argparse.Namespace, workdir: Path) -> None:
+    """Settings are read when ``backend.app.main`` is imported; explicit ``APP_*`` values win."""
+
+    defaults = {
+        "APP_MODEL_PATH": str(args.model),
+        "APP_HISTORY_PATH": str(workdir / "history.jsonl"),
+        "APP_FEEDBACK_PATH": str(workdir / "feedback.jsonl"),
+        "APP_JOBS_DIR": str(workdir / "jobs"),
+        "APP_MODEL_WATCH_INTERVAL": "0",
+    }
+    if not args.http_cache:
+        defaults["APP_PREDICTION_CACHE_SIZE"] = "0"
+    for name, value in defaults.items():
+        os.environ.setdefault(name, value)
+
+
+def bench_http(texts: List[str], args: argparse.Namespace) -> Dict[str, object]:
+    with tempfile.TemporaryDirectory() as tmp:
+        _http_environment(args, Path(tmp))
+        from fastapi.testclient import TestClient
+
+        from backend.app import main
+
+        def post(path: str, **kwargs) -> None:
+            client.post(path, **kwargs).raise_for_status()
+
+        def csv_upload(rows: List[str]) -> bytes:
+            buffer = io.StringIO()
+            writer = csv.writer(buffer)
+            writer.writerow(["text"])
+            writer.writerows([text] for text in rows)
+            return buffer.getvalue().encode("utf-8")
+
+        timed = _timer(args)
+        single = texts[: args.single_calls]
+        batches = chunks(texts, args.http_batch)
+        files = [csv_upload(rows) for rows in chunks(texts, args.file_rows)]
+        with TestClient(main.app) as client:
+            return {
+                "adapter": type(main.sentiment_model.adapter).__name__,
+                "predict_batching": main.settings.predict_batching,
+                "predict": timed(lambda text: post("/predict", json={"text": text}), single, [1] * len(single)),
+                f"predict_batch_{args.http_batch}": timed(
+                    lambda batch: post("/predict_batch", json={"texts": batch}), batches, [len(b) for b in batches]
+                ),
+                f"predict_file_{args.file_rows}": timed(
+                    lambda content: post("/predict_file", files={"file": ("bench.csv", content, "text/csv")}),
+                    files,
+                    [len(rows) for rows in chunks(texts, args.file_rows)],
+                ),
+            }
+
+
+def _git_revision() -> str | None:
+    try:
+        completed = subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, check=True, timeout=5
+        )
+    except (OSError, subprocess.SubprocessError):
+        return None
+    return completed.stdout.strip() or None
+
+
+def run(args: argparse.Namespace) -> Dict[str, object]:
+    texts = generate_texts(
+        args.texts,
+        mean_words=args.mean_words,
+        distribution=args.distribution,
+        duplicate_ratio=args.duplicate_ratio,
+        seed=args.seed,
+    )
+    runners = {"adapters": bench_adapters, "model": bench_model, "http": bench_http}
+    results = {}
+    for section in args.sections:
+        started = time.perf_counter()
+        results[section] = runners[section](texts, args)
+        print(f"{section}: {time.perf_counter() - started:.1f}s", file=sys.stderr)
+    return {
+        "created_at": datetime.now(timezone.utc).isoformat(),
+        "revision": _git_revision(),
+        "python": platform.python_version(),
+        "machine": platform.machine(),
+        "config": {
+            "texts": args.texts,
+            "mean_words": args.mean_words,
+            "distribution": args.distribution,
+            "duplicate_ratio": args.duplicate_ratio,
+            "seed": args.seed,
+            "repeat": args.repeat,
+            "min_seconds": args.min_seconds,
+            "model": str(args.model),
+        },
+        "results": results,
+    }
+
+
+def _measurements(results: Dict[str, object], prefix: str = "") -> Iterator[Tuple[str, Stats]]:
+    for name, value in results.items():
+        if not isinstance(value, dict):
+            continue
+        path = f"{prefix}{name}"
+        if "texts_per_sec" in value:
+            yield path, value
+        else:
+            yield from _measurements(value, path + ".")
+
+
+def compare(current: Dict[str, object], baseline: Dict[str, object], threshold: float = 0.15) -> List[Dict[str, object]]:
+    """Relative change of throughput and p95 per measurement present in both runs."""
+
+    old = dict(_measurements(baseline.get("results", {})))
+    rows = []
+    for path, stats in _measurements(current.get("results", {})):
+        before = old.get(path)
+        if before is None:
+            continue
+        for metric, worse_if_higher in (("texts_per_sec", False), ("p95_ms", True)):
+            if not before.get(metric):
+                continue
+            change = (stats[metric] - before[metric]) / before[metric]
+            regression = change > threshold if worse_if_higher else change < -threshold
+            rows.append(
+                {
+                    "measurement": path,
+                    "metric": metric,
+                    "baseline": before[metric],
+                    "current": stats[metric],
+                    "change": round(change, 4),
+                    "regression": regression,
+                }
+            )
+    return rows
+
+
+def print_comparison(rows: List[Dict[str, object]]) -> None:
+    width = max((len(row["measurement"]) for row in rows), default=12)
+    print(f"{'measurement':<{width}}  {'metric':<13} {'baseline':>12} {'current':>12} {'change':>8}")
+    for row in rows:
+        flag = "  REGRESSION" if row["regression"] else ""
+        print(
+            f"{row['measurement']:<{width}}  {row['metric']:<13} {row['baseline']:>12} {row['current']:>12} "
+            f"{row['change']:>+8.1%}{flag}"
+        )
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sections", nargs="+", choices=SECTIONS, default=list(SECTIONS))
+    parser.add_argument("--model", type=Path, default=Path("models/baseline.joblib"))
+    parser.add_argument("--transformer-dir", type=Path, default=Path("models/transformer"))
+    parser.add_argument("--texts", type=int, default=2000, help="synthetic texts per run")
+    parser.add_argument("--mean-words", type=int, default=15)
+    parser.add_argument("--distribution", choices=DISTRIBUTIONS, default="lognormal")
+    parser.add_argument("--duplicate-ratio", type=float, default=0.2)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--repeat", type=int, default=1, help="minimum passes over the texts")
+    parser.add_argument("--min-seconds", type=float, default=1.0, help="minimum timed calls per measurement")
+    parser.add_argument("--single-calls", type=int, default=300, help="texts sent one per call")
+    parser.add_argument("--adapter-batch", type=int, default=32)
+    parser.add_argument("--batch-sizes", type=int, nargs="+", default=[1, 8, 32, 128])
+    parser.add_argument("--http-batch", type=int, default=64)
+    parser.add_argument("--file-rows", type=int, default=500)
+    parser.add_argument("--http-cache", action="store_true", help="keep the prediction cache on for HTTP")
+    parser.add_argument("--output", type=Path, help="default: reports/bench/<utc>.json")
+    parser.add_argument("--current", type=Path, help="compare this saved run instead of benchmarking")
+    parser.add_argument("--compare", type=Path, help="earlier run to compare against")
+    parser.add_argument("--threshold", type=float, default=0.15, help="relative change reported as regression")
+    parser.add_argument("--fail-on-regression", action="store_true")
+    return parser.parse_args()
+
+
+def main() -> None:
+    args = parse_args()
+    if args.current is not None:
+        report = json.loads(args.current.read_text(encoding="utf-8"))
+    else:
+        report = run(args)
+        output = args.output or Path("reports/bench") / (datetime.now(timezone.utc).strftime("%Y%m%dT%H%M%S") + ".json")
+        output.parent.mkdir(parents=True, exist_ok=True)
+        output.write_text(json.dumps(report, indent=2, ensure_ascii=False), encoding="utf-8")
+        print(json.dumps(report["results"], indent=2, ensure_ascii=False))
+        print(f"saved {output}", file=sys.stderr)
+    if args.compare is None:
+        return
+    rows = compare(report, json.loads(args.compare.read_text(encoding="utf-8")), args.threshold)
+    print_comparison(rows)
+    if args.fail_on_regression and any(row["regression"] for row in rows):
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
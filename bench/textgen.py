@@ -0,0 +1,108 @@
+"""Synthetic Russian reviews for benchmarks.
+
+Texts are built from sentiment words (so every class and the guardrails get
+exercised), service nouns and filler.  Lengths in words follow ``fixed``,
+``uniform`` or ``lognormal`` (long tail, like real feedback) distributions, and
+``duplicate_ratio`` of the rows repeat earlier texts, mostly the popular ones,
+some with extra spacing the way resubmitted forms look (the service treats
+them as the same text):
+
+    PYTHONPATH=. python bench/textgen.py --count 5 --mean-words 20 --duplicate-ratio 0.5
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import math
+import random
+from typing import List
+
+POSITIVE = ["спасибо", "удобно", "нравится", "быстро", "хорошо", "стабильно", "понятно", "отлично"]
+NEGATIVE = ["ужас", "плохо", "вылетает", "невозможно", "ошибка", "проблема", "медленно", "молчит"]
+TOXIC = ["идиот", "тупой"]
+NOUNS = ["приложение", "портал", "оператор", "поддержка", "заявка", "интерфейс", "оплата", "сайт", "услуга", "карта"]
+FILLER = ["очень", "снова", "после", "обновления", "вчера", "когда", "всё", "уже", "опять", "сегодня", "мне", "в", "и", "не"]
+DISTRIBUTIONS = ("fixed", "uniform", "lognormal")
+
+
+def _length(rng: random.Random, distribution: str, mean_words: int, max_words: int) -> int:
+    if distribution == "fixed":
+        length = mean_words
+    elif distribution == "uniform":
+        length = rng.randint(1, 2 * mean_words - 1)
+    elif distribution == "lognormal":
+        sigma = 0.6
+        length = round(rng.lognormvariate(math.log(mean_words) - sigma * sigma / 2, sigma))
+    else:
+        raise ValueError(f"unknown length distribution {distribution!r}, expected one of {DISTRIBUTIONS}")
+    return max(1, min(max_words, length))
+
+
+def _review(rng: random.Random, words: int, toxic_ratio: float) -> str:
+    mood = rng.choice((POSITIVE, NEGATIVE, ()))
+    tokens = []
+    for _ in range(words):
+        roll = rng.random()
+        if mood and roll < 0.25:
+            tokens.append(rng.choice(mood))
+        elif roll < 0.5:
+            tokens.append(rng.choice(NOUNS))
+        else:
+            tokens.append(rng.choice(FILLER))
+    if toxic_ratio and rng.random() < toxic_ratio:
+        tokens[rng.randrange(len(tokens))] = rng.choice(TOXIC)
+    text = " ".join(tokens)
+    return text[0].upper() + text[1:] + rng.choice((".", "!", "..."))
+
+
+def generate_texts(
+    count: int,
+    mean_words: int = 15,
+    distribution: str = "lognormal",
+    duplicate_ratio: float = 0.0,
+    max_words: int = 300,
+    toxic_ratio: float = 0.02,
+    seed: int = 0,
+) -> List[str]:
+    """``count`` reviews of which about ``duplicate_ratio`` repeat earlier ones."""
+
+    if not 0.0 <= duplicate_ratio < 1.0:
+        raise ValueError("duplicate_ratio must be in [0, 1)")
+    rng = random.Random(seed)
+    unique = [
+        _review(rng, _length(rng, distribution, mean_words, max_words), toxic_ratio)
+        for _ in range(max(1, round(count * (1.0 - duplicate_ratio))))
+    ]
+    texts = list(unique)
+    weights = [1 / (rank + 1) for rank in range(len(unique))]
+    for text in rng.choices(unique, weights=weights, k=count - len(unique)):
+        texts.append(f" {text}  " if rng.random() < 0.2 else text)
+    rng.shuffle(texts)
+    return texts[:count]
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--count", type=int, default=10)
+    parser.add_argument("--mean-words", type=int, default=15)
+    parser.add_argument("--distribution", choices=DISTRIBUTIONS, default="lognormal")
+    parser.add_argument("--duplicate-ratio", type=float, default=0.0)
+    parser.add_argument("--seed", type=int, default=0)
+    return parser.parse_args()
+
+
+def main() -> None:
+    args = parse_args()
+    texts = generate_texts(
+        args.count,
+        mean_words=args.mean_words,
+        distribution=args.distribution,
+        duplicate_ratio=args.duplicate_ratio,
+        seed=args.seed,
+    )
+    for text in texts:
+        print(json.dumps(text, ensure_ascii=False))
+
+
+if __name__ == "__main__":
+    main()
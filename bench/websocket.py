@@ -0,0 +1,96 @@
+"""Messages/sec over ``/ws/predict`` vs one HTTP ``POST /predict`` per message.
+
+Needs a running service, e.g. ``uvicorn backend.app.main:app``.  HTTP uses
+``--concurrency`` keep-alive clients; the WebSocket side opens the same number
+of connections, each sending its share of messages without waiting for
+replies (the server's flow control paces them):
+
+    PYTHONPATH=. python bench/websocket.py --url http://127.0.0.1:8000 --messages 5000 --concurrency 8
+"""
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import time
+from typing import Dict, List
+
+import httpx
+import pandas as pd
+import websockets
+
+
+async def http_rate(url: str, texts: List[str], concurrency: int) -> Dict[str, float]:
+    queue: "asyncio.Queue[str]" = asyncio.Queue()
+    for text in texts:
+        queue.put_nowait(text)
+
+    async def client_loop(client: httpx.AsyncClient) -> None:
+        while not queue.empty():
+            response = await client.post("/predict", json={"text": queue.get_nowait()})
+            response.raise_for_status()
+
+    async with httpx.AsyncClient(base_url=url, timeout=60) as client:
+        started = time.perf_counter()
+        await asyncio.gather(*(client_loop(client) for _ in range(concurrency)))
+        elapsed = time.perf_counter() - started
+    return {"seconds": round(elapsed, 3), "messages_per_sec": round(len(texts) / elapsed, 1)}
+
+
+async def ws_rate(url: str, texts: List[str], concurrency: int, group: int) -> Dict[str, float]:
+    ws_url = url.replace("http", "ws", 1).rstrip("/") + "/ws/predict"
+    shards = [texts[idx::concurrency] for idx in range(concurrency)]
+
+    async def connection(shard: List[str]) -> None:
+        async with websockets.connect(ws_url, max_queue=None) as websocket:
+
+            async def send() -> None:
+                for start in range(0, len(shard), group):
+                    chunk = shard[start : start + group]
+                    if group == 1:
+                        await websocket.send(json.dumps({"id": start, "text": chunk[0]}))
+                    else:
+                        items = [{"id": start + idx, "text": text} for idx, text in enumerate(chunk)]
+                        await websocket.send(json.dumps({"items": items}))
+
+            sender = asyncio.ensure_future(send())
+            for _ in shard:
+                reply = json.loads(await websocket.recv())
+                if "error" in reply:
+                    raise RuntimeError(reply["error"])
+            await sender
+
+    started = time.perf_counter()
+    await asyncio.gather(*(connection(shard) for shard in shards if shard))
+    elapsed = time.perf_counter() - started
+    return {"seconds": round(elapsed, 3), "messages_per_sec": round(len(texts) / elapsed, 1)}
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--url", default="http://127.0.0.1:8000")
+    parser.add_argument("--data", default="data/sample_reviews.csv")
+    parser.add_argument("--messages", type=int, default=5000)
+    parser.add_argument("--concurrency", type=int, default=8)
+    parser.add_argument("--group", type=int, default=1, help="texts per WebSocket message")
+    return parser.parse_args()
+
+
+async def run(args: argparse.Namespace) -> Dict[str, object]:
+    texts = pd.read_csv(args.data)["text"].astype(str).tolist()
+    # Distinct texts so the prediction cache does not answer the repeats.
+    batch = [f"{texts[idx % len(texts)]} #{idx}" for idx in range(args.messages)]
+    return {
+        "messages": args.messages,
+        "concurrency": args.concurrency,
+        "http_predict": await http_rate(args.url, batch, args.concurrency),
+        "websocket": await ws_rate(args.url, [f"{text} ws" for text in batch], args.concurrency, args.group),
+    }
+
+
+def main() -> None:
+    print(json.dumps(asyncio.run(run(parse_args())), indent=2))
+
+
+if __name__ == "__main__":
+    main()
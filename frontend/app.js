@@ -472,6 +472,7 @@ function renderBulkSummary(summary) {
   const inputRows = summary?.input_rows ?? 0;
   const processedRows = summary?.processed_rows ?? 0;
   const skippedRows = summary?.skipped_rows ?? Math.max(0, inputRows - processedRows);
+  const uniqueTexts = summary?.unique_texts ?? processedRows;
   const countsMarkup = Object.entries(summary?.class_counts || {})
     .map(([label, count]) => `<p><strong>${label}:</strong> ${count}</p>`)
     .join('');
@@ -480,6 +481,7 @@ function renderBulkSummary(summary) {
       <h4>Строк обработано</h4>
       <p><strong>${processedRows}</strong> из ${inputRows}</p>
       <p class="muted">Пропущено: ${skippedRows}</p>
+      <p class="muted">Уникальных текстов: ${uniqueTexts}</p>
     </div>
     <div class="bulk-summary__card">
       <h4>Распределение классов</h4>
@@ -3,9 +3,10 @@ from __future__ import annotations
 
 import argparse
 import json
+import time
 from datetime import datetime, timezone
 from pathlib import Path
-from typing import Dict, Tuple
+from typing import Dict, List, Tuple
 
 import numpy as np
 import pandas as pd
@@ -16,6 +17,8 @@ from backend.app.model import SentimentModel
 DEFAULT_DATA = Path("data/sample_reviews.csv")
 DEFAULT_MODEL = Path("models/baseline.joblib")
 DEFAULT_REPORT = Path("reports/eval_metrics.json")
+# Training-time facts from metadata.json, used to compare baseline variants.
+MODEL_INFO_KEYS = ("vectorizer", "n_features", "vocabulary_size", "artifact_size_bytes", "fit_seconds")
 
 
 def load_dataset(path: Path, text_column: str, label_column: str) -> Tuple[pd.Series, pd.Series]:
@@ -40,7 +43,10 @@ def evaluate_model(
 ) -> Dict[str, object]:
     model = SentimentModel(model_path)
     texts, labels = load_dataset(data_path, text_column, label_column)
+    model.classify_batch(texts.head(8).tolist())  # warm up lazy init before timing
+    started = time.perf_counter()
     predictions = [pred["label"] for pred in model.classify_batch(texts.tolist())]
+    inference_seconds = time.perf_counter() - started
 
     report = classification_report(labels, predictions, output_dict=True, digits=4)
     accuracy = accuracy_score(labels, predictions)
@@ -60,10 +66,92 @@ def evaluate_model(
             "labels": labels_sorted,
             "matrix": matrix,
         },
+        "inference_seconds": inference_seconds,
+        "rows_per_sec": len(labels) / inference_seconds if inference_seconds else None,
+        "load_ms": model.load_time_ms,
+        "model_info": {key: model.metadata.get(key) for key in MODEL_INFO_KEYS},
         "generated_at": datetime.now(timezone.utc).isoformat(),
     }
 
 
+def compare_metrics(candidate: Dict[str, object], reference: Dict[str, object]) -> Dict[str, object]:
+    """Quality deltas (candidate - reference) and speedup of the candidate."""
+
+    speedup = None
+    if candidate["inference_seconds"]:
+        speedup = float(reference["inference_seconds"]) / float(candidate["inference_seconds"])
+    return {
+        "reference_model": reference["model"],
+        "reference_accuracy": reference["accuracy"],
+        "reference_macro_f1": reference["macro_f1"],
+        "accuracy_delta": float(candidate["accuracy"]) - float(reference["accuracy"]),
+        "macro_f1_delta": float(candidate["macro_f1"]) - float(reference["macro_f1"]),
+        "speedup": speedup,
+        "reference_load_ms": reference["load_ms"],
+        "reference_model_info": reference["model_info"],
+    }
+
+
+def sweep_cascade(
+    model_path: Path,
+    cascade_path: Path,
+    data_path: Path,
+    text_column: str,
+    label_column: str,
+    thresholds: List[float],
+) -> Dict[str, object]:
+    """Accuracy vs. average per-row cost of the baseline -> transformer cascade.
+
+    Both models score every row once; each threshold then picks, per row, the
+    baseline answer (confident) or the transformer answer (escalated), exactly
+    like ``CascadeAdapter``.  Cost is ``baseline ms/row + rate * transformer ms/row``.
+    """
+
+    texts, labels = load_dataset(data_path, text_column, label_column)
+    rows = texts.tolist()
+    primary = SentimentModel(model_path)
+    fallback = SentimentModel(cascade_path)
+    for model in (primary, fallback):
+        model.score_batch(rows[:8])  # warm up lazy init before timing
+
+    started = time.perf_counter()
+    primary_ids, _ = primary.score_batch(rows)
+    primary_ms = (time.perf_counter() - started) * 1000 / len(rows)
+    # CascadeAdapter escalates on the raw adapter scores (before guardrails);
+    # recomputed outside the timed section so the baseline is not charged twice.
+    confidence = np.asarray(primary.adapter.predict_proba(rows), dtype=np.float64).max(axis=1)
+    started = time.perf_counter()
+    fallback_ids, _ = fallback.score_batch(rows)
+    fallback_ms = (time.perf_counter() - started) * 1000 / len(rows)
+
+    primary_labels = np.array([primary.labels[idx] for idx in primary_ids])
+    fallback_labels = np.array([fallback.labels[idx] for idx in fallback_ids])
+    truth = labels.to_numpy()
+    points = []
+    for threshold in sorted(thresholds):
+        escalate = confidence < threshold
+        predictions = np.where(escalate, fallback_labels, primary_labels)
+        rate = float(escalate.mean())
+        points.append(
+            {
+                "threshold": threshold,
+                "escalation_rate": rate,
+                "accuracy": float(accuracy_score(truth, predictions)),
+                "macro_f1": float(f1_score(truth, predictions, average="macro")),
+                "avg_cost_ms": primary_ms + rate * fallback_ms,
+            }
+        )
+    return {
+        "baseline_model": str(model_path),
+        "cascade_model": str(cascade_path),
+        "baseline_ms_per_row": primary_ms,
+        "transformer_ms_per_row": fallback_ms,
+        "baseline_accuracy": float(accuracy_score(truth, primary_labels)),
+        "transformer_accuracy": float(accuracy_score(truth, fallback_labels)),
+        "thresholds": points,
+    }
+
+
 def parse_args() -> argparse.Namespace:
     parser = argparse.ArgumentParser(description=__doc__)
     parser.add_argument("--model", type=Path, default=DEFAULT_MODEL)
@@ -71,6 +159,26 @@ def parse_args() -> argparse.Namespace:
     parser.add_argument("--text-column", default="text")
     parser.add_argument("--label-column", default="label")
     parser.add_argument("--report", type=Path, default=DEFAULT_REPORT)
+    parser.add_argument(
+        "--compare-model",
+        type=Path,
+        help=(
+            "Reference model (e.g. the fp32 transformer or the TF-IDF baseline) to report "
+            "accuracy/macro-F1 delta, speedup, load time and artifact size against"
+        ),
+    )
+    parser.add_argument(
+        "--cascade-model",
+        type=Path,
+        help="Transformer behind --model in a confidence cascade; sweeps --thresholds",
+    )
+    parser.add_argument(
+        "--thresholds",
+        type=float,
+        nargs="+",
+        default=[0.5, 0.6, 0.7, 0.8, 0.9, 0.95],
+        help="Baseline confidence thresholds for the --cascade-model sweep",
+    )
     parser.add_argument(
         "--no-save",
         action="store_true",
@@ -87,6 +195,23 @@ def main() -> None:
         text_column=args.text_column,
         label_column=args.label_column,
     )
+    if args.compare_model:
+        reference = evaluate_model(
+            model_path=args.compare_model,
+            data_path=args.data,
+            text_column=args.text_column,
+            label_column=args.label_column,
+        )
+        metrics["comparison"] = compare_metrics(metrics, reference)
+    if args.cascade_model:
+        metrics["cascade_sweep"] = sweep_cascade(
+            model_path=args.model,
+            cascade_path=args.cascade_model,
+            data_path=args.data,
+            text_column=args.text_column,
+            label_column=args.label_column,
+            thresholds=args.thresholds,
+        )
 
     print("Evaluation summary:\n")
     print(json.dumps(metrics, indent=2, ensure_ascii=False))
@@ -0,0 +1,144 @@
+"""Export the TF-IDF + LogisticRegression baseline into a pickle-free linear artifact.
+
+The fitted ``TfidfVectorizer`` vocabulary/idf and ``LogisticRegression``
+coefficients are written as memory-mappable NumPy arrays plus a JSON manifest,
+which ``LinearAdapter`` in ``backend/app/model.py`` evaluates without sklearn
+or ``joblib.load``.
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import time
+from pathlib import Path
+from typing import Dict, List
+
+import joblib
+import numpy as np
+import pandas as pd
+from sklearn.feature_extraction.text import TfidfVectorizer
+from sklearn.linear_model import LogisticRegression
+
+from backend.app.model import LINEAR_FORMAT, LINEAR_MANIFEST, LINEAR_VERSION, LinearAdapter, MappedVocabulary
+
+MODEL_PATH = Path("models/baseline.joblib")
+OUTPUT_DIR = Path("models/baseline-linear")
+DATA_PATH = Path("data/sample_reviews.csv")
+
+
+def _resolve_multi_class(clf: LogisticRegression) -> str:
+    """Mirror ``LogisticRegression.predict_proba``'s choice of link function."""
+
+    multi_class = getattr(clf, "multi_class", "auto")
+    if multi_class in ("ovr", "warn"):
+        return "ovr"
+    if multi_class == "auto" and (len(clf.classes_) <= 2 or clf.solver == "liblinear"):
+        return "ovr"
+    return "multinomial"
+
+
+def _check_supported(vectorizer: TfidfVectorizer) -> None:
+    unsupported = {
+        "analyzer": vectorizer.analyzer != "word",
+        "tokenizer": vectorizer.tokenizer is not None,
+        "preprocessor": vectorizer.preprocessor is not None,
+        "strip_accents": vectorizer.strip_accents is not None,
+        "input": vectorizer.input != "content",
+    }
+    names = [name for name, flag in unsupported.items() if flag]
+    if names:
+        raise ValueError(f"TfidfVectorizer options are not supported by LinearAdapter: {names}")
+
+
+def export_linear(model_path: Path, output_dir: Path) -> Dict[str, object]:
+    pipeline = joblib.load(model_path)
+    vectorizer = pipeline.named_steps["tfidf"]
+    clf = pipeline.named_steps["clf"]
+    if not isinstance(vectorizer, TfidfVectorizer) or not isinstance(clf, LogisticRegression):
+        raise TypeError("Expected a Pipeline of TfidfVectorizer and LogisticRegression")
+    _check_supported(vectorizer)
+
+    output_dir.mkdir(parents=True, exist_ok=True)
+    vocabulary = {term: int(idx) for term, idx in vectorizer.vocabulary_.items()}
+    MappedVocabulary.save(output_dir, vocabulary)
+    if vectorizer.use_idf:
+        np.save(output_dir / "idf.npy", vectorizer.idf_.astype(np.float64))
+    np.save(output_dir / "coef.npy", clf.coef_.astype(np.float64))
+    np.save(output_dir / "intercept.npy", clf.intercept_.astype(np.float64))
+    stop_words = vectorizer.get_stop_words()
+    manifest = {
+        "format": LINEAR_FORMAT,
+        "version": LINEAR_VERSION,
+        "classes": [str(label) for label in clf.classes_],
+        "lowercase": bool(vectorizer.lowercase),
+        "token_pattern": vectorizer.token_pattern,
+        "ngram_range": list(vectorizer.ngram_range),
+        "stop_words": sorted(stop_words) if stop_words else None,
+        "binary": bool(vectorizer.binary),
+        "sublinear_tf": bool(vectorizer.sublinear_tf),
+        "norm": vectorizer.norm,
+        "multi_class": _resolve_multi_class(clf),
+        "n_features": len(vocabulary),
+        "source": str(model_path),
+    }
+    (output_dir / LINEAR_MANIFEST).write_text(json.dumps(manifest, indent=2, ensure_ascii=False), encoding="utf-8")
+    return manifest
+
+
+def verify(model_path: Path, output_dir: Path, texts: List[str]) -> Dict[str, object]:
+    """Compare scores and load time of the exported artifact with the joblib pipeline."""
+
+    started = time.perf_counter()
+    pipeline = joblib.load(model_path)
+    joblib_load_ms = (time.perf_counter() - started) * 1000
+    started = time.perf_counter()
+    adapter = LinearAdapter(output_dir)
+    linear_load_ms = (time.perf_counter() - started) * 1000
+
+    expected = pipeline.predict_proba(texts)
+    actual = adapter.predict_proba(texts)
+    mapped = LinearAdapter(output_dir, mmap=True).predict_proba(texts)
+    return {
+        "rows": len(texts),
+        "max_abs_diff": float(np.abs(expected - actual).max()) if len(texts) else 0.0,
+        "mmap_max_abs_diff": float(np.abs(expected - mapped).max()) if len(texts) else 0.0,
+        "label_agreement": float(np.mean(expected.argmax(axis=1) == actual.argmax(axis=1))),
+        "joblib_load_ms": round(joblib_load_ms, 3),
+        "linear_load_ms": round(linear_load_ms, 3),
+        "joblib_size_bytes": model_path.stat().st_size,
+        "linear_size_bytes": sum(path.stat().st_size for path in output_dir.iterdir() if path.is_file()),
+    }
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--model", type=Path, default=MODEL_PATH)
+    parser.add_argument("--output-dir", type=Path, default=OUTPUT_DIR)
+    parser.add_argument("--data", type=Path, default=DATA_PATH, help="CSV used for the parity check")
+    return parser.parse_args()
+
+
+def main() -> None:
+    args = parse_args()
+    manifest = export_linear(args.model, args.output_dir)
+    texts = pd.read_csv(args.data)["text"].astype(str).tolist() if args.data.exists() else []
+    summary = verify(args.model, args.output_dir, texts)
+
+    metadata_path = args.model.with_name("metadata.json")
+    metadata = {}
+    if metadata_path.exists():
+        metadata = json.loads(metadata_path.read_text(encoding="utf-8"))
+    metadata.update(
+        {
+            "model_path": str(args.output_dir),
+            "classes": manifest["classes"],
+            "linear_export": summary,
+        }
+    )
+    (args.output_dir / "metadata.json").write_text(json.dumps(metadata, indent=2, ensure_ascii=False), encoding="utf-8")
+    print(json.dumps(summary, indent=2, ensure_ascii=False))
+    print(f"\nLinear artifact saved to {args.output_dir}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,104 @@
+"""Export a fine-tuned transformer to ONNX for CPU serving with ONNX Runtime."""
+from __future__ import annotations
+
+import argparse
+import json
+from pathlib import Path
+from typing import Dict, List
+
+import numpy as np
+import torch
+from transformers import AutoModelForSequenceClassification, AutoTokenizer
+
+MODEL_DIR = Path("models/transformer")
+ONNX_FILENAME = "model.onnx"
+SAMPLE_TEXTS = [
+    "Спасибо за оперативную помощь, вопрос решили за день!",
+    "Приложение постоянно вылетает, невозможно воспользоваться услугой.",
+    "Обычный сервис",
+]
+
+
+class _LogitsOnly(torch.nn.Module):
+    """Wrap the classifier so the graph has a single ``logits`` output."""
+
+    def __init__(self, model: torch.nn.Module, input_names: List[str]) -> None:
+        super().__init__()
+        self.model = model
+        self.input_names = input_names
+
+    def forward(self, *inputs: torch.Tensor) -> torch.Tensor:
+        return self.model(**dict(zip(self.input_names, inputs))).logits
+
+
+def export_onnx(model_dir: Path, output_path: Path | None = None, opset: int = 14) -> Dict[str, object]:
+    output_path = output_path or model_dir / ONNX_FILENAME
+    tokenizer = AutoTokenizer.from_pretrained(model_dir)
+    model = AutoModelForSequenceClassification.from_pretrained(model_dir)
+    model.eval()
+
+    sample = tokenizer(SAMPLE_TEXTS, truncation=True, padding=True, return_tensors="pt")
+    input_names = [name for name in ("input_ids", "attention_mask", "token_type_ids") if name in sample]
+    dynamic_axes = {name: {0: "batch", 1: "sequence"} for name in input_names}
+    dynamic_axes["logits"] = {0: "batch"}
+
+    with torch.no_grad():
+        torch.onnx.export(
+            _LogitsOnly(model, input_names),
+            tuple(sample[name] for name in input_names),
+            str(output_path),
+            input_names=input_names,
+            output_names=["logits"],
+            dynamic_axes=dynamic_axes,
+            opset_version=opset,
+        )
+        reference = model(**{name: sample[name] for name in input_names}).logits.numpy()
+
+    if output_path.parent != Path(model_dir):
+        tokenizer.save_pretrained(output_path.parent)
+        model.config.save_pretrained(output_path.parent)
+
+    return {
+        "onnx_path": str(output_path),
+        "opset": opset,
+        "inputs": input_names,
+        "max_abs_diff": _max_abs_diff(output_path, sample, input_names, reference),
+    }
+
+
+def _max_abs_diff(output_path: Path, sample, input_names: List[str], reference: np.ndarray) -> float:
+    try:
+        import onnxruntime
+    except ImportError:  # pragma: no cover - verification is optional
+        return float("nan")
+    session = onnxruntime.InferenceSession(str(output_path), providers=["CPUExecutionProvider"])
+    feeds = {name: sample[name].numpy().astype(np.int64) for name in input_names}
+    (logits,) = session.run(["logits"], feeds)
+    return float(np.abs(logits - reference).max())
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--model-dir", type=Path, default=MODEL_DIR)
+    parser.add_argument(
+        "--output",
+        type=Path,
+        help="Where to write the graph (defaults to <model-dir>/model.onnx)",
+    )
+    parser.add_argument("--opset", type=int, default=14)
+    return parser.parse_args()
+
+
+def main() -> None:
+    args = parse_args()
+    summary = export_onnx(args.model_dir, args.output, args.opset)
+    metadata_path = Path(summary["onnx_path"]).parent / "metadata.json"
+    if metadata_path.exists():
+        metadata = json.loads(metadata_path.read_text(encoding="utf-8"))
+        metadata["onnx"] = summary
+        metadata_path.write_text(json.dumps(metadata, indent=2, ensure_ascii=False), encoding="utf-8")
+    print(json.dumps(summary, indent=2, ensure_ascii=False))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,79 @@
+"""Produce a dynamic int8 quantized copy of the fine-tuned transformer."""
+from __future__ import annotations
+
+import argparse
+import json
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Dict
+
+import torch
+from transformers import AutoModelForSequenceClassification, AutoTokenizer
+
+SOURCE_DIR = Path("models/transformer")
+OUTPUT_DIR = Path("models/transformer-int8")
+QUANTIZED_WEIGHTS = "quantized_model.pt"
+
+
+def _dir_size(path: Path) -> int:
+    return sum(item.stat().st_size for item in path.iterdir() if item.is_file())
+
+
+def quantize_transformer(source_dir: Path, output_dir: Path) -> Dict[str, object]:
+    tokenizer = AutoTokenizer.from_pretrained(source_dir)
+    model = AutoModelForSequenceClassification.from_pretrained(source_dir)
+    model.eval()
+    quantized = torch.quantization.quantize_dynamic(model, {torch.nn.Linear}, dtype=torch.qint8)
+
+    output_dir.mkdir(parents=True, exist_ok=True)
+    torch.save(quantized.state_dict(), output_dir / QUANTIZED_WEIGHTS)
+    model.config.save_pretrained(output_dir)
+    tokenizer.save_pretrained(output_dir)
+
+    source_metadata_path = source_dir / "metadata.json"
+    metadata: Dict[str, object] = {}
+    if source_metadata_path.exists():
+        metadata = json.loads(source_metadata_path.read_text(encoding="utf-8"))
+    metadata.update(
+        {
+            "model_type": "transformer",
+            "model_path": str(output_dir),
+            "model_dir": str(output_dir),
+            "classes": metadata.get("classes") or list(model.config.id2label.values()),
+            "quantization": {
+                "method": "dynamic",
+                "dtype": "qint8",
+                "modules": ["torch.nn.Linear"],
+                "source_model_dir": str(source_dir),
+                "source_size_bytes": _dir_size(source_dir),
+                "quantized_size_bytes": _dir_size(output_dir),
+                "created_at": datetime.now(timezone.utc).isoformat(),
+            },
+        }
+    )
+    (output_dir / "metadata.json").write_text(json.dumps(metadata, indent=2, ensure_ascii=False), encoding="utf-8")
+    return metadata
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--source-dir", type=Path, default=SOURCE_DIR)
+    parser.add_argument("--output-dir", type=Path, default=OUTPUT_DIR)
+    return parser.parse_args()
+
+
+def main() -> None:
+    args = parse_args()
+    if args.source_dir.resolve() == args.output_dir.resolve():
+        raise ValueError("--output-dir must differ from --source-dir")
+    metadata = quantize_transformer(args.source_dir, args.output_dir)
+    print(json.dumps(metadata["quantization"], indent=2, ensure_ascii=False))
+    print(f"\nQuantized model saved to {args.output_dir}")
+    print(
+        "Compare with the fp32 model: PYTHONPATH=. python ml/evaluate.py "
+        f"--model {args.output_dir} --compare-model {args.source_dir} --no-save"
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -1,15 +1,21 @@
-"""Train a simple TF-IDF + Logistic Regression sentiment classifier."""
+"""Train a simple TF-IDF + Logistic Regression sentiment classifier.
+
+``--vectorizer hashing`` swaps the bigram vocabulary for feature hashing
+(``HashingVectorizer`` + ``TfidfTransformer``), which bounds the artifact size
+and per-worker memory by ``--n-features`` regardless of corpus size.
+"""
 from __future__ import annotations
 
 import argparse
 import json
+import time
 from pathlib import Path
-from typing import Tuple
+from typing import Dict, Tuple
 
 import joblib
 import numpy as np
 import pandas as pd
-from sklearn.feature_extraction.text import TfidfVectorizer
+from sklearn.feature_extraction.text import HashingVectorizer, TfidfTransformer, TfidfVectorizer
 from sklearn.linear_model import LogisticRegression
 from sklearn.metrics import classification_report
 from sklearn.model_selection import train_test_split
@@ -19,6 +25,8 @@ DATA_PATH = Path("data/sample_reviews.csv")
 MODEL_DIR = Path("models")
 MODEL_PATH = MODEL_DIR / "baseline.joblib"
 METADATA_PATH = MODEL_DIR / "metadata.json"
+VECTORIZERS = ("tfidf", "hashing")
+DEFAULT_N_FEATURES = 2**18
 
 
 def load_dataset(path: Path) -> Tuple[pd.Series, pd.Series]:
@@ -30,7 +38,30 @@ def load_dataset(path: Path) -> Tuple[pd.Series, pd.Series]:
     return df["text"], df["label"]
 
 
-def build_pipeline() -> Pipeline:
+def build_pipeline(vectorizer: str = "tfidf", n_features: int = DEFAULT_N_FEATURES) -> Pipeline:
+    classifier = LogisticRegression(
+        max_iter=1000,
+        multi_class="auto",
+        class_weight="balanced",
+    )
+    if vectorizer == "hashing":
+        return Pipeline(
+            steps=[
+                (
+                    "hashing",
+                    HashingVectorizer(
+                        ngram_range=(1, 2),
+                        n_features=n_features,
+                        alternate_sign=False,
+                        norm=None,
+                    ),
+                ),
+                ("tfidf", TfidfTransformer(sublinear_tf=True)),
+                ("clf", classifier),
+            ]
+        )
+    if vectorizer != "tfidf":
+        raise ValueError(f"Unknown vectorizer {vectorizer!r}, expected one of {VECTORIZERS}")
     return Pipeline(
         steps=[
             (
@@ -42,20 +73,37 @@ def build_pipeline() -> Pipeline:
                     sublinear_tf=True,
                 ),
             ),
-            (
-                "clf",
-                LogisticRegression(
-                    max_iter=1000,
-                    multi_class="auto",
-                    class_weight="balanced",
-                ),
-            ),
+            ("clf", classifier),
         ]
     )
 
 
-def train(test_size: float = 0.2, random_state: int = 42) -> None:
-    texts, labels = load_dataset(DATA_PATH)
+def feature_stats(pipeline: Pipeline) -> Dict[str, int]:
+    """Feature-space size of a fitted pipeline.
+
+    For the hashing variant ``vocabulary_size`` counts hashed columns that got
+    a non-zero weight, i.e. the buckets the training corpus actually used.
+    """
+
+    coef = pipeline.named_steps["clf"].coef_
+    if "hashing" in pipeline.named_steps:
+        return {
+            "n_features": int(coef.shape[1]),
+            "vocabulary_size": int((coef != 0).any(axis=0).sum()),
+        }
+    vocabulary = pipeline.named_steps["tfidf"].vocabulary_
+    return {"n_features": len(vocabulary), "vocabulary_size": len(vocabulary)}
+
+
+def train(
+    test_size: float = 0.2,
+    random_state: int = 42,
+    vectorizer: str = "tfidf",
+    n_features: int = DEFAULT_N_FEATURES,
+    data_path: Path = DATA_PATH,
+    model_path: Path = MODEL_PATH,
+) -> Dict[str, object]:
+    texts, labels = load_dataset(data_path)
     X_train, X_test, y_train, y_test = train_test_split(
         texts,
         labels,
@@ -64,8 +112,10 @@ def train(test_size: float = 0.2, random_state: int = 42) -> None:
         stratify=labels,
     )
 
-    pipeline = build_pipeline()
+    pipeline = build_pipeline(vectorizer, n_features)
+    started = time.perf_counter()
     pipeline.fit(X_train, y_train)
+    fit_seconds = time.perf_counter() - started
 
     y_pred = pipeline.predict(X_test)
     report_dict = classification_report(
@@ -77,30 +127,57 @@ def train(test_size: float = 0.2, random_state: int = 42) -> None:
     print("Classification report:\n")
     print(classification_report(y_test, y_pred, digits=4))
 
-    MODEL_DIR.mkdir(exist_ok=True)
-    joblib.dump(pipeline, MODEL_PATH)
+    model_path.parent.mkdir(parents=True, exist_ok=True)
+    # Uncompressed on purpose: SentimentModel memory-maps the arrays inside.
+    joblib.dump(pipeline, model_path)
 
     metadata = {
-        "model_path": str(MODEL_PATH),
+        "model_path": str(model_path),
         "algorithm": "LogisticRegression",
-        "vectorizer": "TfidfVectorizer",
+        "vectorizer": "HashingVectorizer+TfidfTransformer" if vectorizer == "hashing" else "TfidfVectorizer",
         "classes": sorted(labels.unique().tolist()),
         "test_size": test_size,
         "random_state": random_state,
         "metrics": report_dict,
+        **feature_stats(pipeline),
+        "artifact_size_bytes": model_path.stat().st_size,
+        "fit_seconds": round(fit_seconds, 3),
     }
-    METADATA_PATH.write_text(json.dumps(metadata, indent=2, ensure_ascii=False))
-    print(f"\nModel saved to {MODEL_PATH}")
-    print(f"Metadata saved to {METADATA_PATH}")
+    metadata_path = model_path.with_name("metadata.json")
+    metadata_path.write_text(json.dumps(metadata, indent=2, ensure_ascii=False), encoding="utf-8")
+    print(f"\nModel saved to {model_path}")
+    print(f"Metadata saved to {metadata_path}")
+    return metadata
 
 
 def parse_args() -> argparse.Namespace:
     parser = argparse.ArgumentParser(description=__doc__)
     parser.add_argument("--test-size", type=float, default=0.2)
     parser.add_argument("--random-state", type=int, default=42)
+    parser.add_argument("--vectorizer", choices=VECTORIZERS, default="tfidf")
+    parser.add_argument(
+        "--n-features",
+        type=int,
+        default=DEFAULT_N_FEATURES,
+        help="Number of hashed feature columns for --vectorizer hashing",
+    )
+    parser.add_argument("--data", type=Path, default=DATA_PATH)
+    parser.add_argument(
+        "--model-path",
+        type=Path,
+        default=MODEL_PATH,
+        help="Where to save the pipeline; metadata.json is written next to it",
+    )
     return parser.parse_args()
 
 
 if __name__ == "__main__":
     args = parse_args()
-    train(test_size=args.test_size, random_state=args.random_state)
+    train(
+        test_size=args.test_size,
+        random_state=args.random_state,
+        vectorizer=args.vectorizer,
+        n_features=args.n_features,
+        data_path=args.data,
+        model_path=args.model_path,
+    )
@@ -0,0 +1,73 @@
+import threading
+import unittest
+from typing import List
+
+from backend.app.batching import MicroBatcher
+
+
+class MicroBatcherTests(unittest.TestCase):
+    def test_concurrent_requests_are_coalesced(self) -> None:
+        calls: List[List[str]] = []
+
+        def handler(items: List[str]) -> List[str]:
+            calls.append(list(items))
+            return [item.upper() for item in items]
+
+        batcher = MicroBatcher(handler, max_batch_size=8, max_wait_ms=50)
+        try:
+            futures = [batcher.submit(f"text-{idx}") for idx in range(8)]
+            results = [future.result(timeout=2) for future in futures]
+        finally:
+            batcher.close()
+
+        self.assertEqual(results, [f"TEXT-{idx}" for idx in range(8)])
+        self.assertEqual(len(calls), 1)
+        snapshot = batcher.snapshot()
+        self.assertEqual(snapshot["batches"], 1)
+        self.assertEqual(snapshot["items"], 8)
+        self.assertEqual(snapshot["batch_size_histogram"], {"8": 1})
+        self.assertEqual(snapshot["queue_depth"], 0)
+
+    def test_batch_size_is_bounded(self) -> None:
+        sizes: List[int] = []
+        lock = threading.Lock()
+
+        def handler(items: List[int]) -> List[int]:
+            with lock:
+                sizes.append(len(items))
+            return [item * 2 for item in items]
+
+        batcher = MicroBatcher(handler, max_batch_size=3, max_wait_ms=20)
+        try:
+            futures = [batcher.submit(idx) for idx in range(10)]
+            results = [future.result(timeout=2) for future in futures]
+        finally:
+            batcher.close()
+
+        self.assertEqual(results, [idx * 2 for idx in range(10)])
+        self.assertTrue(all(size <= 3 for size in sizes))
+        self.assertEqual(sum(sizes), 10)
+
+    def test_handler_errors_reach_every_caller(self) -> None:
+        def handler(items: List[str]) -> List[str]:
+            raise ValueError("boom")
+
+        batcher = MicroBatcher(handler, max_batch_size=4, max_wait_ms=10)
+        try:
+            futures = [batcher.submit("a"), batcher.submit("b")]
+            for future in futures:
+                with self.assertRaises(ValueError):
+                    future.result(timeout=2)
+        finally:
+            batcher.close()
+
+    def test_closed_batcher_rejects_new_items(self) -> None:
+        batcher = MicroBatcher(lambda items: items, max_batch_size=2, max_wait_ms=0)
+        self.assertEqual(batcher("ok"), "ok")
+        batcher.close()
+        with self.assertRaises(RuntimeError):
+            batcher.submit("late")
+
+
+if __name__ == "__main__":
+    unittest.main()
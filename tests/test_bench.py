@@ -0,0 +1,43 @@
+import unittest
+
+from backend.app.cache import normalize_text
+from bench.suite import compare, measure, percentile
+from bench.textgen import generate_texts
+
+
+class TextGeneratorTests(unittest.TestCase):
+    def test_duplicates_and_lengths(self) -> None:
+        texts = generate_texts(1000, mean_words=10, distribution="lognormal", duplicate_ratio=0.4, seed=1)
+
+        self.assertEqual(len(texts), 1000)
+        self.assertEqual(texts, generate_texts(1000, mean_words=10, duplicate_ratio=0.4, seed=1))
+        unique = len({normalize_text(text) for text in texts})
+        self.assertAlmostEqual(unique / len(texts), 0.6, delta=0.02)
+        lengths = [len(text.split()) for text in texts]
+        self.assertLess(min(lengths), 10)
+        self.assertGreater(max(lengths), 20)
+        self.assertEqual({len(text.split()) for text in generate_texts(50, mean_words=7, distribution="fixed")}, {7})
+
+
+class CompareTests(unittest.TestCase):
+    def test_percentile_and_measure(self) -> None:
+        self.assertEqual(percentile([1, 2, 3, 4], 50), 2)
+        self.assertEqual(percentile([1, 2, 3, 4], 99), 4)
+        stats = measure(len, [[1, 2], [3]], [2, 1], repeat=2)
+        self.assertEqual((stats["calls"], stats["texts"]), (4, 6))
+
+    def test_regressions_are_flagged(self) -> None:
+        def run(rate, p95):
+            return {"results": {"model": {"adapter": "LinearAdapter", "classify": {"texts_per_sec": rate, "p95_ms": p95}}}}
+
+        rows = compare(run(800.0, 1.0), run(1000.0, 1.05), threshold=0.1)
+
+        by_metric = {row["metric"]: row for row in rows}
+        self.assertEqual(set(by_metric), {"texts_per_sec", "p95_ms"})
+        self.assertEqual(by_metric["texts_per_sec"]["measurement"], "model.classify")
+        self.assertTrue(by_metric["texts_per_sec"]["regression"])
+        self.assertFalse(by_metric["p95_ms"]["regression"])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,140 @@
+import importlib.util
+import time
+import unittest
+import uuid
+from pathlib import Path
+from tempfile import TemporaryDirectory
+from typing import List
+from unittest import mock
+
+from backend.app.cache import PredictionCache, normalize_text
+from backend.app.model import SentimentModel
+
+HAS_APP = all(importlib.util.find_spec(name) is not None for name in ("fastapi", "httpx", "pandas"))
+
+
+class PredictionCacheTests(unittest.TestCase):
+    def test_lru_eviction_and_counters(self) -> None:
+        cache = PredictionCache(max_size=2)
+        cache.bind("model-a")
+        for text in ("один", "два", "три"):
+            cache.put(cache.key(text), {"label": "neutral", "scores": {"neutral": 1.0}})
+
+        self.assertIsNone(cache.get(cache.key("один")))
+        self.assertIsNotNone(cache.get(cache.key("три")))
+        snapshot = cache.snapshot()
+        self.assertEqual(snapshot["size"], 2)
+        self.assertEqual(snapshot["evictions"], 1)
+        self.assertEqual(snapshot["hits"], 1)
+        self.assertEqual(snapshot["misses"], 1)
+
+    def test_key_uses_normalized_text(self) -> None:
+        cache = PredictionCache()
+        self.assertEqual(normalize_text("  Всё   плохо\n"), "Всё плохо")
+        self.assertEqual(cache.key("Всё  плохо "), cache.key("Всё плохо"))
+
+    def test_ttl_expires_entries(self) -> None:
+        cache = PredictionCache(ttl_seconds=0.01)
+        key = cache.key("текст")
+        cache.put(key, {"label": "neutral", "scores": {"neutral": 1.0}})
+        time.sleep(0.02)
+        self.assertIsNone(cache.get(key))
+        self.assertEqual(cache.snapshot()["expirations"], 1)
+
+    def test_bind_to_other_model_drops_entries(self) -> None:
+        cache = PredictionCache()
+        cache.bind("model-a")
+        cache.put(cache.key("текст"), {"label": "neutral", "scores": {"neutral": 1.0}})
+        cache.bind("model-b")
+        self.assertEqual(cache.snapshot()["size"], 0)
+        self.assertEqual(cache.snapshot()["invalidations"], 1)
+
+    def test_late_writes_from_replaced_model_are_dropped(self) -> None:
+        cache = PredictionCache()
+        cache.bind("model-a")
+        old_key = cache.key("текст", "model-a")
+        cache.bind("model-b")
+        cache.put(old_key, {"label": "neutral", "scores": {"neutral": 1.0}})
+        cache.put(cache.key("текст", "model-b"), {"label": "positive", "scores": {"positive": 1.0}})
+
+        self.assertEqual(cache.snapshot()["size"], 1)
+        self.assertIsNone(cache.get(old_key))
+        self.assertEqual(cache.get(cache.key("текст"))["label"], "positive")
+
+
+class CachedSentimentModelTests(unittest.TestCase):
+    def test_batch_sends_only_misses_to_adapter(self) -> None:
+        cache = PredictionCache()
+        model = SentimentModel(Path("missing_model.joblib"), cache=cache)
+        seen: List[List[str]] = []
+        original = model.adapter.predict_proba
+
+        def spy(texts):
+            seen.append(list(texts))
+            return original(texts)
+
+        model.adapter.predict_proba = spy  # type: ignore[method-assign]
+        first = model.classify("Спасибо, всё удобно")
+        outputs = model.classify_batch(["Спасибо, всё удобно", "Приложение вылетает"])
+
+        self.assertEqual(seen, [["Спасибо, всё удобно"], ["Приложение вылетает"]])
+        self.assertEqual(outputs[0], first)
+        self.assertEqual(outputs[1]["label"], "negative")
+
+    def test_score_matrix_matches_batch_dicts(self) -> None:
+        model = SentimentModel(Path("missing_model.joblib"), cache=PredictionCache())
+        texts = ["Спасибо, всё удобно", "Приложение вылетает", "Спасибо,  всё удобно"]
+        model.classify(texts[1])
+
+        label_ids, scores = model.score_texts(texts)
+        expected = model.classify_batch(texts)
+
+        self.assertEqual([model.labels[idx] for idx in label_ids], [item["label"] for item in expected])
+        for row, item in zip(list(scores), expected):
+            self.assertEqual(dict(zip(model.labels, map(float, row))), item["scores"])
+
+    def test_new_model_artifact_invalidates_cache(self) -> None:
+        with TemporaryDirectory() as tmp:
+            path = Path(tmp) / "model.joblib"
+            cache = PredictionCache()
+            SentimentModel(path, cache=cache).classify("текст")
+            fingerprint = cache.fingerprint
+            path.write_bytes(b"not a model")
+            SentimentModel(path, cache=cache)
+            self.assertNotEqual(cache.fingerprint, fingerprint)
+            self.assertEqual(cache.snapshot()["size"], 0)
+
+
+@unittest.skipUnless(HAS_APP, "fastapi/httpx/pandas are not installed")
+class CachedPredictEndpointTests(unittest.TestCase):
+    def test_cache_hit_skips_batching_window(self) -> None:
+        from fastapi.testclient import TestClient
+
+        from backend.app import main
+        from backend.app.stats import StatsTracker
+
+        text = f"Спасибо, всё удобно {uuid.uuid4().hex}"
+        with TemporaryDirectory() as tmp, mock.patch.multiple(
+            main.settings,
+            jobs_dir=Path(tmp),
+            inference_workers=0,
+            model_watch_interval=0.0,
+            predict_batching=True,
+            batch_max_wait_ms=500.0,
+        ), mock.patch.object(main, "stats_tracker", StatsTracker()):
+            with TestClient(main.app) as client:
+                first = client.post("/predict", json={"text": text}).json()
+                before = main.prediction_cache.snapshot()
+                started = time.perf_counter()
+                second = client.post("/predict", json={"text": text}).json()
+                elapsed = time.perf_counter() - started
+                after = main.prediction_cache.snapshot()
+
+        self.assertEqual(second, first)
+        self.assertLess(elapsed, 0.4)
+        self.assertEqual(after["hits"] - before["hits"], 1)
+        self.assertEqual(after["misses"], before["misses"])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,65 @@
+import importlib.util
+import unittest
+from pathlib import Path
+
+from backend.app.model import BaseAdapter, KeywordFallbackAdapter, SentimentModel
+
+HAS_NUMPY = importlib.util.find_spec("numpy") is not None
+
+
+class FixedAdapter(BaseAdapter):
+    """Returns canned rows per text and remembers what it was asked to score."""
+
+    def __init__(self, classes, rows) -> None:
+        self.classes_ = classes
+        self.rows = rows
+        self.calls = []
+
+    def predict_proba(self, texts):
+        texts = list(texts)
+        self.calls.append(texts)
+        return [self.rows[text] for text in texts]
+
+
+@unittest.skipUnless(HAS_NUMPY, "numpy is not installed")
+class CascadeAdapterTests(unittest.TestCase):
+    def test_only_uncertain_rows_are_escalated_in_one_batch(self) -> None:
+        from backend.app.model import CascadeAdapter
+
+        primary = FixedAdapter(
+            ["negative", "neutral", "positive"],
+            {"easy": [0.05, 0.05, 0.9], "hard": [0.4, 0.3, 0.3], "unsure": [0.3, 0.4, 0.3]},
+        )
+        # Different column order: the cascade must map labels, not positions.
+        fallback = FixedAdapter(
+            ["positive", "negative", "neutral"],
+            {"hard": [0.1, 0.1, 0.8], "unsure": [0.7, 0.2, 0.1]},
+        )
+        cascade = CascadeAdapter(primary, fallback, threshold=0.8)
+
+        labels = cascade.predict(["easy", "hard", "unsure"])
+
+        self.assertEqual(labels, ["positive", "neutral", "positive"])
+        self.assertEqual(fallback.calls, [["hard", "unsure"]])
+        snapshot = cascade.snapshot()
+        self.assertEqual(snapshot["rows"], 3)
+        self.assertEqual(snapshot["escalated"], 2)
+        self.assertAlmostEqual(snapshot["escalation_rate"], 2 / 3)
+
+    def test_mismatched_label_sets_are_rejected(self) -> None:
+        from backend.app.model import CascadeAdapter
+
+        with self.assertRaises(ValueError):
+            CascadeAdapter(FixedAdapter(["neg", "pos"], {}), FixedAdapter(["negative", "positive"], {}))
+
+    def test_missing_cascade_artifact_keeps_single_adapter(self) -> None:
+        model = SentimentModel(
+            Path("missing_cascade_baseline.joblib"),
+            cascade_path=Path("missing_cascade_transformer"),
+        )
+
+        self.assertIsInstance(model.adapter, KeywordFallbackAdapter)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,150 @@
+import asyncio
+import importlib.util
+import tempfile
+import threading
+import time
+import unittest
+from pathlib import Path
+from unittest import mock
+
+from backend.app.executor import BlockingExecutor
+
+HAS_APP = all(importlib.util.find_spec(name) is not None for name in ("fastapi", "httpx", "pandas"))
+
+
+class BlockingExecutorTests(unittest.TestCase):
+    def test_calls_beyond_max_workers_queue_and_report_wait(self) -> None:
+        executor = BlockingExecutor(max_workers=1, name="test-blocking")
+        release = threading.Event()
+        depths = []
+
+        async def scenario():
+            first = asyncio.ensure_future(executor.run(release.wait, 5))
+            second = asyncio.ensure_future(executor.run(lambda: "done"))
+            await asyncio.sleep(0.05)
+            depths.append(executor.snapshot()["queue_depth"])
+            release.set()
+            return await first, await second
+
+        try:
+            self.assertEqual(asyncio.run(scenario()), (True, "done"))
+        finally:
+            executor.close()
+
+        snapshot = executor.snapshot()
+        self.assertEqual(depths, [1])
+        self.assertEqual(snapshot["queue_depth"], 0)
+        self.assertEqual(snapshot["completed"], 2)
+        self.assertGreaterEqual(snapshot["max_wait_ms"], 40)
+
+    def test_iterate_advances_iterator_on_pool_and_closes_it(self) -> None:
+        executor = BlockingExecutor(max_workers=1, name="test-iterate")
+        threads = []
+        closed = []
+
+        def produce():
+            try:
+                for item in range(5):
+                    threads.append(threading.current_thread().name)
+                    yield item
+            finally:
+                closed.append(True)
+
+        async def take_two():
+            items = []
+            stream = executor.iterate(produce())
+            async for item in stream:
+                items.append(item)
+                if len(items) == 2:
+                    break
+            await stream.aclose()
+            return items
+
+        try:
+            self.assertEqual(asyncio.run(take_two()), [0, 1])
+        finally:
+            executor.close()
+
+        self.assertTrue(all(name.startswith("test-iterate") for name in threads))
+        self.assertEqual(closed, [True])
+
+
+class SlowModel:
+    """Stands in for a model whose batch inference takes a second."""
+
+    labels = ["negative", "positive"]
+
+    def __init__(self, seconds: float) -> None:
+        self.seconds = seconds
+        self.started = threading.Event()
+        self.threads = []
+
+    def classify_batch(self, texts, scorer=None):
+        self.threads.append(threading.current_thread().name)
+        self.started.set()
+        time.sleep(self.seconds)
+        return [{"label": "positive", "scores": {"negative": 0.1, "positive": 0.9}} for _ in texts]
+
+
+@unittest.skipUnless(HAS_APP, "fastapi/httpx/pandas are not installed")
+class EventLoopTests(unittest.TestCase):
+    def test_health_latency_stays_flat_during_large_upload(self) -> None:
+        from fastapi.testclient import TestClient
+
+        from backend.app import main
+        from backend.app.stats import StatsTracker
+
+        slow = SlowModel(seconds=1.0)
+        upload = "text\n" + "\n".join(f"отзыв {i}" for i in range(800)) + "\n"
+        with tempfile.TemporaryDirectory() as tmp, mock.patch.multiple(
+            main.settings, jobs_dir=Path(tmp), inference_workers=0, model_watch_interval=0.0
+        ), mock.patch.object(main, "stats_tracker", StatsTracker()):
+            with TestClient(main.app) as client:
+                baseline = [self._timed(client.get, "/health") for _ in range(5)]
+                with mock.patch.object(main, "sentiment_model", slow):
+                    responses = []
+                    uploader = threading.Thread(
+                        target=lambda: responses.append(
+                            client.post("/predict_file", files={"file": ("big.csv", upload, "text/csv")})
+                        )
+                    )
+                    uploader.start()
+                    self.assertTrue(slow.started.wait(5))
+                    during = [self._timed(client.get, "/health") for _ in range(5)]
+                    uploader.join(10)
+                runtime = client.get("/runtime").json()
+
+        self.assertEqual(responses[0].status_code, 200)
+        self.assertEqual(responses[0].json()["summary"]["processed_rows"], 800)
+        # Blocking inside the handler would hold /health for the whole second.
+        self.assertLess(max(during), max(baseline) + 0.25)
+        self.assertEqual(runtime["executor"]["completed"], 1)
+
+    def test_stream_chunks_are_classified_on_blocking_executor(self) -> None:
+        from fastapi.testclient import TestClient
+
+        from backend.app import main
+        from backend.app.stats import StatsTracker
+
+        slow = SlowModel(seconds=0.0)
+        upload = "text\n" + "\n".join(f"отзыв {i}" for i in range(30)) + "\n"
+        with tempfile.TemporaryDirectory() as tmp, mock.patch.multiple(
+            main.settings, jobs_dir=Path(tmp), inference_workers=0, model_watch_interval=0.0, stream_chunk_size=10
+        ), mock.patch.object(main, "stats_tracker", StatsTracker()):
+            with TestClient(main.app) as client, mock.patch.object(main, "sentiment_model", slow):
+                response = client.post("/predict_file/stream", files={"file": ("rows.csv", upload, "text/csv")})
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(len(response.text.splitlines()), 31)
+        self.assertEqual(len(slow.threads), 3)
+        self.assertTrue(all(name.startswith("blocking-io") for name in slow.threads))
+
+    @staticmethod
+    def _timed(call, path) -> float:
+        started = time.perf_counter()
+        call(path).raise_for_status()
+        return time.perf_counter() - started
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,146 @@
+import importlib.util
+import io
+import json
+import tempfile
+import threading
+import time
+import unittest
+from pathlib import Path
+from types import SimpleNamespace
+
+HAS_PANDAS = importlib.util.find_spec("pandas") is not None
+
+MODEL = SimpleNamespace(labels=["negative", "positive"])
+
+
+def fake_classify(model, texts):
+    return [
+        {"label": "positive" if "good" in text else "negative", "scores": {"negative": 0.3, "positive": 0.7}}
+        for text in texts
+    ]
+
+
+def upload(rows: int) -> io.BytesIO:
+    lines = ["id,text"] + [f"{i},{'good' if i % 2 else 'bad'} {i}" for i in range(rows)]
+    return io.BytesIO(("\n".join(lines) + "\n").encode("utf-8"))
+
+
+@unittest.skipUnless(HAS_PANDAS, "pandas is not installed")
+class JobManagerTests(unittest.TestCase):
+    def setUp(self) -> None:
+        self.tmp = tempfile.TemporaryDirectory()
+        self.jobs_dir = Path(self.tmp.name)
+        self.managers = []
+
+    def tearDown(self) -> None:
+        for manager in self.managers:
+            manager.close()
+        self.tmp.cleanup()
+
+    def manager(self, classify=fake_classify, **kwargs):
+        from backend.app.jobs import JobManager
+
+        manager = JobManager(self.jobs_dir, lambda: MODEL, classify, chunk_size=3, **kwargs)
+        self.managers.append(manager)
+        return manager
+
+    def wait(self, manager, job_id, status="completed"):
+        deadline = time.monotonic() + 10
+        while time.monotonic() < deadline:
+            job = manager.get(job_id)
+            if job["status"] == status:
+                return job
+            time.sleep(0.01)
+        self.fail(f"job {job_id} stuck in {manager.get(job_id)['status']}")
+
+    def read_ndjson(self, manager, job_id):
+        return [json.loads(line) for line in manager.result_path(job_id).read_text(encoding="utf-8").splitlines()]
+
+    def test_job_scores_file_in_chunks_and_writes_results(self) -> None:
+        manager = self.manager()
+        created = manager.create(upload(10), "reviews.csv", "csv")
+        job = self.wait(manager, created["id"])
+
+        self.assertEqual(job["rows_total"], 10)
+        self.assertEqual(job["rows_done"], 10)
+        self.assertEqual(job["chunks_done"], 4)
+        self.assertEqual(job["class_counts"], {"negative": 5, "positive": 5})
+        self.assertIsNone(job["eta_seconds"])
+        lines = manager.result_path(created["id"]).read_text(encoding="utf-8").splitlines()
+        self.assertEqual(lines[0], "row,text,label,score_negative,score_positive")
+        self.assertEqual(len(lines), 12)  # header, 10 rows, summary row
+        self.assertTrue(lines[-1].startswith(',"{'))
+
+    def test_upload_without_text_column_is_rejected(self) -> None:
+        from backend.app.jobs import JobError
+
+        manager = self.manager()
+        with self.assertRaises(JobError):
+            manager.create(io.BytesIO(b"id,comment\n1,hello\n"), "bad.csv")
+        self.assertEqual(manager.list(), [])
+        self.assertEqual(list(self.jobs_dir.iterdir()), [])
+
+    def test_interrupted_job_resumes_from_last_completed_chunk(self) -> None:
+        reached = threading.Event()
+        release = threading.Event()
+        calls = []
+
+        def blocking_classify(model, texts):
+            calls.append(texts)
+            if len(calls) == 2:
+                reached.set()
+                release.wait(5)
+            return fake_classify(model, texts)
+
+        first = self.manager(blocking_classify)
+        job_id = first.create(upload(10), "reviews.csv")["id"]
+        self.assertTrue(reached.wait(5))
+        stopper = threading.Thread(target=first.close)
+        stopper.start()
+        release.set()
+        stopper.join(5)
+
+        state = first.get(job_id)
+        self.assertEqual(state["status"], "queued")
+        self.assertEqual(state["chunks_done"], 2)
+        # A chunk that was half-written when the process died must not survive.
+        with first.result_path(job_id).open("ab") as results:
+            results.write(b'{"row": 6, "text": "partial')
+
+        resumed_calls = []
+        second = self.manager(lambda model, texts: resumed_calls.append(texts) or fake_classify(model, texts))
+        self.assertEqual(second.resume(), 1)
+        job = self.wait(second, job_id)
+
+        self.assertEqual([len(texts) for texts in resumed_calls], [3, 1])
+        records = self.read_ndjson(second, job_id)
+        self.assertEqual([record["row"] for record in records[:-1]], list(range(10)))
+        self.assertEqual(records[-1]["summary"]["processed_rows"], 10)
+        # Texts of the chunks finished before the restart are counted too.
+        self.assertEqual(records[-1]["summary"]["unique_texts"], 10)
+        self.assertEqual(job["processed_rows"], 10)
+
+    def test_concurrent_jobs_are_bounded(self) -> None:
+        lock = threading.Lock()
+        active = [0]
+        peak = [0]
+
+        def tracking_classify(model, texts):
+            with lock:
+                active[0] += 1
+                peak[0] = max(peak[0], active[0])
+            time.sleep(0.01)
+            with lock:
+                active[0] -= 1
+            return fake_classify(model, texts)
+
+        manager = self.manager(tracking_classify, max_concurrent=2)
+        job_ids = [manager.create(upload(6), f"file{i}.csv")["id"] for i in range(5)]
+        for job_id in job_ids:
+            self.wait(manager, job_id)
+
+        self.assertEqual(peak[0], 2)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,52 @@
+import unittest
+from pathlib import Path
+from tempfile import TemporaryDirectory
+
+from backend.app.keywords import KeywordMatcher, load_keywords
+from backend.app.model import SentimentModel
+
+
+class KeywordMatcherTests(unittest.TestCase):
+    def test_finds_overlapping_keywords_in_one_pass(self) -> None:
+        matcher = KeywordMatcher(
+            {"toxic": ["грязн", "тварь"], "negative": ["ужас", "ужасно"]}, scan_threshold=0
+        )
+        hits = matcher.find("Ужасно грязная ТВАРЬ")
+        self.assertEqual(hits["toxic"], {"грязн", "тварь"})
+        self.assertEqual(hits["negative"], {"ужас", "ужасно"})
+        self.assertTrue(matcher.contains("это тварь", "toxic"))
+        self.assertFalse(matcher.contains("это ужас", "toxic"))
+
+    def test_substring_scan_and_automaton_agree(self) -> None:
+        words = {"toxic": ["сдох", "пошел на х", "идиот"], "negative": ["плохо"]}
+        small = KeywordMatcher(words)
+        automaton = KeywordMatcher(words, scan_threshold=0)
+        self.assertFalse(small.use_automaton)
+        self.assertTrue(automaton.use_automaton)
+        for text in ("Пошел на хутор, идиот", "всё плохо", "Спасибо", ""):
+            self.assertEqual(small.find(text), automaton.find(text))
+
+    def test_fallback_and_guardrail_share_one_matcher(self) -> None:
+        model = SentimentModel(Path("missing_model.joblib"))
+
+        self.assertIs(model.adapter.matcher, model._keyword_matcher)
+        self.assertEqual(set(model._keyword_matcher.categories), {"toxic", "positive", "negative"})
+        self.assertEqual(model.classify("Спасибо, всё удобно")["label"], "positive")
+        self.assertEqual(model.classify("Спасибо, тварь")["label"], "negative")
+
+
+class KeywordFilesTests(unittest.TestCase):
+    def test_dictionaries_are_extended_from_files(self) -> None:
+        with TemporaryDirectory() as tmp:
+            keywords_dir = Path(tmp)
+            (keywords_dir / "toxic.txt").write_text("# словарь\nнегодяй\n\n", encoding="utf-8")
+            (keywords_dir / "positive.txt").write_text("восторг\n", encoding="utf-8")
+            self.assertEqual(load_keywords(keywords_dir / "toxic.txt"), ["негодяй"])
+
+            model = SentimentModel(Path("missing_model.joblib"), keywords_dir=keywords_dir)
+            self.assertEqual(model.classify("Какой негодяй это сделал")["label"], "negative")
+            self.assertEqual(model.classify("Просто восторг")["label"], "positive")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,134 @@
+import importlib.util
+import unittest
+from pathlib import Path
+from tempfile import TemporaryDirectory
+
+HAS_SKLEARN = all(
+    importlib.util.find_spec(name) is not None for name in ("sklearn", "joblib", "numpy", "pandas")
+)
+
+CORPUS = [
+    "Спасибо за оперативную помощь, всё удобно",
+    "Приложение постоянно вылетает, ужас",
+    "Обычный день, ничего особенного",
+    "Очень нравится новый портал, спасибо",
+    "Плохо работает поддержка, никто не отвечает",
+    "Подал заявление, жду ответа",
+]
+LABELS = ["positive", "negative", "neutral", "positive", "negative", "neutral"]
+PROBES = CORPUS + [
+    "",
+    "совершенно незнакомые слова",
+    "СПАСИБО СПАСИБО спасибо за помощь",
+    "вылетает вылетает, плохо плохо плохо",
+]
+
+
+@unittest.skipUnless(HAS_SKLEARN, "scikit-learn is not installed")
+class LinearAdapterTests(unittest.TestCase):
+    def _export(self, tmp: Path, pipeline) -> Path:
+        import joblib
+
+        from ml.export_linear import export_linear
+
+        model_path = tmp / "baseline.joblib"
+        joblib.dump(pipeline, model_path)
+        export_linear(model_path, tmp / "baseline-linear")
+        return tmp / "baseline-linear"
+
+    def assert_matches_pipeline(self, pipeline, labels=LABELS) -> None:
+        import numpy as np
+
+        from backend.app.model import LinearAdapter
+
+        pipeline.fit(CORPUS, labels)
+        with TemporaryDirectory() as tmp:
+            model_dir = self._export(Path(tmp), pipeline)
+            adapter = LinearAdapter(model_dir)
+            mapped = LinearAdapter(model_dir, mmap=True)
+            mapped_proba = mapped.predict_proba(PROBES)
+            del mapped
+
+        self.assertEqual(adapter.classes_, list(pipeline.classes_))
+        np.testing.assert_allclose(
+            adapter.predict_proba(PROBES), pipeline.predict_proba(PROBES), rtol=0, atol=1e-12
+        )
+        np.testing.assert_array_equal(mapped_proba, adapter.predict_proba(PROBES))
+        self.assertEqual(adapter.predict(PROBES), list(pipeline.predict(PROBES)))
+
+    def test_matches_baseline_pipeline(self) -> None:
+        from ml.train_baseline import build_pipeline
+
+        self.assert_matches_pipeline(build_pipeline())
+
+    def test_matches_binary_and_plain_tf_variants(self) -> None:
+        from sklearn.feature_extraction.text import TfidfVectorizer
+        from sklearn.linear_model import LogisticRegression
+        from sklearn.pipeline import Pipeline
+
+        pipeline = Pipeline(
+            [
+                ("tfidf", TfidfVectorizer(ngram_range=(1, 3), norm="l1", stop_words=["за", "не"])),
+                ("clf", LogisticRegression()),
+            ]
+        )
+        binary_labels = ["positive" if label == "positive" else "other" for label in LABELS]
+        self.assert_matches_pipeline(pipeline, binary_labels)
+
+    def test_mapped_vocabulary_lookup(self) -> None:
+        from backend.app.model import MappedVocabulary
+
+        vocabulary = {"спасибо": 0, "плохо работает": 1, "ok": 2}
+        with TemporaryDirectory() as tmp:
+            MappedVocabulary.save(Path(tmp), vocabulary)
+            mapped = MappedVocabulary(Path(tmp))
+            found = mapped.lookup(["ok", "нет", "плохо работает", "спасибо", "спасиб"])
+            self.assertEqual(dict(mapped.items()), vocabulary)
+            del mapped
+
+        self.assertEqual(found, [2, -1, 1, 0, -1])
+
+    def test_sentiment_model_prefers_linear_artifact(self) -> None:
+        from backend.app.model import LinearAdapter, SentimentModel
+        from ml.train_baseline import build_pipeline
+
+        pipeline = build_pipeline().fit(CORPUS, LABELS)
+        with TemporaryDirectory() as tmp:
+            model = SentimentModel(self._export(Path(tmp), pipeline))
+            self.assertIsInstance(model.adapter, LinearAdapter)
+            result = model.classify(CORPUS[1])
+
+        self.assertEqual(result["label"], pipeline.predict([CORPUS[1]])[0])
+
+    def test_rejects_other_manifest_versions(self) -> None:
+        import json
+
+        from backend.app.model import LINEAR_MANIFEST, LinearAdapter
+        from ml.train_baseline import build_pipeline
+
+        with TemporaryDirectory() as tmp:
+            model_dir = self._export(Path(tmp), build_pipeline().fit(CORPUS, LABELS))
+            manifest = json.loads((model_dir / LINEAR_MANIFEST).read_text(encoding="utf-8"))
+            manifest["version"] = 1
+            (model_dir / LINEAR_MANIFEST).write_text(json.dumps(manifest), encoding="utf-8")
+            with self.assertRaisesRegex(ValueError, "version 1"):
+                LinearAdapter(model_dir)
+
+    def test_broken_linear_artifact_falls_back_to_joblib(self) -> None:
+        from backend.app.model import LINEAR_MANIFEST, JoblibAdapter, SentimentModel
+        from ml.train_baseline import build_pipeline
+
+        pipeline = build_pipeline().fit(CORPUS, LABELS)
+        with TemporaryDirectory() as tmp:
+            model_dir = self._export(Path(tmp), pipeline)
+            (model_dir / LINEAR_MANIFEST).write_text("{", encoding="utf-8")
+            with self.assertLogs("backend.app.model", level="ERROR"):
+                model = SentimentModel(model_dir, fallback_path=Path(tmp) / "baseline.joblib")
+            self.assertIsInstance(model.adapter, JoblibAdapter)
+            result = model.classify(CORPUS[1])
+
+        self.assertEqual(result["label"], pipeline.predict([CORPUS[1]])[0])
+
+
+if __name__ == "__main__":
+    unittest.main()
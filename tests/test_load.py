@@ -0,0 +1,98 @@
+import asyncio
+import importlib.util
+import tempfile
+import unittest
+from pathlib import Path
+from unittest import mock
+
+from bench.load import Flow, LoadRunner, Phase, Slo, parse_slo, saturation
+
+HAS_APP = all(importlib.util.find_spec(name) is not None for name in ("fastapi", "httpx", "pandas"))
+
+
+class SloTests(unittest.TestCase):
+    def test_parse_and_check(self) -> None:
+        self.assertEqual(
+            parse_slo(["predict:p95=80,errors=0.001", "stats:p99=200"]),
+            {"predict": {"p95_ms": 80.0, "error_rate": 0.001}, "stats": {"p99_ms": 200.0}},
+        )
+        stats = {"requests": 100, "p95_ms": 90.0, "p99_ms": 150.0, "error_rate": 0.02}
+        self.assertEqual(
+            Slo(p95_ms=80.0, p99_ms=200.0, error_rate=0.01).violations(stats),
+            ["p95_ms 90.0 > 80.0", "error_rate 0.02 > 0.01"],
+        )
+
+    def test_drops_and_stragglers_count_as_errors(self) -> None:
+        class StuckClient:
+            async def request(self, method, path, **kwargs):
+                await asyncio.sleep(3600)
+
+        phase = Phase(
+            "stuck",
+            [
+                Flow("slow", "GET", "/slow", rate=100.0, slo=Slo(p95_ms=None)),
+                Flow("rare", "GET", "/rare", rate=1e-6, slo=Slo(p95_ms=50.0)),
+            ],
+        )
+        runner = LoadRunner(StuckClient(), max_inflight=1, seed=1)
+        report = asyncio.run(runner.run_phase(phase, duration=0.2, drain_timeout=0.05))
+
+        slow = report["flows"]["slow"]
+        self.assertEqual(slow["errors"], {"cancelled": 1})
+        self.assertGreater(slow["dropped"], 0)
+        self.assertEqual(slow["error_rate"], 1.0)
+        self.assertEqual(slow["slo_violations"], ["error_rate 1.0 > 0.01"])
+        self.assertEqual(report["flows"]["rare"]["requests"], 0)
+        self.assertIsNone(report["flows"]["rare"]["slo_violations"])
+        self.assertEqual(runner._tasks, set())
+
+    def test_saturation_point(self) -> None:
+        points = [
+            {"concurrency": 1, "throughput_rps": 100.0},
+            {"concurrency": 4, "throughput_rps": 350.0},
+            {"concurrency": 16, "throughput_rps": 370.0},
+            {"concurrency": 64, "throughput_rps": 360.0},
+        ]
+        self.assertEqual(saturation(points), 4)
+        self.assertIsNone(saturation(points[:2]))
+
+
+@unittest.skipUnless(HAS_APP, "fastapi/httpx/pandas are not installed")
+class LoadRunnerTests(unittest.TestCase):
+    def test_mixed_flows_against_the_app(self) -> None:
+        import httpx
+
+        from backend.app import main
+        from backend.app.stats import StatsTracker
+
+        phase = Phase(
+            "smoke",
+            [
+                Flow("predict", "POST", "/predict", lambda rng: {"json": {"text": "Спасибо"}}, rate=50.0),
+                Flow("stats", "GET", "/stats", users=3, interval=0.2, slo=Slo(p95_ms=10_000.0)),
+                Flow("missing", "GET", "/jobs/missing", users=1, think=0.05),
+            ],
+        )
+
+        async def scenario():
+            transport = httpx.ASGITransport(app=main.app)
+            async with main.app.router.lifespan_context(main.app):
+                async with httpx.AsyncClient(transport=transport, base_url="http://load") as client:
+                    return await LoadRunner(client, seed=1).run_phase(phase, duration=0.6)
+
+        with tempfile.TemporaryDirectory() as tmp, mock.patch.multiple(
+            main.settings, jobs_dir=Path(tmp), inference_workers=0, model_watch_interval=0.0
+        ), mock.patch.object(main, "stats_tracker", StatsTracker()):
+            report = asyncio.run(scenario())
+
+        flows = report["flows"]
+        self.assertGreater(flows["predict"]["requests"], 5)
+        self.assertEqual(flows["predict"]["error_rate"], 0.0)
+        self.assertEqual(flows["stats"]["requests"], 9)
+        self.assertEqual(flows["stats"]["slo_violations"], [])
+        self.assertEqual(flows["missing"]["error_rate"], 1.0)
+        self.assertEqual(set(flows["missing"]["errors"]), {"404"})
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,68 @@
+import importlib.util
+import tempfile
+import unittest
+from pathlib import Path
+from unittest import mock
+
+from backend.app.metrics import MetricsRegistry
+
+HAS_APP = all(importlib.util.find_spec(name) is not None for name in ("fastapi", "httpx", "pandas"))
+
+
+class MetricsRegistryTests(unittest.TestCase):
+    def test_histogram_buckets_are_cumulative(self) -> None:
+        registry = MetricsRegistry()
+        histogram = registry.histogram("demo_seconds", "Demo.", ["stage"], buckets=(0.1, 1.0))
+        for value in (0.05, 0.5, 0.7, 3.0):
+            histogram.observe(value, "infer")
+
+        lines = registry.render().splitlines()
+
+        self.assertIn("# TYPE demo_seconds histogram", lines)
+        self.assertIn('demo_seconds_bucket{stage="infer",le="0.1"} 1', lines)
+        self.assertIn('demo_seconds_bucket{stage="infer",le="1.0"} 3', lines)
+        self.assertIn('demo_seconds_bucket{stage="infer",le="+Inf"} 4', lines)
+        self.assertIn('demo_seconds_count{stage="infer"} 4', lines)
+
+    def test_counters_and_gauges(self) -> None:
+        registry = MetricsRegistry()
+        registry.counter("demo_total", "Demo.", ["route"]).inc('/say "hi"', amount=2)
+        registry.gauge("demo_depth", "Depth.", lambda: {("batcher",): 3, ("jobs",): None}, ["queue"])
+        registry.gauge("demo_missing", "Not started yet.", lambda: None)
+
+        text = registry.render()
+
+        self.assertIn('demo_total{route="/say \\"hi\\""} 2', text)
+        self.assertIn('demo_depth{queue="batcher"} 3.0', text)
+        self.assertNotIn("jobs", text)
+        self.assertNotIn("demo_missing", text)
+
+
+@unittest.skipUnless(HAS_APP, "fastapi/httpx/pandas are not installed")
+class MetricsEndpointTests(unittest.TestCase):
+    def test_requests_and_stages_are_exposed(self) -> None:
+        from fastapi.testclient import TestClient
+
+        from backend.app import main
+        from backend.app.stats import StatsTracker
+
+        with tempfile.TemporaryDirectory() as tmp, mock.patch.multiple(
+            main.settings, jobs_dir=Path(tmp), inference_workers=0, model_watch_interval=0.0
+        ), mock.patch.object(main, "stats_tracker", StatsTracker(history_path=Path(tmp) / "history.jsonl")):
+            with TestClient(main.app) as client:
+                client.post("/predict_batch", json={"texts": ["Спасибо", "Плохо"]}).raise_for_status()
+                client.get("/jobs/missing")
+                response = client.get("/metrics")
+
+        self.assertTrue(response.headers["content-type"].startswith("text/plain; version=0.0.4"))
+        text = response.text
+        self.assertIn('mlweb_http_requests_total{method="POST",route="/predict_batch",status="200"}', text)
+        self.assertIn('mlweb_http_requests_total{method="GET",route="/jobs/{job_id}",status="404"}', text)
+        for name in ("parse", "infer", "postprocess", "persist", "serialize"):
+            self.assertIn(f'mlweb_stage_seconds_count{{stage="{name}"}}', text)
+        self.assertIn("mlweb_model_load_ms", text)
+        self.assertIn('mlweb_queue_depth{queue="batcher"}', text)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -30,6 +30,37 @@ class SentimentModelTests(unittest.TestCase):
         self.assertEqual(result["label"], "negative")
         self.assertGreaterEqual(result["scores"]["negative"], 0.9)
 
+    def test_score_batch_returns_label_indices_and_matrix(self) -> None:
+        model = SentimentModel(Path("missing_again.joblib"))
+        texts = ["Спасибо, всё удобно", "ты грязная тварь", "Обычный день"]
+        label_ids, scores = model.score_batch(texts)
+
+        self.assertEqual(len(label_ids), len(texts))
+        negative_idx = model.labels.index("negative")
+        self.assertEqual(label_ids[1], negative_idx)
+        self.assertAlmostEqual(float(scores[1][negative_idx]), 0.98)
+        expected = [item["label"] for item in model.classify_batch(texts)]
+        self.assertEqual([model.labels[idx] for idx in label_ids], expected)
+
+    def test_duplicate_texts_are_scored_once(self) -> None:
+        model = SentimentModel(Path("missing_dedup.joblib"))
+        seen = []
+        original = model.adapter.predict_proba
+
+        def spy(texts):
+            seen.append(list(texts))
+            return original(texts)
+
+        model.adapter.predict_proba = spy  # type: ignore[method-assign]
+        texts = ["Спасибо", "Проблемы с входом", "  Спасибо ", "Спасибо", "Проблемы  с входом"]
+        outputs = model.classify_batch(texts)
+
+        self.assertEqual(seen, [["Спасибо", "Проблемы с входом"]])
+        self.assertEqual(len(outputs), len(texts))
+        self.assertEqual(outputs[0], outputs[2])
+        self.assertEqual(outputs[1], outputs[4])
+        self.assertEqual(outputs[3]["label"], outputs[0]["label"])
+
 
 if __name__ == "__main__":
     unittest.main()
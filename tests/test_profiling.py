@@ -0,0 +1,129 @@
+import importlib.util
+import os
+import tempfile
+import unittest
+import uuid
+from pathlib import Path
+from unittest import mock
+
+from backend.app.metrics import server_timing
+from backend.app.profiling import ProfileSession, profiled, prune_profiles
+
+HAS_APP = all(importlib.util.find_spec(name) is not None for name in ("fastapi", "httpx", "pandas"))
+
+
+def _timings(header: str) -> dict:
+    entries = {}
+    for entry in header.split(", "):
+        name, *params = entry.split(";")
+        entries[name] = dict(param.split("=", 1) for param in params)
+    return entries
+
+
+class ServerTimingTests(unittest.TestCase):
+    def test_header_format(self) -> None:
+        header = server_timing({"parse": 0.0015, "postprocess": 0.0002}, total=0.004)
+
+        self.assertEqual(
+            header, 'parse;dur=1.500, postprocess;desc="guardrails";dur=0.200, total;dur=4.000'
+        )
+
+    def test_profiled_is_a_plain_call_without_session(self) -> None:
+        self.assertEqual(profiled(sum, [1, 2]), 3)
+
+    def test_session_merges_and_saves(self) -> None:
+        session = ProfileSession("unit")
+        session.run(sorted, range(1000))
+        session.run(lambda: session.run(sum, range(10)))  # nested call is not profiled twice
+
+        with tempfile.TemporaryDirectory() as tmp:
+            path = session.save(Path(tmp))
+            self.assertTrue(path.is_file())
+            self.assertIn("function calls", path.with_suffix(".txt").read_text(encoding="utf-8"))
+
+    def test_only_newest_profiles_are_kept(self) -> None:
+        with tempfile.TemporaryDirectory() as tmp:
+            directory = Path(tmp)
+            for age, name in enumerate(["new", "middle", "old"]):
+                session = ProfileSession(name)
+                session.run(sum, range(10))
+                path = session.save(directory)
+                os.utime(path, (1_000_000 - age, 1_000_000 - age))
+
+            self.assertEqual(prune_profiles(directory, keep=2), 1)
+            self.assertEqual(sorted(path.name for path in directory.iterdir()), [
+                "middle.prof", "middle.txt", "new.prof", "new.txt"
+            ])
+
+
+@unittest.skipUnless(HAS_APP, "fastapi/httpx/pandas are not installed")
+class RequestTimingTests(unittest.TestCase):
+    def _client(self, tmp: str, **overrides):
+        from fastapi.testclient import TestClient
+
+        from backend.app import main
+        from backend.app.stats import StatsTracker
+
+        patches = [
+            mock.patch.multiple(
+                main.settings,
+                jobs_dir=Path(tmp) / "jobs",
+                profile_dir=Path(tmp) / "profiles",
+                inference_workers=0,
+                model_watch_interval=0.0,
+                **overrides,
+            ),
+            mock.patch.object(main, "stats_tracker", StatsTracker(history_path=Path(tmp) / "history.jsonl")),
+        ]
+        for patch in patches:
+            patch.start()
+            self.addCleanup(patch.stop)
+        return TestClient(main.app)
+
+    def test_prediction_endpoints_report_stages(self) -> None:
+        tag = uuid.uuid4().hex  # the module-level prediction cache may know the texts from other tests
+        with tempfile.TemporaryDirectory() as tmp, self._client(tmp) as client:
+            batch = client.post("/predict_batch", json={"texts": [f"Спасибо {tag}", f"Плохо {tag}"]})
+            upload = client.post(
+                "/predict_file", files={"file": ("r.csv", f"text\nОтлично {tag}\n".encode("utf-8"), "text/csv")}
+            )
+            single = client.post("/predict", json={"text": f"Всё хорошо {tag}"})
+
+        for response, stages in (
+            (batch, {"parse", "infer", "postprocess", "persist", "serialize", "total"}),
+            (upload, {"decode", "parse", "infer", "persist", "total"}),
+            (single, {"batch", "persist", "total"}),
+        ):
+            self.assertEqual(response.status_code, 200)
+            entries = _timings(response.headers["server-timing"])
+            self.assertTrue(stages <= set(entries), (stages, entries))
+            self.assertGreaterEqual(float(entries["total"]["dur"]), float(entries["persist"]["dur"]))
+
+    def test_profile_is_opt_in_and_downloadable(self) -> None:
+        with tempfile.TemporaryDirectory() as tmp:
+            with self._client(tmp) as client:
+                ignored = client.post("/predict_batch?profile=1", json={"texts": ["Спасибо"]})
+            self.assertNotIn("x-profile-id", ignored.headers)
+
+            with self._client(tmp, profile_requests=True, admin_token="secret") as client:
+                no_token = client.post("/predict?profile=1", json={"text": "Спасибо"})
+                response = client.post(
+                    "/predict_batch", json={"texts": ["Спасибо"]}, headers={"X-Profile": "1", "X-Admin-Token": "secret"}
+                )
+                profile_id = response.headers["x-profile-id"]
+                summary = client.get(
+                    f"/admin/profiles/{profile_id}", params={"format": "txt"}, headers={"X-Admin-Token": "secret"}
+                )
+                forbidden = client.get(f"/admin/profiles/{profile_id}")
+                missing = client.get("/admin/profiles/..%2Fsecret", headers={"X-Admin-Token": "secret"})
+
+            self.assertNotIn("x-profile-id", no_token.headers)
+            self.assertTrue((Path(tmp) / "profiles" / f"{profile_id}.prof").is_file())
+            self.assertEqual(summary.status_code, 200)
+            self.assertIn("classify_batch", summary.text)
+            self.assertEqual(forbidden.status_code, 403)
+            self.assertEqual(missing.status_code, 404)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,128 @@
+import asyncio
+import importlib.util
+import json
+import tempfile
+import unittest
+from pathlib import Path
+from unittest import mock
+
+from starlette.websockets import WebSocketDisconnect
+
+from backend.app.realtime import StreamSession, StreamStats
+
+HAS_APP = all(importlib.util.find_spec(name) is not None for name in ("fastapi", "httpx", "pandas"))
+
+
+class FakeWebSocket:
+    """Feeds canned messages; disconnects once every expected reply is sent."""
+
+    def __init__(self, messages, expected_replies) -> None:
+        self.messages = list(messages)
+        self.expected_replies = expected_replies
+        self.sent = []
+        self.drained = asyncio.Event()
+
+    async def accept(self) -> None:
+        pass
+
+    async def receive_text(self) -> str:
+        if self.messages:
+            return self.messages.pop(0)
+        await self.drained.wait()
+        raise WebSocketDisconnect()
+
+    async def send_text(self, data: str) -> None:
+        self.sent.append(json.loads(data))
+        if len(self.sent) >= self.expected_replies:
+            self.drained.set()
+
+
+class StreamSessionTests(unittest.TestCase):
+    def test_inflight_texts_are_bounded(self) -> None:
+        inflight = []
+        peak = []
+
+        async def submit(texts):
+            inflight.extend(texts)
+            peak.append(len(inflight))
+            await asyncio.sleep(0.01)
+            for text in texts:
+                inflight.remove(text)
+            return [{"label": "positive", "scores": {"positive": 1.0}} for _ in texts]
+
+        messages = [json.dumps({"id": idx, "text": f"текст {idx}"}) for idx in range(20)]
+        messages.append(json.dumps({"items": [{"id": "a", "text": "x"}, {"id": "b", "text": " "}]}))
+        websocket = FakeWebSocket(messages, expected_replies=22)
+        stats = StreamStats()
+
+        asyncio.run(StreamSession(websocket, submit, max_inflight=4, stats=stats).run())
+
+        self.assertLessEqual(max(peak), 4)
+        self.assertEqual(sorted(str(reply["id"]) for reply in websocket.sent if "label" in reply), sorted(
+            [str(idx) for idx in range(20)] + ["a"]
+        ))
+        self.assertEqual([reply["id"] for reply in websocket.sent if "error" in reply], ["b"])
+        snapshot = stats.snapshot()
+        self.assertEqual(snapshot["received"], 22)
+        self.assertEqual(snapshot["active"], 0)
+        self.assertGreater(snapshot["throttled"], 0)
+
+    def test_error_replies_are_bounded_when_client_stops_reading(self) -> None:
+        read = []
+
+        class StalledWebSocket(FakeWebSocket):
+            async def receive_text(self) -> str:
+                read.append(1)
+                await asyncio.sleep(0)
+                return "not json"
+
+            async def send_text(self, data: str) -> None:
+                await asyncio.Event().wait()  # the client never reads its replies
+
+        async def submit(texts):  # pragma: no cover - only invalid messages are sent
+            raise AssertionError(texts)
+
+        session = StreamSession(StalledWebSocket([], expected_replies=0), submit, max_inflight=4)
+
+        async def scenario():
+            with self.assertRaises(asyncio.TimeoutError):
+                await asyncio.wait_for(session.run(), timeout=0.1)
+
+        asyncio.run(scenario())
+
+        self.assertLessEqual(len(read), 5)
+        self.assertLessEqual(session._outbox.qsize(), 4)
+
+
+@unittest.skipUnless(HAS_APP, "fastapi/httpx/pandas are not installed")
+class WebSocketEndpointTests(unittest.TestCase):
+    def test_results_are_tagged_with_client_ids(self) -> None:
+        from fastapi.testclient import TestClient
+
+        from backend.app import main
+        from backend.app.stats import StatsTracker
+
+        tracker = StatsTracker()
+        with tempfile.TemporaryDirectory() as tmp, mock.patch.multiple(
+            main.settings, jobs_dir=Path(tmp), inference_workers=0, model_watch_interval=0.0
+        ), mock.patch.object(main, "stats_tracker", tracker):
+            with TestClient(main.app) as client:
+                with client.websocket_connect("/ws/predict") as websocket:
+                    websocket.send_json({"id": "one", "text": "Спасибо, всё удобно"})
+                    websocket.send_json({"items": [{"id": 2, "text": "Приложение вылетает"}, {"id": 3, "text": ""}]})
+                    websocket.send_text("not json")
+                    replies = [websocket.receive_json() for _ in range(4)]
+                runtime = client.get("/runtime").json()
+
+        by_id = {reply["id"]: reply for reply in replies}
+        self.assertEqual(set(by_id), {"one", 2, 3, None})
+        self.assertIn("label", by_id["one"])
+        self.assertEqual(by_id[2]["label"], "negative")
+        self.assertIn("error", by_id[3])
+        self.assertIn("error", by_id[None])
+        self.assertEqual(tracker.snapshot()["total_predictions"], 2)
+        self.assertEqual(runtime["websocket"]["sent"], 2)
+
+
+if __name__ == "__main__":
+    unittest.main()
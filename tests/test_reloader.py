@@ -0,0 +1,72 @@
+import time
+import unittest
+from pathlib import Path
+from tempfile import TemporaryDirectory
+
+from backend.app.model import SentimentModel, artifact_signature
+from backend.app.reloader import ModelReloader
+
+
+class ModelReloaderTests(unittest.TestCase):
+    def test_reload_swaps_in_a_warmed_up_model(self) -> None:
+        current = {"model": SentimentModel(Path("missing_reload_model.joblib"))}
+
+        def build() -> SentimentModel:
+            model = SentimentModel(Path("missing_reload_model.joblib"))
+            model.warmup()
+            return model
+
+        reloader = ModelReloader(build, lambda model: current.update(model=model))
+        old = current["model"]
+
+        self.assertTrue(reloader.reload())
+        reloader.wait(5)
+
+        self.assertIsNot(current["model"], old)
+        self.assertIsNotNone(current["model"].warmup_ms)
+        self.assertGreaterEqual(current["model"].load_time_ms, 0)
+        status = reloader.status()
+        self.assertEqual(status["reloads"], 1)
+        self.assertFalse(status["in_progress"])
+
+    def test_failed_build_keeps_current_model(self) -> None:
+        swapped = []
+
+        def build() -> SentimentModel:
+            raise RuntimeError("corrupted artifact")
+
+        reloader = ModelReloader(build, swapped.append)
+        reloader.reload()
+        reloader.wait(5)
+
+        self.assertEqual(swapped, [])
+        status = reloader.status()
+        self.assertEqual(status["failures"], 1)
+        self.assertEqual(status["last_error"], "corrupted artifact")
+
+    def test_watcher_reloads_after_artifact_changes(self) -> None:
+        with TemporaryDirectory() as tmp:
+            artifact = Path(tmp) / "baseline.joblib"
+            artifact.write_text("v1")
+            swapped = []
+            reloader = ModelReloader(
+                lambda: "model",
+                swapped.append,
+                signature=lambda: artifact_signature([artifact]),
+                poll_interval=0.01,
+            )
+            reloader.start_watching()
+            try:
+                artifact.write_text("version 2")
+                deadline = time.monotonic() + 5
+                while not swapped and time.monotonic() < deadline:
+                    time.sleep(0.01)
+            finally:
+                reloader.close()
+
+        self.assertEqual(swapped, ["model"])
+        self.assertEqual(reloader.status()["reloads"], 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
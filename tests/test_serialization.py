@@ -0,0 +1,91 @@
+import importlib.util
+import json
+import unittest
+
+from backend.app.schemas import BatchPredictRequest, BatchPredictResponse
+from backend.app.serialization import (
+    COMPACT_JSON,
+    JSON,
+    MSGPACK,
+    NotAcceptable,
+    RequestValidationFailed,
+    encode_predictions,
+    encode_scores,
+    negotiate,
+    parse_texts,
+)
+
+HAS_MSGPACK = importlib.util.find_spec("msgpack") is not None
+HAS_NUMPY = importlib.util.find_spec("numpy") is not None
+
+LABELS = ["negative", "neutral", "positive"]
+PREDICTIONS = [
+    {"label": "positive", "scores": {"negative": 0.1, "neutral": 0.2, "positive": 0.7}},
+    {"label": "negative", "scores": {"positive": 0.05, "negative": 0.9, "neutral": 0.05}},
+]
+
+
+class ParseTextsTests(unittest.TestCase):
+    def test_valid_body_matches_pydantic(self) -> None:
+        body = json.dumps({"texts": ["  Спасибо ", "Плохо"]}, ensure_ascii=False).encode("utf-8")
+
+        self.assertEqual(parse_texts(body), BatchPredictRequest.parse_raw(body).texts)
+
+    def test_invalid_items_are_reported_by_index(self) -> None:
+        body = json.dumps({"texts": ["ok", "   ", "x" * 2001]}).encode("utf-8")
+
+        with self.assertRaises(RequestValidationFailed) as ctx:
+            parse_texts(body)
+
+        self.assertEqual([error["loc"] for error in ctx.exception.errors], [["body", "texts", 1], ["body", "texts", 2]])
+
+    def test_malformed_body_is_rejected(self) -> None:
+        for body in (b"{bad", b'{"text": "one"}', b'{"texts": ["ok", 5]}'):
+            with self.subTest(body=body), self.assertRaises(RequestValidationFailed):
+                parse_texts(body)
+
+
+class EncodingTests(unittest.TestCase):
+    def test_negotiation(self) -> None:
+        self.assertEqual(negotiate(None), JSON)
+        self.assertEqual(negotiate("text/html, */*;q=0.8"), JSON)
+        self.assertEqual(negotiate(f"{JSON};q=0.5, {COMPACT_JSON}"), COMPACT_JSON)
+        with self.assertRaises(NotAcceptable):
+            negotiate("text/html")
+
+    def test_json_matches_response_model(self) -> None:
+        payload = json.loads(encode_predictions(PREDICTIONS, LABELS))
+
+        self.assertEqual(payload, BatchPredictResponse(predictions=PREDICTIONS).dict())
+
+    def test_compact_json_uses_label_order(self) -> None:
+        payload = json.loads(encode_predictions(PREDICTIONS, LABELS, COMPACT_JSON, extra={"rows": [3, 7]}))
+
+        self.assertEqual(payload["labels"], LABELS)
+        self.assertEqual(payload["label_ids"], [2, 0])
+        self.assertEqual(payload["rows"], [3, 7])
+        self.assertEqual(payload["scores"][1], [0.9, 0.05, 0.05])
+
+    @unittest.skipUnless(HAS_NUMPY, "numpy is not installed")
+    def test_compact_json_from_score_matrix(self) -> None:
+        import numpy as np
+
+        scores = np.array([[0.1, 0.2, 0.7], [0.9, 0.05, 0.05]])
+        payload = json.loads(encode_scores([2, 0], scores, LABELS, COMPACT_JSON))
+
+        self.assertEqual(payload, json.loads(encode_predictions(PREDICTIONS, LABELS, COMPACT_JSON)))
+
+    @unittest.skipUnless(HAS_MSGPACK and HAS_NUMPY, "msgpack/numpy are not installed")
+    def test_msgpack_scores_are_float32_bytes(self) -> None:
+        import msgpack
+        import numpy as np
+
+        payload = msgpack.unpackb(encode_predictions(PREDICTIONS, LABELS, MSGPACK))
+        scores = np.frombuffer(payload["scores"], dtype="<f4").reshape(payload["shape"])
+
+        self.assertEqual(payload["label_ids"], [2, 0])
+        np.testing.assert_allclose(scores[0], [0.1, 0.2, 0.7], rtol=1e-6)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,61 @@
+import importlib.util
+import subprocess
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+from unittest import mock
+
+from backend.app.startup import StartupReport, optional_import, startup_report
+
+HAS_APP = all(importlib.util.find_spec(name) is not None for name in ("fastapi", "httpx", "pandas"))
+
+
+class StartupTests(unittest.TestCase):
+    def test_model_module_does_not_import_heavy_backends(self) -> None:
+        code = (
+            "import sys, backend.app.model;"
+            "print(','.join(m for m in ('torch', 'transformers', 'onnxruntime', 'joblib') if m in sys.modules))"
+        )
+        output = subprocess.run(
+            [sys.executable, "-c", code], capture_output=True, text=True, check=True
+        ).stdout.strip()
+
+        self.assertEqual(output, "")
+
+    def test_optional_import_records_first_import_only(self) -> None:
+        sys.modules.pop("colorsys", None)
+        module = optional_import("colorsys")
+
+        self.assertIsNotNone(module)
+        self.assertIs(optional_import("colorsys"), module)
+        self.assertIn("colorsys", startup_report.snapshot()["imports"])
+        self.assertIsNone(optional_import("definitely_not_installed_module"))
+
+    def test_stage_context_manager_records_elapsed_ms(self) -> None:
+        report = StartupReport()
+        with report.stage("model_load"):
+            pass
+
+        self.assertGreaterEqual(report.snapshot()["stages"]["model_load"], 0)
+
+
+@unittest.skipUnless(HAS_APP, "fastapi/httpx/pandas are not installed")
+class StartupEndpointTests(unittest.TestCase):
+    def test_startup_phases_are_reported(self) -> None:
+        from fastapi.testclient import TestClient
+
+        from backend.app import main
+        from backend.app.stats import StatsTracker
+
+        with tempfile.TemporaryDirectory() as tmp, mock.patch.multiple(
+            main.settings, jobs_dir=Path(tmp), inference_workers=1, model_watch_interval=0.0
+        ), mock.patch.object(main, "stats_tracker", StatsTracker()):
+            with TestClient(main.app) as client:
+                stages = client.get("/runtime/startup").json()["stages"]
+
+        self.assertTrue({"model_load", "first_inference", "inference_pool", "jobs_resume", "startup_hooks"} <= set(stages))
+
+
+if __name__ == "__main__":
+    unittest.main()
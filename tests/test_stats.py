@@ -1,9 +1,13 @@
 import json
+import threading
 import unittest
 from pathlib import Path
 from tempfile import TemporaryDirectory
+from unittest import mock
 
-from backend.app.stats import StatsTracker
+from backend.app.stats import HistoryWriter, StatsTracker
+
+SCORES = {"negative": 0.1, "neutral": 0.1, "positive": 0.8}
 
 
 class StatsTrackerTests(unittest.TestCase):
@@ -40,6 +44,68 @@ class StatsTrackerTests(unittest.TestCase):
         self.assertEqual(len(snapshot["recent_predictions"]), 1)
         self.assertEqual(snapshot["recent_predictions"][0]["label"], "positive")
 
+    def test_record_many_matches_record(self) -> None:
+        tracker = StatsTracker(max_history=3, history_path=self.history_path)
+        tracker.record_many([("один", "positive", SCORES), ("два", "negative", SCORES), ("три", "neutral", SCORES)])
+        tracker.record_many([])
+
+        snapshot = tracker.snapshot()
+        self.assertEqual(snapshot["total_predictions"], 3)
+        self.assertEqual([item["text"] for item in snapshot["recent_predictions"]], ["три", "два", "один"])
+        lines = self.history_path.read_text(encoding="utf-8").splitlines()
+        self.assertEqual([json.loads(line)["text"] for line in lines], ["один", "два", "три"])
+
+    def test_async_writer_groups_and_flushes_on_close(self) -> None:
+        tracker = StatsTracker(
+            history_path=self.history_path, durability="async", flush_size=100, flush_interval=60.0
+        )
+        for idx in range(250):
+            tracker.record(f"текст {idx}", "positive", SCORES)
+        self.assertTrue(tracker.flush())
+        tracker.record_many([("хвост", "negative", SCORES)] * 10)
+        tracker.close()
+
+        lines = self.history_path.read_text(encoding="utf-8").splitlines()
+        self.assertEqual(len(lines), 260)
+        self.assertEqual(json.loads(lines[0])["text"], "текст 0")
+        writer = tracker.writer_snapshot()
+        self.assertEqual(writer["written"], 260)
+        self.assertEqual(writer["pending"], 0)
+        self.assertEqual(writer["errors"], 0)
+        self.assertLessEqual(writer["flushes"], 4)  # one file append per group, not per record
+
+        tracker.record("после остановки", "neutral", SCORES)  # the writer restarts
+        self.assertTrue(tracker.flush())
+        self.assertEqual(len(self.history_path.read_text(encoding="utf-8").splitlines()), 261)
+
+    def test_timer_flush_and_bounded_buffer(self) -> None:
+        released = threading.Event()
+        writer = HistoryWriter(self.history_path, flush_size=5, flush_interval=0.05, max_pending=5)
+        original = writer._write
+
+        def slow_write(group):
+            released.wait(5)
+            original(group)
+
+        tracker = StatsTracker(history_path=self.history_path, durability="fsync")
+        tracker._writer = writer
+        tracker.record("одна запись", "neutral", SCORES)  # below flush_size: written by the timer
+        self.assertTrue(tracker.flush(timeout=5))
+
+        with mock.patch.object(writer, "_write", side_effect=slow_write):
+            tracker.record_many([("a", "neutral", SCORES)] * 5)  # taken by the writer, which stalls
+            tracker.record_many([("a", "neutral", SCORES)] * 5)
+            producer = threading.Thread(target=tracker.record_many, args=([("b", "neutral", SCORES)] * 3,))
+            producer.start()
+            producer.join(0.2)
+            self.assertTrue(producer.is_alive())  # 5 pending already: the buffer is full
+            released.set()
+            producer.join(5)
+        tracker.close()
+
+        self.assertEqual(len(self.history_path.read_text(encoding="utf-8").splitlines()), 14)
+        self.assertGreaterEqual(tracker.writer_snapshot()["producer_waits"], 1)
+
 
 if __name__ == "__main__":
     unittest.main()
@@ -0,0 +1,99 @@
+import importlib.util
+import io
+import json
+import unittest
+
+from backend.app.streaming import SUMMARY_LABEL, csv_lines, iter_predictions, ndjson_lines
+
+HAS_PANDAS = importlib.util.find_spec("pandas") is not None
+
+CSV = "id,text\n1,Спасибо\n2,\n3,Плохо\n4,Нормально\n5,Спасибо ещё раз\n6,  Плохо\n"
+
+
+def fake_classify(texts):
+    return [
+        {"label": "positive" if "Спасибо" in text else "negative", "scores": {"negative": 0.2, "positive": 0.8}}
+        for text in texts
+    ]
+
+
+@unittest.skipUnless(HAS_PANDAS, "pandas is not installed")
+class StreamingTests(unittest.TestCase):
+    def chunks(self, chunksize: int = 2):
+        import pandas as pd
+
+        return pd.read_csv(io.StringIO(CSV), chunksize=chunksize)
+
+    def test_rows_are_classified_chunk_by_chunk_with_summary_trailer(self) -> None:
+        batches = []
+
+        def classify(texts):
+            batches.append(texts)
+            return fake_classify(texts)
+
+        seen = []
+        records = list(iter_predictions(self.chunks(), classify, on_prediction=lambda text, pred: seen.append(text)))
+
+        self.assertEqual([len(batch) for batch in batches], [1, 2, 2])
+        self.assertEqual([record["row"] for record in records[:-1]], [0, 2, 3, 4, 5])
+        self.assertEqual(len(seen), 5)
+        self.assertEqual(
+            records[-1]["summary"],
+            {
+                "input_rows": 6,
+                "processed_rows": 5,
+                "skipped_rows": 1,
+                "unique_texts": 4,
+                "class_counts": {"positive": 2, "negative": 3},
+            },
+        )
+
+    def test_ndjson_and_csv_encoders(self) -> None:
+        import pandas as pd
+
+        ndjson = b"".join(ndjson_lines(iter_predictions(self.chunks(), fake_classify))).decode("utf-8")
+        lines = [json.loads(line) for line in ndjson.splitlines()]
+        self.assertEqual(len(lines), 6)
+        self.assertEqual(lines[-1]["summary"]["processed_rows"], 5)
+
+        output = b"".join(
+            csv_lines(iter_predictions(self.chunks(), fake_classify), ["negative", "positive"])
+        ).decode("utf-8")
+        frame = pd.read_csv(io.StringIO(output))
+        self.assertEqual(list(frame.columns), ["row", "text", "label", "score_negative", "score_positive"])
+        predictions = frame[frame["label"] != SUMMARY_LABEL]
+        self.assertEqual(predictions["row"].tolist(), [0, 2, 3, 4, 5])
+        self.assertEqual(predictions["label"].tolist(), ["positive", "negative", "negative", "positive", "negative"])
+        self.assertEqual(frame["label"].iloc[-1], SUMMARY_LABEL)
+        self.assertEqual(json.loads(frame["text"].iloc[-1])["processed_rows"], 5)
+
+    def test_parse_errors_end_the_stream_but_model_errors_propagate(self) -> None:
+        def broken_reader():
+            yield from self.chunks()
+            raise ValueError("Error tokenizing data")
+
+        records = list(iter_predictions(broken_reader(), fake_classify))
+        self.assertEqual(records[-1]["summary"]["processed_rows"], 5)
+        self.assertIn("Error tokenizing data", records[-1]["summary"]["error"])
+
+        def failing_classify(texts):
+            raise ValueError("model input shape mismatch")
+
+        with self.assertRaisesRegex(ValueError, "shape mismatch"):
+            list(iter_predictions(self.chunks(), failing_classify))
+
+    def test_csv_summary_row_carries_parse_error(self) -> None:
+        import pandas as pd
+
+        records = [{"row": 0, "text": "Спасибо", "label": "positive", "scores": {"positive": 1.0}}]
+        records.append({"summary": {"processed_rows": 1, "error": "Не удалось распарсить CSV: bad"}})
+        output = b"".join(csv_lines(iter(records), ["positive"])).decode("utf-8")
+
+        frame = pd.read_csv(io.StringIO(output))
+        self.assertEqual(len(frame), 2)
+        self.assertEqual(frame["label"].iloc[-1], SUMMARY_LABEL)
+        self.assertEqual(json.loads(frame["text"].iloc[-1])["error"], "Не удалось распарсить CSV: bad")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,43 @@
+import importlib.util
+import json
+import unittest
+from pathlib import Path
+from tempfile import TemporaryDirectory
+
+HAS_SKLEARN = all(
+    importlib.util.find_spec(name) is not None for name in ("sklearn", "joblib", "numpy", "pandas")
+)
+
+
+@unittest.skipUnless(HAS_SKLEARN, "scikit-learn is not installed")
+class HashingBaselineTests(unittest.TestCase):
+    def test_hashing_variant_is_served_by_joblib_adapter(self) -> None:
+        from backend.app.model import JoblibAdapter, SentimentModel
+        from ml.train_baseline import train
+
+        with TemporaryDirectory() as tmp:
+            model_path = Path(tmp) / "baseline.joblib"
+            metadata = train(vectorizer="hashing", n_features=2**12, model_path=model_path)
+            saved = json.loads((Path(tmp) / "metadata.json").read_text(encoding="utf-8"))
+            model = SentimentModel(model_path, mmap=True)
+            outputs = model.classify_batch(["Спасибо, всё удобно", "Приложение вылетает"])
+
+        self.assertEqual(saved, metadata)
+        self.assertEqual(metadata["vectorizer"], "HashingVectorizer+TfidfTransformer")
+        self.assertEqual(metadata["n_features"], 2**12)
+        self.assertLessEqual(metadata["vocabulary_size"], 2**12)
+        self.assertGreater(metadata["artifact_size_bytes"], 0)
+        self.assertGreaterEqual(metadata["fit_seconds"], 0)
+        self.assertIsInstance(model.adapter, JoblibAdapter)
+        self.assertEqual(model.labels, metadata["classes"])
+        self.assertEqual(len(outputs), 2)
+
+    def test_unknown_vectorizer_is_rejected(self) -> None:
+        from ml.train_baseline import build_pipeline
+
+        with self.assertRaises(ValueError):
+            build_pipeline("word2vec")
+
+
+if __name__ == "__main__":
+    unittest.main()
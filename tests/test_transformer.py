@@ -0,0 +1,141 @@
+import importlib.util
+import unittest
+from pathlib import Path
+from tempfile import TemporaryDirectory
+
+HAS_TRANSFORMERS = all(
+    importlib.util.find_spec(name) is not None for name in ("torch", "transformers", "numpy")
+)
+HAS_TOKENIZERS = all(
+    importlib.util.find_spec(name) is not None for name in ("transformers", "numpy")
+)
+HAS_ONNX = HAS_TRANSFORMERS and all(
+    importlib.util.find_spec(name) is not None for name in ("onnx", "onnxruntime")
+)
+
+TEXTS = [
+    "Спасибо за оперативную помощь",
+    "Приложение постоянно вылетает, невозможно воспользоваться услугой, всё плохо",
+    "Обычный день",
+    "плохо",
+]
+
+
+def build_tiny_tokenizer(model_dir: Path):
+    from transformers import BertTokenizerFast
+
+    words = sorted({word.strip(",").lower() for text in TEXTS for word in text.split()})
+    vocab = ["[PAD]", "[UNK]", "[CLS]", "[SEP]", "[MASK]", ","] + words
+    vocab_path = model_dir / "vocab.txt"
+    model_dir.mkdir(parents=True, exist_ok=True)
+    vocab_path.write_text("\n".join(vocab), encoding="utf-8")
+    return BertTokenizerFast(vocab_file=str(vocab_path), do_lower_case=True)
+
+
+def build_tiny_model(model_dir: Path) -> None:
+    """Save a randomly initialised 1-layer BERT with a toy vocabulary."""
+
+    import torch
+    from transformers import BertConfig, BertForSequenceClassification
+
+    tokenizer = build_tiny_tokenizer(model_dir)
+    vocab = tokenizer.get_vocab()
+    labels = ["negative", "neutral", "positive"]
+    config = BertConfig(
+        vocab_size=len(vocab),
+        hidden_size=16,
+        num_hidden_layers=1,
+        num_attention_heads=2,
+        intermediate_size=32,
+        max_position_embeddings=64,
+        num_labels=len(labels),
+        id2label=dict(enumerate(labels)),
+        label2id={label: idx for idx, label in enumerate(labels)},
+    )
+    torch.manual_seed(0)
+    BertForSequenceClassification(config).save_pretrained(model_dir)
+    tokenizer.save_pretrained(model_dir)
+
+
+@unittest.skipUnless(HAS_TOKENIZERS, "transformers is not installed")
+class LengthBucketingTests(unittest.TestCase):
+    def test_sub_batches_are_length_sorted_and_order_is_restored(self) -> None:
+        import numpy as np
+
+        from backend.app.model import _bucketed_proba
+
+        with TemporaryDirectory() as tmp:
+            tokenizer = build_tiny_tokenizer(Path(tmp))
+        texts = [TEXTS[1], TEXTS[3], TEXTS[0] + " " + TEXTS[1], TEXTS[2], TEXTS[3]]
+        widths = []
+
+        def forward(batch):
+            widths.append(batch["input_ids"].shape[1])
+            lengths = batch["attention_mask"].sum(axis=1).astype(float)
+            return np.stack([lengths, np.zeros_like(lengths)], axis=1)
+
+        proba = _bucketed_proba(texts, tokenizer, 2, forward, return_tensors="np", batch_size=2)
+        unsorted = _bucketed_proba(
+            texts, tokenizer, 2, forward, return_tensors="np", batch_size=len(texts), sort_by_length=False
+        )
+
+        np.testing.assert_allclose(proba, unsorted)
+        lengths = [len(ids) for ids in tokenizer(texts)["input_ids"]]
+        expected = np.exp(lengths) / (np.exp(lengths) + 1)
+        np.testing.assert_allclose(proba[:, 0], expected)
+        self.assertEqual(widths[:3], sorted(widths[:3]))
+        self.assertLess(sum(widths[:3]) * 2, widths[3] * len(texts))
+
+
+@unittest.skipUnless(HAS_TRANSFORMERS, "torch/transformers are not installed")
+class TransformerAdapterTests(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls) -> None:
+        cls.tmp = TemporaryDirectory()
+        cls.model_dir = Path(cls.tmp.name) / "transformer"
+        build_tiny_model(cls.model_dir)
+
+    @classmethod
+    def tearDownClass(cls) -> None:
+        cls.tmp.cleanup()
+
+    @unittest.skipUnless(HAS_ONNX, "onnx/onnxruntime are not installed")
+    def test_onnx_adapter_matches_pytorch(self) -> None:
+        import numpy as np
+
+        from backend.app.model import OnnxAdapter, SentimentModel, TransformerAdapter
+        from ml.export_onnx import export_onnx
+
+        onnx_dir = Path(self.tmp.name) / "onnx"
+        summary = export_onnx(self.model_dir, onnx_dir / "model.onnx")
+        self.assertLess(summary["max_abs_diff"], 1e-4)
+
+        reference = TransformerAdapter(self.model_dir)
+        onnx_adapter = OnnxAdapter(onnx_dir)
+        self.assertEqual(onnx_adapter.classes_, reference.classes_)
+        np.testing.assert_allclose(
+            onnx_adapter.predict_proba(TEXTS), reference.predict_proba(TEXTS), atol=1e-5
+        )
+        self.assertEqual(onnx_adapter.predict(TEXTS), reference.predict(TEXTS))
+        self.assertIsInstance(SentimentModel(onnx_dir).adapter, OnnxAdapter)
+
+    def test_quantized_artifact_is_loaded_by_sentiment_model(self) -> None:
+        from backend.app.model import SentimentModel, TransformerAdapter
+        from ml.quantize_transformer import quantize_transformer
+
+        quantized_dir = Path(self.tmp.name) / "transformer-int8"
+        metadata = quantize_transformer(self.model_dir, quantized_dir)
+        self.assertEqual(metadata["quantization"]["dtype"], "qint8")
+
+        model = SentimentModel(quantized_dir)
+        self.assertIsInstance(model.adapter, TransformerAdapter)
+        self.assertTrue(model.adapter.quantized)
+        self.assertEqual(model.labels, TransformerAdapter(self.model_dir).classes_)
+        outputs = model.classify_batch(TEXTS)
+        self.assertEqual(len(outputs), len(TEXTS))
+        for item in outputs:
+            self.assertAlmostEqual(sum(item["scores"].values()), 1.0, places=5)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,87 @@
+import multiprocessing
+import os
+import time
+import unittest
+from pathlib import Path
+
+from backend.app.model import SentimentModel
+from backend.app.workers import InferencePool
+
+# Distinct texts: classify_batch scores repeated texts once, which would shrink the shards.
+TEXTS = [
+    f"{text} #{idx}"
+    for idx, text in enumerate(
+        [
+            "Спасибо, всё удобно",
+            "Приложение вылетает",
+            "ты грязная тварь",
+            "Обычный день",
+            "Плохо работает поддержка",
+        ]
+        * 5
+    )
+]
+
+
+class InferencePoolTests(unittest.TestCase):
+    def setUp(self) -> None:
+        self.model_path = Path("missing_pool_model.joblib")
+        self.model = SentimentModel(self.model_path)
+        self.pool = InferencePool(
+            self.model,
+            {"model_path": self.model_path},
+            workers=2,
+            max_inflight=2,
+            shard_size=4,
+        )
+
+    def tearDown(self) -> None:
+        self.pool.close()
+
+    def test_sharded_results_match_in_process_results(self) -> None:
+        expected = self.model.classify_batch(TEXTS)
+        sharded = self.model.classify_batch(TEXTS, scorer=self.pool.score_batch)
+
+        self.assertEqual(sharded, expected)
+        snapshot = self.pool.snapshot()
+        self.assertEqual(snapshot["shards"], 7)
+        self.assertEqual(snapshot["inflight"], 0)
+
+    def test_crashed_worker_is_replaced_without_losing_rows(self) -> None:
+        with self.assertRaises(Exception):
+            self.pool._executor.submit(os._exit, 1).result()
+
+        outputs = self.model.classify_batch(TEXTS, scorer=self.pool.score_batch)
+
+        self.assertEqual(outputs, self.model.classify_batch(TEXTS))
+        self.assertGreaterEqual(self.pool.snapshot()["restarts"], 1)
+
+    def test_closed_pool_scores_in_process(self) -> None:
+        self.pool.close()
+
+        outputs = self.model.classify_batch(TEXTS, scorer=self.pool.score_batch)
+        self.pool._restart(self.pool._generation)
+
+        self.assertEqual(outputs, self.model.classify_batch(TEXTS))
+        self.assertEqual(multiprocessing.active_children(), [])
+        self.assertEqual(self.pool.snapshot()["restarts"], 0)
+
+    def test_hung_worker_times_out_and_is_replaced(self) -> None:
+        pool = InferencePool(self.model, {"model_path": self.model_path}, workers=1, shard_size=64, result_timeout=0.5)
+        self.addCleanup(pool.close)
+        pool._executor.submit(time.sleep, 60)  # occupies the only worker, like a deadlocked one
+
+        started = time.monotonic()
+        outputs = self.model.classify_batch(TEXTS, scorer=pool.score_batch)
+
+        self.assertLess(time.monotonic() - started, 10)
+        self.assertEqual(outputs, self.model.classify_batch(TEXTS))
+        snapshot = pool.snapshot()
+        self.assertEqual((snapshot["timeouts"], snapshot["restarts"]), (1, 1))
+        # The replacement pool never forks from this multi-threaded process.
+        self.assertIn(pool._executor._mp_context.get_start_method(), ("forkserver", "spawn"))
+        self.assertEqual(self.model.classify_batch(TEXTS, scorer=pool.score_batch), outputs)
+
+
+if __name__ == "__main__":
+    unittest.main()